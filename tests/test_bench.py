@@ -0,0 +1,31 @@
+import pandas as pd
+
+from timetable_automation.compiler import compile_problem
+from timetable_automation.synthetic import generate_institution
+from timetable_automation.bench import run_case, compare, PHASES
+
+def test_generator_writes_scheduler_inputs(tmp_path):
+    depts, rooms, slots, faculty = generate_institution(tmp_path / "a", departments=3, courses=8, rooms=4, labs=2,
+                                                        faculty=6, slots_per_day=8, seed=1)
+    generate_institution(tmp_path / "b", departments=3, courses=8, rooms=4, labs=2, faculty=6, slots_per_day=8, seed=1)
+    assert list(depts) == ["D000", "D001", "D002"]
+    assert (tmp_path / "a" / "D001_courses.csv").read_text() == (tmp_path / "b" / "D001_courses.csv").read_text()
+    courses = pd.read_csv(depts["D000"])
+    assert len(courses) == 8 and courses["Elective"].sum() >= 1
+    model = compile_problem(depts, rooms, slots, faculty, cache_dir=None)
+    assert len(model.slots) == 8 and len(model.rooms) == 6
+
+def test_run_case_times_every_phase():
+    run = run_case("tiny")
+    assert set(run["phases"]) == set(PHASES)
+    assert run["phases"]["generate_timetable"]["calls"] == 2 * run["params"]["departments"]
+    assert run["phases"]["_assign_session"]["calls"] > 0 and run["placements"] > 0
+
+def test_compare_flags_slower_phases():
+    def result(export, total):
+        phases = {p: {"seconds": 0.01, "calls": 1} for p in PHASES}
+        phases["export"]["seconds"] = export
+        return {"runs": [{"size": "small", "total_seconds": total, "phases": phases}]}
+    assert compare(result(0.5, 1.0), result(0.4, 1.0)) == []
+    assert compare(result(0.2, 0.2), result(0.01, 0.01)) == []
+    assert compare(result(1.0, 1.6), result(0.4, 1.0)) == [("small", "total", 1.0, 1.6), ("small", "export", 0.4, 1.0)]
@@ -0,0 +1,41 @@
+import pandas as pd
+import pytest
+
+from timetable_automation import Scheduler
+from timetable_automation import columnar
+from timetable_automation.columnar import write_columnar, resolve_format
+
+def scheduled():
+    sch = Scheduler("tests/data/slots.csv", "tests/data/courses.csv", "tests/data/rooms.csv", {})
+    sch.schedule_all()
+    return sch
+
+def test_csv_tables_match_records(tmp_path):
+    sch = scheduled()
+    placements, unscheduled, electives = write_columnar(sch, "A", tmp_path, "csv")
+    df = pd.read_csv(placements)
+    assert len(df) == len(sch.records)
+    assert list(df.columns) == ["dept", "sheet", "day", "slot", "code", "display", "faculty", "room", "session_type"]
+    assert set(df["session_type"]) <= {"L", "T", "P"}
+    assert list(pd.read_csv(electives)["room"]) == list(sch.elective_room_map["First_Half"].values())
+    assert list(pd.read_csv(unscheduled).columns)[:3] == ["dept", "sheet", "course_code"]
+
+def test_jsonl_lines(tmp_path):
+    sch = scheduled()
+    placements = write_columnar(sch, "A", tmp_path, "jsonl")[0]
+    df = pd.read_json(placements, lines=True)
+    assert df.iloc[0]["code"] == sch.records[0].code
+
+def test_run_can_skip_excel(tmp_path):
+    sch = Scheduler("tests/data/slots.csv", "tests/data/too_many_hours.csv", "tests/data/rooms.csv", {})
+    sch.run_all_outputs("T", student_filename=str(tmp_path / "T_timetable.xlsx"), columnar="csv", excel=False)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["T_elective_rooms.csv", "T_placements.csv", "T_unscheduled.csv"]
+    assert len(pd.read_csv(tmp_path / "T_unscheduled.csv")) == len(sch.unscheduled_list) > 0
+
+def test_format_resolution(monkeypatch):
+    with pytest.raises(ValueError):
+        resolve_format("xml")
+    monkeypatch.setattr(columnar, "HAVE_ARROW", False)
+    assert resolve_format("auto") == "csv"
+    with pytest.raises(ImportError):
+        resolve_format("parquet")
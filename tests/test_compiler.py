@@ -0,0 +1,47 @@
+import shutil
+
+from timetable_automation import Scheduler, RoomLedger, FacultyLedger
+from timetable_automation import compiler
+from timetable_automation.compiler import compile_problem
+
+DEPARTMENTS = {"A": "tests/data/courses.csv"}
+ARGS = ("tests/data/rooms.csv", "tests/data/slots.csv", "data/Faculty.csv")
+
+def test_model_interns_inputs():
+    model = compile_problem(DEPARTMENTS, *ARGS, cache_dir=None)
+    assert model.rooms[model.room_id("C102")] == "C102"
+    assert [c.code for c in model.courses_for("A")][:2] == ["CS101", "CS102"]
+    assert "CS101" in model.stable_hashes and "Monday-P" in model.stable_hashes
+
+def test_cache_hit_skips_parsing(tmp_path, monkeypatch):
+    first = compile_problem(DEPARTMENTS, *ARGS, cache_dir=tmp_path)
+    assert len(list(tmp_path.glob("model-*.pkl"))) == 1
+
+    def fail(*args):
+        raise AssertionError("inputs were parsed again")
+    monkeypatch.setattr(compiler, "_build_model", fail)
+    second = compile_problem(DEPARTMENTS, *ARGS, cache_dir=tmp_path)
+    assert second.course_rows("A") == first.course_rows("A")
+
+def test_changed_input_invalidates_cache(tmp_path):
+    courses = tmp_path / "courses.csv"
+    shutil.copy("tests/data/courses.csv", courses)
+    compile_problem({"A": str(courses)}, *ARGS, cache_dir=tmp_path / "cache")
+    with open(courses, "a") as f:
+        f.write("CS999,New Course,Prof Z,3-0-0-0-3,1,0,0\n")
+    model = compile_problem({"A": str(courses)}, *ARGS, cache_dir=tmp_path / "cache")
+    assert len(list((tmp_path / "cache").glob("model-*.pkl"))) == 1  # the stale model is dropped
+    assert "CS999" in [c.code for c in model.courses_for("A")]
+
+    # other department sets keep their own model
+    compile_problem({"B": str(courses)}, *ARGS, cache_dir=tmp_path / "cache")
+    assert len(list((tmp_path / "cache").glob("model-*.pkl"))) == 2
+
+def test_scheduler_from_model_matches_csv_scheduler():
+    model = compile_problem(DEPARTMENTS, *ARGS, cache_dir=None)
+    from_files = Scheduler("tests/data/slots.csv", "tests/data/courses.csv", "tests/data/rooms.csv", {})
+    from_model = Scheduler.from_model(model, "A", RoomLedger(model.rooms), FacultyLedger())
+    from_files.schedule_all()
+    from_model.schedule_all()
+    assert from_model.records.as_dicts() == from_files.records.as_dicts()
+    assert from_model.unscheduled_list == from_files.unscheduled_list
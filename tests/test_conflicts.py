@@ -0,0 +1,33 @@
+import itertools
+
+import numpy as np
+
+from timetable_automation.conflicts import conflict_graph, dsatur
+
+def test_conflict_graph_matches_brute_force():
+    rng = np.random.default_rng(3)
+    n, units = 12, 7
+    members, unit_ids = rng.integers(0, n, 40), rng.integers(0, units, 40)
+    weights = rng.integers(1, 50, units)
+    exclusive = np.array([-1, -1, 0, 0, 0, -1, 1, 1, -1, -1, -1, -1])
+    graph = conflict_graph(n, members, unit_ids, weights, exclusive)
+
+    expected = {}
+    for unit in range(units):
+        enrolled = sorted(set(members[unit_ids == unit].tolist()))
+        for a, b in itertools.combinations(enrolled, 2):
+            if exclusive[a] < 0 or exclusive[a] != exclusive[b]:
+                expected[(a, b)] = expected.get((a, b), 0) + int(weights[unit])
+    u, v, w = graph.edges()
+    assert dict(zip(zip(u.tolist(), v.tolist()), w.tolist())) == expected
+    assert all(a in graph.neighbours(b).tolist() for a, b in expected)
+    assert graph.weighted_degree().sum() == 2 * sum(expected.values())
+
+def test_dsatur_keeps_conflicting_vertices_apart_by_group():
+    # two triangles sharing vertex 2; colours 0..3 grouped in pairs (two slots a day)
+    graph = conflict_graph(5, [0, 1, 2, 2, 3, 4], [0, 0, 0, 1, 1, 1])
+    colours = dsatur(graph, lambda v, blocked: next(c for c in range(10) if c // 2 not in blocked), group=lambda c: c // 2)
+    assert colours[2] == 0  # the most connected vertex goes first
+    for u, v, _ in zip(*graph.edges()):
+        assert colours[u] // 2 != colours[v] // 2
+    assert dsatur(conflict_graph(3, [], []), lambda v, blocked: None) == [None, None, None]
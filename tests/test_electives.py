@@ -20,3 +20,65 @@ def test_elective_assigns_room():
     sch._compute_elective_room_assignments_legally("Sheet1")
     assert "Sheet1" in sch.elective_room_map
     assert len(sch.elective_room_map["Sheet1"]) == 1
+
+def _two_baskets(sch):
+    sch.records = [
+        {"sheet": "Sheet1", "day": "Monday", "slot": "09:00-10:00", "code": "Elective_1"},
+        {"sheet": "Sheet1", "day": "Tuesday", "slot": "09:00-10:00", "code": "Elective_2"},
+    ]
+    elective = lambda title: type("X", (object,), {"title": title})
+    sch.elective_groups = {"Sheet1": [(1, elective("First")), (2, elective("Second"))]}
+    sch.limit_rooms(["C101", "C102"])
+
+def test_elective_rooms_are_matched_per_basket():
+    sch = Scheduler("tests/data/slots.csv", "tests/data/courses.csv",
+                    "tests/data/rooms.csv", global_room_usage={})
+    _two_baskets(sch)
+    # the baskets meet on different days, so they can share the one free room
+    sch.limit_rooms(["C101"])
+    sch._compute_elective_room_assignments_legally("Sheet1")
+    assert sch.elective_room_map["Sheet1"] == {"Elective_1||First": "C101", "Elective_2||Second": "C101"}
+
+def test_electives_of_one_basket_get_distinct_rooms():
+    sch = Scheduler("tests/data/slots.csv", "tests/data/courses.csv",
+                    "tests/data/rooms.csv", global_room_usage={})
+    sch.records = [{"sheet": "Sheet1", "day": "Monday", "slot": "09:00-10:00", "code": "Elective_1"}]
+    elective = lambda title: type("X", (object,), {"title": title})
+    sch.elective_groups = {"Sheet1": [(1, elective("First")), (1, elective("Second")), (1, elective("Third"))]}
+    sch.limit_rooms(["C101", "C102"])
+    sch.room_ledger.book("C101", [("Monday", "09:00-10:00")])
+    sch._compute_elective_room_assignments_legally("Sheet1")
+    assert sch.elective_room_map["Sheet1"] == {"Elective_1||First": "C102", "Elective_1||Second": "", "Elective_1||Third": ""}
+
+def test_elective_without_free_room_gets_none():
+    sch = Scheduler("tests/data/slots.csv", "tests/data/courses.csv",
+                    "tests/data/rooms.csv", global_room_usage={})
+    _two_baskets(sch)
+    for room in ("C101", "C102"):
+        sch.room_ledger.book(room, [("Tuesday", "09:00-10:00")])
+    sch._compute_elective_room_assignments_legally("Sheet1")
+    assert sch.elective_room_map["Sheet1"] == {"Elective_1||First": "C101", "Elective_2||Second": ""}
+
+def test_elective_rooms_are_cached_until_bookings_change(monkeypatch):
+    import timetable_automation.main as main_module
+    from timetable_automation.matching import max_matching
+
+    sch = Scheduler("tests/data/slots.csv", "tests/data/courses.csv",
+                    "tests/data/rooms.csv", global_room_usage={})
+    _two_baskets(sch)
+    calls = []
+    monkeypatch.setattr(main_module, "max_matching", lambda adj: calls.append(adj) or max_matching(adj))
+    sch._compute_elective_room_assignments_legally("Sheet1")
+    sch._compute_elective_room_assignments_legally("Sheet1")
+    assert len(calls) == 2  # one matching per basket
+    sch.room_ledger.book("C101", [("Monday", "09:00-10:00")])
+    sch._compute_elective_room_assignments_legally("Sheet1")
+    assert len(calls) == 4
+    assert sch.elective_room_map["Sheet1"]["Elective_1||First"] == "C102"
+
+def test_max_matching_finds_long_augmenting_paths():
+    from timetable_automation.matching import max_matching
+
+    matched = max_matching({"A": [1, 2], "B": [1], "C": [2, 3], "D": [3]})
+    assert len(matched) == 3 and len(set(matched.values())) == 3
+    assert max_matching({"A": [1, 2], "B": [2]}) == {"A": 1, "B": 2}
@@ -0,0 +1,125 @@
+import datetime as dt
+
+import pandas as pd
+from openpyxl import load_workbook
+
+from timetable_automation.exams import (expand_batches, exam_rooms, schedule_exams, pack_slot, main, SLOTS, section_key,
+                                        batch_sections, student_clashes, schedule_exams_clash_free)
+
+MON = dt.date(2025, 12, 1)
+
+def test_expand_batches_splits_combined_batches():
+    df = pd.DataFrame({"Course Code": ["MA101", "CS301"], "BATCH_REAL": ["All 1st-Year", "5CSE"],
+                       "No. of Students": ["1,202", "-"]})
+    by_batch = expand_batches(df)
+    assert list(by_batch) == ["1CSEA", "1CSEB", "1ECE", "1DSAI", "5CSE"]
+    assert [b[0]["students"] for b in list(by_batch.values())[:4]] == [301, 301, 300, 300]
+    assert by_batch["5CSE"] == [{"course": "CS301", "students": 0}]
+
+def test_exam_rooms_use_a_quarter_of_the_seats():
+    rooms = exam_rooms(pd.DataFrame({"Room_ID": ["C1", "C2", "C3"], "Capacity": [40, 120, 3]}))
+    assert rooms == [{"room": "C2", "per_course_quota": 30}, {"room": "C1", "per_course_quota": 10}]
+
+def test_schedule_exams_one_exam_per_batch_per_day_and_reusable_inputs():
+    courses = {"A": [{"course": "X", "students": 35}, {"course": "Y", "students": 10}],
+               "B": [{"course": "Z", "students": 5}]}
+    rooms = [{"room": "C2", "per_course_quota": 30}, {"room": "C1", "per_course_quota": 10}]
+    dates = [MON, MON + dt.timedelta(days=1)]
+    records, short = schedule_exams(courses, rooms, dates)
+    assert not short
+    by_course = {r["Course"]: r for r in records}
+    assert (by_course["X"]["Date"], by_course["X"]["Rooms"]) == (MON, "C2 (30); C1 (5)")
+    assert (by_course["Y"]["Date"], by_course["Y"]["Slot"]) == (dates[1], SLOTS[0])
+    # another batch shares the morning: C1 still has seats for a second course
+    assert (by_course["Z"]["Date"], by_course["Z"]["Slot"], by_course["Z"]["Rooms"]) == (MON, SLOTS[0], "C1 (5)")
+    assert schedule_exams(courses, rooms, dates) == (records, short)
+
+    records, short = schedule_exams({"A": [{"course": "X", "students": 50}]}, rooms, dates[:1], slots=["Only"])
+    assert short and records[0]["Rooms"] == "C2 (30); C1 (10) (PARTIAL)" and records[0]["Slot"] == "Only"
+
+def test_cli_runs_without_prompting(tmp_path, capsys):
+    pd.DataFrame({"Course Code": ["MA101"], "BATCH_REAL": ["1CSEA"], "No. of Students": [12]}).to_csv(
+        tmp_path / "courses.csv", index=False)
+    pd.DataFrame({"Room_ID": ["C1"], "Capacity": [60]}).to_csv(tmp_path / "rooms.csv", index=False)
+    out = tmp_path / "exams.xlsx"
+    args = ["--courses", str(tmp_path / "courses.csv"), "--rooms", str(tmp_path / "rooms.csv"), "--out", str(out)]
+    assert main(["--start", "06-12-2025", "--end", "08-12-2025"] + args) == 0
+    wb = load_workbook(out)
+    assert wb.sheetnames == ["Master_Timetable", "1CSEA"]
+    assert [c.value for c in wb["Master_Timetable"][2]][:3] == ["1CSEA", "08-Dec-2025", "Monday"]
+    assert main(["--start", "06-12-2025", "--end", "07-12-2025"] + args) == 1
+    assert "no weekdays" in capsys.readouterr().out
+
+def test_full_window_falls_back_to_the_pair_with_most_free_seats():
+    rooms = [{"room": "C2", "per_course_quota": 30}, {"room": "C1", "per_course_quota": 10}]
+    courses = {"A": [{"course": "X", "students": 5}, {"course": "Y", "students": 20}, {"course": "W", "students": 4}]}
+    records, short = schedule_exams(courses, rooms, [MON], slots=["AM", "PM"], allocator="course")
+    # A already sits an exam on MON, so Y and W take the emptiest pair instead: PM, then AM again
+    assert [(r["Slot"], r["Rooms"]) for r in records] == [("AM", "C2 (5)"), ("PM", "C2 (20)"), ("AM", "C2 (4)")]
+    assert not short
+
+def test_pack_slot_pairs_small_exams_and_opens_few_rooms():
+    rooms = [{"room": "A", "per_course_quota": 30}, {"room": "B", "per_course_quota": 20},
+             {"room": "C", "per_course_quota": 20}]
+    assigned, packer = pack_slot([10, 10, 10], rooms)
+    assert assigned == [[("B", 10)], [("B", 10)], [("C", 10)]] and packer.free == 40
+    # the greedy opens a room per exam; packing the slot as a whole opens two
+    courses = {b: [{"course": b, "students": 10}] for b in ("X", "Y", "Z")}
+    greedy, _ = schedule_exams(courses, rooms, [MON], slots=["AM"], allocator="course")
+    packed, _ = schedule_exams(courses, rooms, [MON], slots=["AM"])
+    assert [r["Rooms"] for r in greedy] == ["A (10)", "B (10)", "C (10)"]
+    assert [r["Rooms"] for r in packed] == ["B (10)", "B (10)", "C (10)"]
+
+def test_slot_allocator_waits_for_a_pair_that_seats_the_whole_exam():
+    rooms = [{"room": "A", "per_course_quota": 30}]
+    courses = {"X": [{"course": "X1", "students": 20}], "Y": [{"course": "Y1", "students": 20}]}
+    greedy, short = schedule_exams(courses, rooms, [MON], slots=["AM", "PM"], allocator="course")
+    assert short and greedy[1]["Rooms"] == "A (10) (PARTIAL)"
+    packed, short = schedule_exams(courses, rooms, [MON], slots=["AM", "PM"])
+    assert not short and [(r["Slot"], r["Rooms"]) for r in packed] == [("AM", "A (20)"), ("PM", "A (20)")]
+
+def test_batches_map_to_roll_list_sections():
+    assert section_key("1st Year CSE A") == section_key("1CSEA") == "1CSEA"
+    assert section_key("2CSE-B") == "2CSEB"
+    batches = ["1CSE", "1CSEA", "1ECE+1DSAI", "4CSE"]
+    assert batch_sections(batches) == {"1CSE": ["1CSEA"], "1CSEA": ["1CSEA"], "1ECE+1DSAI": ["1DSAI", "1ECE"],
+                                       "4CSE": ["4CSE"]}
+    sections = {"1CSEA": 60, "1CSEB": 58, "1ECE": 50, "1DSAI": 40, "4CSEA": 30, "4CSEB": 25}
+    assert batch_sections(batches, sections)["1CSE"] == ["1CSEA", "1CSEB"]
+    assert batch_sections(batches, sections)["4CSE"] == ["4CSEA", "4CSEB"]
+
+def test_clash_free_keeps_shared_students_on_different_dates():
+    df = pd.DataFrame({"Course Code": ["MA161", "CS161", "E1", "E2", "DS161"],
+                       "BATCH_REAL": ["1CSE", "1CSEA", "1CSEA", "1CSEA", "1ECE+1DSAI"],
+                       "No. of Students": [20, 10, 5, 5, 20],
+                       "Elective or not": ["NO", "NO", "YES", "YES", "NO"],
+                       "Slot Name": ["STAT", "PSP", "ELECTIVE-1", "ELECTIVE-1", "DS"]})
+    courses = expand_batches(df)
+    rooms = [{"room": "A", "per_course_quota": 40}]
+    dates = [MON, MON + dt.timedelta(days=1), MON + dt.timedelta(days=2)]
+    # batches alone don't show that 1CSE and 1CSEA share students
+    records, _ = schedule_exams(courses, rooms, dates)
+    assert student_clashes(courses, records) == [(0, 1, 1)]
+
+    records, short = schedule_exams_clash_free(courses, rooms, dates, sections={"1CSEA": 30, "1CSEB": 25})
+    assert not short and student_clashes(courses, records) == []
+    by_course = {r["Course"]: r for r in records}
+    assert len({by_course[c]["Date"] for c in ("MA161", "CS161", "E1")}) == 3
+    # one elective each out of the basket: both can sit at the same time
+    assert (by_course["E1"]["Date"], by_course["E1"]["Slot"]) == (by_course["E2"]["Date"], by_course["E2"]["Slot"])
+    # 1ECE+1DSAI shares no students with the rest and fills the first slot's spare seats
+    assert (by_course["DS161"]["Date"], by_course["DS161"]["Slot"]) == (MON, SLOTS[0])
+
+def test_cli_writes_a_seating_plan(tmp_path):
+    pd.DataFrame({"Course Code": ["MA101"], "BATCH_REAL": ["1CSEA"], "No. of Students": [3]}).to_csv(
+        tmp_path / "courses.csv", index=False)
+    pd.DataFrame({"Room_ID": ["C1"], "Capacity": [60]}).to_csv(tmp_path / "rooms.csv", index=False)
+    pd.DataFrame({"Batch": ["1st Year CSE A"] * 3, "Roll Number": ["R1", "R2", "R3"]}).to_csv(
+        tmp_path / "rolls.csv", index=False)
+    args = ["--start", "08-12-2025", "--end", "08-12-2025", "--courses", str(tmp_path / "courses.csv"),
+            "--rooms", str(tmp_path / "rooms.csv"), "--rolls", str(tmp_path / "rolls.csv"),
+            "--half-capacity", str(tmp_path / "none.csv"), "--out", str(tmp_path / "exams.xlsx"),
+            "--seating", str(tmp_path / "seating.csv")]
+    assert main(args) == 0
+    plan = pd.read_csv(tmp_path / "seating.csv")
+    assert plan[["Room", "Seat", "Roll Number"]].values.tolist() == [["C1", 1, "R1"], ["C1", 2, "R2"], ["C1", 3, "R3"]]
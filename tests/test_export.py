@@ -0,0 +1,72 @@
+from openpyxl import Workbook, load_workbook
+
+from timetable_automation import Scheduler
+from timetable_automation.export import (write_student_workbook, session_spans, StyleRegistry, PALETTE,
+                                          group_records, write_faculty_workbook, write_room_workbook)
+
+def scheduled():
+    sch = Scheduler("tests/data/slots.csv", "tests/data/courses.csv", "tests/data/rooms.csv", {})
+    sch.schedule_all()
+    return sch
+
+def test_workbook_written_from_grids(tmp_path):
+    sch = scheduled()
+    out = tmp_path / "tt.xlsx"
+    write_student_workbook(sch, out)
+    wb = load_workbook(out)
+    assert wb.sheetnames == list(sch.grids)
+
+    ws = wb["First_Half"]
+    frame = sch.grids["First_Half"].to_frame()
+    assert [c.value for c in ws[1][1:len(frame.columns) + 1]] == list(frame.columns)
+    assert ws.freeze_panes == "B2"
+    # every multi-slot session is one merged, colored cell
+    for rec_range in ws.merged_cells.ranges:
+        anchor = ws.cell(rec_range.min_row, rec_range.min_col)
+        assert anchor.value and anchor.fill.fgColor.rgb[-6:] in PALETTE
+    assert ws.merged_cells.ranges
+
+def test_legend_lists_non_elective_courses(tmp_path):
+    sch = scheduled()
+    out = tmp_path / "tt.xlsx"
+    write_student_workbook(sch, out)
+    ws = load_workbook(out)["First_Half"]
+    header_row = len(sch.days) + 4
+    assert ws.cell(header_row, 2).value == "S.No"
+    codes = [ws.cell(r, 3).value for r in range(header_row + 1, ws.max_row + 1)]
+    assert "CS101" in codes and not any(c.startswith("Elective_") for c in codes)
+    assert ws.cell(header_row + 1, 4).value == next(c.title for c in sch.courses if c.code == codes[0])
+
+def test_merges_follow_session_spans(tmp_path):
+    sch = scheduled()
+    out = tmp_path / "tt.xlsx"
+    write_student_workbook(sch, out)
+    ws = load_workbook(out)["First_Half"]
+    expected = {(sch.days.index(day) + 2, start + 2, end + 2)
+                for (day, start), end in session_spans(sch.sessions, "First_Half").items()}
+    assert {(r.min_row, r.min_col, r.max_col) for r in ws.merged_cells.ranges} == expected
+
+def test_style_registry_names_each_style_once():
+    wb = Workbook(write_only=True)
+    styles = StyleRegistry(wb)
+    assert styles.session("FFC7CE") == styles.session("FFC7CE")
+    styles.cell(), styles.cell(), styles.break_cell()
+    assert wb.named_styles == ["Normal", "tt_session_FFC7CE", "tt_cell", "tt_break"]
+
+def test_faculty_and_room_views(tmp_path):
+    sch = scheduled()
+    records = {"A": sch.records}
+    groups = group_records(records, "faculty")
+    assert list(groups) == sch.records.faculty()
+    assert all(dept == "A" and name in rec.faculty for name, entries in groups.items() for dept, rec in entries)
+
+    write_faculty_workbook(records, tmp_path / "faculty.xlsx", sch.days, sch.slots)
+    write_room_workbook(records, tmp_path / "rooms.xlsx", sch.days, sch.slots)
+    faculty_wb, room_wb = load_workbook(tmp_path / "faculty.xlsx"), load_workbook(tmp_path / "rooms.xlsx")
+    assert faculty_wb.sheetnames == sch.records.faculty()
+    assert room_wb.sheetnames == sch.records.rooms()
+
+    rec = sch.records.for_room(sch.records.rooms()[0])[0]
+    ws = room_wb[rec.room]
+    row = 2 + sch.days.index(rec.day)  # First_Half block comes first in the test data
+    assert ws.cell(row, 2 + sch.slots.index(rec.slot)).value == f"{rec.display} [A]"
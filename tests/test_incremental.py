@@ -0,0 +1,53 @@
+import shutil
+
+from timetable_automation.compiler import compile_problem
+from timetable_automation.incremental import schedule_incremental
+from timetable_automation.portfolio import _run_institution, run_metrics
+from timetable_automation.main import Random_SEED
+
+ARGS = ("tests/data/rooms.csv", "tests/data/slots.csv", "data/Faculty.csv")
+
+def layout(sch):
+    return [(s.sheet, s.day, s.span, s.code, s.room) for s in sch.sessions]
+
+def departments(tmp_path):
+    depts = {}
+    for name, src in (("A", "tests/data/courses.csv"), ("B", "tests/data/search_courses.csv"), ("C", "tests/data/courses.csv")):
+        depts[name] = str(tmp_path / f"{name}.csv")
+        shutil.copy(src, depts[name])
+    return depts
+
+def test_first_run_matches_full_build_and_rerun_is_a_no_op(tmp_path):
+    depts = departments(tmp_path)
+    state = tmp_path / "state.pkl"
+    model = compile_problem(depts, *ARGS, cache_dir=None)
+    changed, schedulers, _, _ = schedule_incremental(model, state)
+    assert changed == ["A", "B", "C"]
+    full = _run_institution(model, Random_SEED, "greedy", None)
+    assert [layout(s) for s in schedulers.values()] == [layout(s) for s in full.values()]
+
+    changed, schedulers, _, _ = schedule_incremental(model, state)
+    assert changed == [] and schedulers == {}
+
+def test_changed_department_is_rescheduled_alone(tmp_path):
+    depts = departments(tmp_path)
+    state = tmp_path / "state.pkl"
+    _, before, _, _ = schedule_incremental(compile_problem(depts, *ARGS, cache_dir=None), state)
+
+    with open(depts["B"], "a") as f:
+        f.write("CS999,New Course,Prof Z,2-0-0-0-2,1,0,0\n")
+    changed, after, _, faculty_ledger = schedule_incremental(compile_problem(depts, *ARGS, cache_dir=None), state)
+    assert changed == ["B"]
+    assert layout(after["C"]) == layout(before["C"])  # restored exactly, after the released department
+    assert "CS999" in {s.code for s in after["B"].sessions}
+
+    # together with the untouched A, the result is clash-free on the shared ledgers
+    after["A"] = before["A"]
+    assert run_metrics(after)["room_clashes"] == 0
+    busy = set()
+    for sch in after.values():
+        for s in sch.sessions:
+            for member in faculty_ledger.members(s.faculty):
+                for slot in s.span:
+                    assert (member, s.day, slot) not in busy
+                    busy.add((member, s.day, slot))
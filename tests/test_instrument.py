@@ -0,0 +1,58 @@
+import pstats
+
+from timetable_automation import Scheduler
+from timetable_automation.instrument import SchedulerStats, REJECT_REASONS, profiled
+
+def setup_scheduler():
+    return Scheduler("tests/data/slots.csv",
+                     "tests/data/courses.csv",
+                     "tests/data/rooms.csv",
+                     global_room_usage={})
+
+def assign(sch, table, labs, day, code, session_type="L"):
+    return sch._assign_session(table, sch.faculty_ledger, labs, day, "ProfX", code, hrs=1.0,
+                               session_type=session_type, is_elective=False, sheet_name="TestSheet")
+
+def test_stats_are_off_by_default():
+    sch = setup_scheduler()
+    assert sch.stats is None
+    sch.schedule_all()
+    assert sch.records
+
+def test_rejections_are_counted_by_reason():
+    sch = setup_scheduler()
+    sch.stats = SchedulerStats()
+    table = sch._new_grid()
+    labs = {day: False for day in sch.days}
+    assert assign(sch, table, labs, "Monday", "CS101")
+    assert not assign(sch, table, labs, "Monday", "CS101")
+    labs["Tuesday"] = True
+    assert not assign(sch, table, labs, "Tuesday", "CS102", "P")
+    for slot in sch.slots:
+        table.set_cell("Wednesday", slot, "BUSY")
+    assert not assign(sch, table, labs, "Wednesday", "CS103")
+
+    report = sch.stats.report()
+    assert report["counters"]["assign_session"] == 4
+    assert report["rejections"] == dict.fromkeys(REJECT_REASONS, 0) | {
+        "duplicate_day": 1, "lab_day_taken": 1, "no_free_span": 1}
+    assert sum(report["room_candidates"].values()) == 1
+
+def test_report_explains_unscheduled_courses():
+    sch = setup_scheduler()
+    sch.stats = SchedulerStats()
+    sch.limit_rooms([])  # nothing but electives can be placed
+    sch.schedule_all()
+    report = sch.stats.report(sch.unscheduled_list)
+    assert {"schedule_L", "schedule_T", "schedule_P"} <= set(report["phases"])
+    assert report["unscheduled"] and len(report["unscheduled"]) == len(sch.unscheduled_list)
+    for entry in report["unscheduled"]:
+        assert entry["rejections"]["no_room"] > 0
+
+def test_profiled_dumps_pstats(tmp_path):
+    path = tmp_path / "run.pstats"
+    with profiled(str(path)):
+        setup_scheduler().schedule_all()
+    assert pstats.Stats(str(path)).total_calls > 0
+    with profiled(None) as profile:
+        assert profile is None
@@ -0,0 +1,106 @@
+from timetable_automation import FacultyLedger, RoomLedger, Scheduler
+
+def test_book_and_free_rooms_query():
+    ledger = RoomLedger(["C101", "C102", "L201"])
+    ledger.book("C101", [("Monday", "09:00-10:00"), ("Monday", "10:00-11:30")])
+    span = [("Monday", "10:00-11:30"), ("Monday", "11:30-13:00")]
+    assert ledger.free_rooms(["C101", "C102"], span) == ["C102"]
+    assert not ledger.is_free("C101", span)
+    assert ledger.free_count("C101", span) == 1
+
+def test_release_frees_room():
+    ledger = RoomLedger()
+    cells = [("Tuesday", "09:00-10:00")]
+    ledger.book("C101", cells)
+    ledger.release("C101", cells)
+    assert ledger.is_free("C101", cells)
+    assert ledger.occupied("Tuesday", "09:00-10:00") == []
+
+def test_legacy_usage_round_trip():
+    usage = {"Monday": {"09:00-10:00": ["C101", "L201"]}, "MAPPING": {"CS101": "C101"}}
+    ledger = RoomLedger.from_usage(usage)
+    assert ledger.to_usage() == {"Monday": {"09:00-10:00": ["C101", "L201"]}}
+
+def test_scheduler_accepts_legacy_dict():
+    sch = Scheduler("tests/data/slots.csv", "tests/data/courses.csv", "tests/data/rooms.csv",
+                    global_room_usage={"Monday": {"09:00-10:00": ["C101"]}})
+    assert sch.room_ledger.occupied("Monday", "09:00-10:00") == ["C101"]
+    assert sch.global_room_usage["Monday"]["09:00-10:00"] == ["C101"]
+
+def test_faculty_ledger_splits_co_taught_courses():
+    ledger = FacultyLedger(["Prof A", "Prof B"])
+    ledger.book("Prof A/Prof B", [("Monday", "09:00-10:00")], hours=1.0)
+    assert ledger.is_busy("Prof B", [("Monday", "09:00-10:00")])
+    assert not ledger.is_busy("Prof A", [("Monday", "10:00-11:30")])
+    summary = ledger.load_summary().set_index("Faculty")
+    assert summary.loc["Prof A", "Hours"] == 1.0
+    assert summary.loc["Prof B", "Sessions"] == 1
+
+def test_shared_faculty_ledger_blocks_other_department():
+    ledger = FacultyLedger()
+    first = Scheduler("tests/data/slots.csv", "tests/data/courses.csv", "tests/data/rooms.csv", {}, ledger)
+    second = Scheduler("tests/data/slots.csv", "tests/data/courses.csv", "tests/data/rooms.csv", {}, ledger)
+    labs = {day: False for day in first.days}
+    assert first._assign_session(first._new_grid(), ledger, labs, "Monday", "Prof A", "CS101", 1.0, "L", False, "S")
+    # the other department's grid is empty, but Prof A is already teaching Monday morning
+    assert not second._assign_session(second._new_grid(), ledger, dict(labs), "Monday", "Prof A", "CS999", 1.0, "L", False, "S")
+    assert second._assign_session(second._new_grid(), ledger, dict(labs), "Tuesday", "Prof A", "CS999", 1.0, "L", False, "S")
+
+def test_snapshot_restore_undoes_bookings():
+    rooms, faculty = RoomLedger(["C101"]), FacultyLedger(["Prof A"])
+    cells = [("Monday", "09:00-10:00")]
+    room_state, faculty_state = rooms.snapshot("C101", cells), faculty.snapshot("Prof A/Prof Z")
+    rooms.book("C101", cells)
+    faculty.book("Prof A/Prof Z", cells, 1.0)
+    rooms.restore(room_state)
+    faculty.restore(faculty_state)
+    assert rooms.free_rooms(["C101"], cells) == ["C101"]
+    assert not faculty.is_busy("Prof A/Prof Z", cells)
+    assert faculty.roster == ["Prof A"]
+    assert faculty.load_summary()["Sessions"].sum() == 0
+
+def test_checkpoint_rollback_and_day_masks():
+    rooms, faculty = RoomLedger(["C101"]), FacultyLedger(["Prof A"])
+    rooms.book("C101", [("Monday", "09:00-10:00")])
+    saved_rooms, saved_faculty = rooms.checkpoint(), faculty.checkpoint()
+    rooms.book("C101", [("Tuesday", "10:00-11:30")])
+    faculty.book("Prof A", [("Tuesday", "10:00-11:30")], 1.5)
+    days, slots = ["Monday", "Tuesday"], ["09:00-10:00", "10:00-11:30"]
+    assert rooms.busy_by_day("C101", days, slots) == [0b01, 0b10]
+    assert faculty.busy_by_day("Prof A", days, slots) == [0, 0b10]
+    rooms.rollback(saved_rooms)
+    faculty.rollback(saved_faculty)
+    assert rooms.busy_by_day("C101", days, slots) == [0b01, 0]
+    assert faculty.busy_by_day("Prof A", days, slots) == [0, 0]
+    assert faculty.load_summary()["Sessions"].sum() == 0
+
+def test_half_views_book_separate_weeks():
+    rooms, faculty = RoomLedger(["C101", "C102"]), FacultyLedger(["Dr. A"])
+    cells = [("Monday", "09:00-10:00")]
+    rooms.half("1").book("C101", cells)
+    faculty.half("1").book("Dr. A", cells, 1.0)
+    assert not rooms.half("1").is_free("C101", cells)
+    assert rooms.half("2").free_rooms(["C101", "C102"], cells) == ["C101", "C102"]
+    assert faculty.half("1").is_busy("Dr. A", cells) and not faculty.half("2").is_busy("Dr. A", cells)
+    # the ledger itself still sees every booking (e.g. for the room views and legacy usage)
+    assert rooms.to_usage() == {"Monday": {"09:00-10:00": ["C101"]}}
+    assert faculty.load_summary().loc[0, "Hours"] == 1.0
+
+def test_whole_semester_bookings_block_both_halves():
+    rooms = RoomLedger(["C101"])
+    cells = [("Tuesday", "10:00-11:30")]
+    rooms.book("C101", cells)
+    assert not rooms.half("1").is_free("C101", cells) and not rooms.half("2").is_free("C101", cells)
+
+def test_half_view_checkpoint_and_day_masks():
+    rooms = RoomLedger(["C101"])
+    first, second = rooms.half("1"), rooms.half("2")
+    state = second.checkpoint()
+    first.book("C101", [("Monday", "09:00-10:00")])
+    second.book("C101", [("Monday", "10:00-11:30")])
+    days, slots = ["Monday"], ["09:00-10:00", "10:00-11:30"]
+    assert first.busy_by_day("C101", days, slots) == [0b01]
+    assert second.busy_by_day("C101", days, slots) == [0b10]
+    assert rooms.busy_by_day("C101", days, slots) == [0b11]
+    second.rollback(state)
+    assert first.is_free("C101", [("Monday", "10:00-11:30")]) and rooms.busy_by_day("C101", days, slots) == [0]
@@ -0,0 +1,35 @@
+from timetable_automation import OccupancyGrid
+
+DAYS = ["Monday", "Tuesday"]
+SLOTS = ["09:00-10:00", "10:00-11:30", "11:30-13:00", "13:15-14:00", "14:00-15:00"]
+
+def make_grid():
+    return OccupancyGrid(DAYS, SLOTS, excluded=["13:15-14:00"], slot_lengths=[1.0, 1.5, 1.5, 0.75, 1.0])
+
+def test_free_blocks_split_by_excluded():
+    grid = make_grid()
+    assert grid.free_blocks("Monday") == [[0, 1, 2], [4]]
+
+def test_place_and_break_states():
+    grid = make_grid()
+    grid.place("Monday", [0], "CS101 (C101)")
+    assert grid.mark_break("Monday", 1)
+    assert not grid.mark_break("Monday", 0)
+    assert grid.cell("Monday", SLOTS[0]) == "CS101 (C101)"
+    assert grid.cell("Monday", SLOTS[1]) == "BREAK"
+    assert grid.free_blocks("Monday") == [[2], [4]]
+
+def test_candidate_spans_use_shortest_prefix():
+    grid = make_grid()
+    assert list(grid.candidate_spans("Tuesday", 2.0)) == [[0, 1]]
+    assert list(grid.candidate_spans("Tuesday", 1.0)) == [[0], [4]]
+
+def test_to_frame_and_clear_excluded():
+    grid = make_grid()
+    grid.set_cell("Tuesday", "13:15-14:00", "BREAK")
+    grid.place("Tuesday", [4], "CS102")
+    grid.clear_excluded()
+    frame = grid.to_frame()
+    assert list(frame.index) == DAYS
+    assert frame.at["Tuesday", "13:15-14:00"] == ""
+    assert frame.at["Tuesday", "14:00-15:00"] == "CS102"
@@ -0,0 +1,58 @@
+from timetable_automation import Scheduler
+from timetable_automation import optimize
+
+def run(iterations, courses="tests/data/courses.csv"):
+    sch = Scheduler("tests/data/slots.csv", courses, "tests/data/rooms.csv", {})
+    sch.optimize_iterations = iterations
+    sch.schedule_all()
+    return sch
+
+def layout(sch):
+    return [(s.sheet, s.day, s.span, s.code, s.room) for s in sch.sessions]
+
+def test_incremental_score_matches_full_recompute(monkeypatch):
+    checked = []
+    original = optimize.SheetOptimizer._try
+
+    def checked_try(self, *args):
+        result = original(self, *args)
+        full = self.full_parts()
+        assert all(abs(full[k] - self.parts[k]) < 1e-9 for k in full)
+        checked.append(result)
+        return result
+    monkeypatch.setattr(optimize.SheetOptimizer, "_try", checked_try)
+    run(500, "tests/data/search_courses.csv")
+    assert any(checked)
+
+def test_optimizer_keeps_hard_constraints_and_never_loses_hours():
+    greedy, optimized = run(0, "tests/data/search_courses.csv"), run(3000, "tests/data/search_courses.csv")
+    hours = lambda sch: sum(u["remaining_hours"] for u in sch.unscheduled_list)
+    assert hours(optimized) <= hours(greedy)
+
+    assert len({(s.sheet, s.day, s.code) for s in optimized.sessions}) == len(optimized.sessions)
+    used = [(r["day"], r["slot"], r["room"]) for r in optimized.records if r["room"]]
+    assert len(used) == len(set(used))
+    assert len(optimized.records) == sum(len(s.span) for s in optimized.sessions)
+
+def test_optimizer_is_deterministic():
+    assert layout(run(2000)) == layout(run(2000))
+
+def test_optimizer_is_off_by_default():
+    sch = Scheduler("tests/data/slots.csv", "tests/data/courses.csv", "tests/data/rooms.csv", {})
+    assert sch.optimize_iterations == 0
+
+def test_optimizer_keeps_the_break_after_every_session():
+    sch = run(3000, "tests/data/search_courses.csv")
+    starts = {(s.sheet, s.day, s.span[0]) for s in sch.sessions}
+    assert not [s for s in sch.sessions if (s.sheet, s.day, s.span[-1] + 1) in starts]
+
+def test_optimizer_does_not_book_longer_spans_than_greedy():
+    def overshoot(sch):
+        return sum(sum(sch.slot_lengths[sch.slots[i]] for i in s.span) - s.hours for s in sch.sessions)
+    # the bundled grid mixes 1h, 1.5h and quarter-hour slots, so some spans overshoot
+    def bundled(iterations):
+        sch = Scheduler("data/timeslots.csv", "data/CSE_5_A_courses.csv", "data/rooms.csv", {})
+        sch.optimize_iterations = iterations
+        sch.schedule_all()
+        return sch
+    assert overshoot(bundled(3000)) <= overshoot(bundled(0)) + 1e-9
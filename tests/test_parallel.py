@@ -0,0 +1,48 @@
+from timetable_automation import FacultyLedger, RoomLedger, Scheduler
+from timetable_automation.parallel import partition_rooms, schedule_departments
+
+DEPARTMENTS = {"A": "tests/data/courses.csv", "B": "tests/data/courses.csv", "C": "tests/data/courses.csv"}
+
+def run(workers, engine="greedy", settings=None):
+    room_ledger = RoomLedger(["C101", "C102", "C103", "L201", "L202"])
+    schedulers = schedule_departments(DEPARTMENTS, "tests/data/slots.csv", "tests/data/rooms.csv",
+                                      room_ledger, FacultyLedger(), workers=workers, engine=engine, settings=settings)
+    return {name: [(s.sheet, s.day, s.span, s.code, s.room) for s in sch.sessions] for name, sch in schedulers.items()}, schedulers
+
+def test_partition_gives_each_department_labs_and_classrooms():
+    shares = partition_rooms(["C101", "C102", "C103", "L201", "L202"], ["A", "B"])
+    for share in shares.values():
+        assert any(r.startswith("L") for r in share) and any(r.startswith("C") for r in share)
+    assert set(shares["A"]).isdisjoint(shares["B"])
+
+def test_parallel_run_is_deterministic_and_conflict_free():
+    first, schedulers = run(workers=1)
+    second, _ = run(workers=2)
+    assert first == second
+    assert list(first) == list(DEPARTMENTS)
+
+    # all departments share the room ledger, so a room is used once per (sheet, day, slot)
+    used = [(r["sheet"], r["day"], r["slot"], r["room"]) for sch in schedulers.values() for r in sch.records if r["room"]]
+    assert len(used) == len(set(used))
+
+def test_parallel_search_with_a_node_cap_is_deterministic():
+    settings = {"search_max_nodes": Scheduler.SEARCH_NODES, "search_budget": None}
+    first, _ = run(workers=1, engine="search", settings=settings)
+    second, _ = run(workers=2, engine="search", settings=settings)
+    assert first == second
+
+def test_semester_halves_schedule_independently(tmp_path):
+    from timetable_automation.compiler import compile_problem
+    from timetable_automation.synthetic import generate_institution
+
+    model = compile_problem(*generate_institution(tmp_path, departments=1, courses=10, rooms=2, labs=1, faculty=3),
+                            cache_dir=None)
+    def sessions(sheets):
+        sch = Scheduler.from_model(model, "D000", RoomLedger(model.rooms), model.faculty_ledger())
+        sch.schedule_all(sheets=sheets)
+        return [(s.sheet, s.day, s.span, s.code, s.room) for s in sch.sessions]
+    both = sessions(None)
+    assert both == sessions(["First_Half"]) + sessions(["Second_Half"])
+    # a scarce room is reused by the other half at the same time
+    first = {(d, sp, r) for sh, d, sp, c, r in both if sh == "First_Half" and r}
+    assert first & {(d, sp, r) for sh, d, sp, c, r in both if sh == "Second_Half" and r}
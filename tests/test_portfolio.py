@@ -0,0 +1,36 @@
+from timetable_automation import Scheduler
+from timetable_automation.compiler import compile_problem
+from timetable_automation.main import Random_SEED
+from timetable_automation.portfolio import schedule_portfolio, rank_key, run_metrics
+
+DEPARTMENTS = {"A": "tests/data/courses.csv", "B": "tests/data/search_courses.csv"}
+
+def layout(sch):
+    return [(s.sheet, s.day, s.span, s.code, s.room) for s in sch.sessions]
+
+def model():
+    return compile_problem(DEPARTMENTS, "tests/data/rooms.csv", "tests/data/slots.csv", "data/Faculty.csv", cache_dir=None)
+
+def test_seed_is_a_scheduler_parameter():
+    make = lambda seed: Scheduler("tests/data/slots.csv", "tests/data/courses.csv", "tests/data/rooms.csv", {}, seed=seed)
+    default, same, other = make(None), make(Random_SEED), make(7)
+    assert default.seed == Random_SEED
+    for sch in (default, same, other):
+        sch.schedule_all()
+    assert layout(default) == layout(same)
+    assert layout(default) != layout(other)
+
+def test_portfolio_keeps_best_seed_reproducibly():
+    seeds = [Random_SEED, 1, 2, 3]
+    best_seed, schedulers, table = schedule_portfolio(model(), seeds, workers=1)
+    assert [seed for seed, _ in table] == seeds
+    best = min(table, key=lambda row: rank_key(row[1]))
+    assert best_seed == best[0]
+    assert list(schedulers) == list(DEPARTMENTS)
+    # the winner comes back as the run that was scored
+    assert run_metrics(schedulers) == best[1]
+
+    again_seed, again, again_table = schedule_portfolio(model(), seeds, workers=2)
+    assert (again_seed, again_table) == (best_seed, table)
+    assert [layout(s) for s in again.values()] == [layout(s) for s in schedulers.values()]
+    assert run_metrics(again) == best[1]
@@ -0,0 +1,61 @@
+from timetable_automation import Placement, RecordStore, Scheduler
+
+def sample_store():
+    return RecordStore([
+        {"sheet": "First_Half", "day": "Monday", "slot": "09:00-10:00", "code": "CS101", "room": "C101"},
+        {"sheet": "First_Half", "day": "Monday", "slot": "10:00-11:30", "code": "CS101", "room": "C101"},
+        {"sheet": "Second_Half", "day": "Monday", "slot": "09:00-10:00", "code": "CS102", "room": "C102"},
+    ])
+
+def test_store_keeps_list_of_dicts_view():
+    store = sample_store()
+    assert len(store) == 3
+    assert store[0]["code"] == "CS101"
+    assert store[0].get("faculty") == ""
+    assert store.as_dicts()[2]["room"] == "C102"
+
+def test_indexed_lookups():
+    store = sample_store()
+    assert store.has_course_on_day("First_Half", "Monday", "CS101")
+    assert not store.has_course_on_day("Second_Half", "Monday", "CS101")
+    assert len(store.for_course("First_Half", "CS101")) == 2
+    assert {r.code for r in store.at("Monday", "09:00-10:00")} == {"CS101", "CS102"}
+    assert store.codes("Second_Half") == ["CS102"]
+
+def test_placements_compare_and_hash_by_value():
+    store, again = sample_store(), sample_store()
+    assert store[0] == again[0] and store[0] == store.as_dicts()[0]
+    assert len(set(store) | set(again)) == 3
+    assert {store[2]: "kept"}[again[2]] == "kept"
+
+def test_columnar_view():
+    cols = sample_store().to_columns()
+    assert set(cols) == set(Placement.FIELDS)
+    assert cols["sheet"] == ["First_Half", "First_Half", "Second_Half"]
+
+def test_scheduler_wraps_assigned_lists():
+    sch = Scheduler("tests/data/slots.csv", "tests/data/courses.csv",
+                    "tests/data/rooms.csv", global_room_usage={})
+    sch.records = [{"sheet": "S", "day": "Monday", "slot": "09:00-10:00", "code": "CS101"}]
+    assert isinstance(sch.records, RecordStore)
+    assert sch.records.has_course_on_day("S", "Monday", "CS101")
+
+def test_truncate_undoes_appends():
+    store = sample_store()
+    store.append({"sheet": "Second_Half", "day": "Tuesday", "slot": "09:00-10:00", "code": "CS103"})
+    store.truncate(2)
+    assert len(store) == 2
+    assert store.codes("Second_Half") == []
+    assert not store.has_course_on_day("Second_Half", "Tuesday", "CS103")
+    assert [r.code for r in store.at("Monday", "09:00-10:00")] == ["CS101"]
+
+def test_faculty_and_room_indices():
+    store = sample_store()
+    store.append({"sheet": "Second_Half", "day": "Tuesday", "slot": "09:00-10:00", "code": "CS103",
+                  "faculty": "Prof A / Prof B", "room": "C101"})
+    assert [r.code for r in store.for_faculty("Prof B")] == ["CS103"]
+    assert store.faculty() == ["Prof A", "Prof B"]
+    assert store.rooms() == ["C101", "C102"]
+    assert len(store.for_room("C101")) == 3
+    store.truncate(3)
+    assert store.faculty() == [] and len(store.for_room("C101")) == 2
@@ -1,4 +1,3 @@
-import pandas as pd
 from timetable_automation import Scheduler
 
 def setup_scheduler():
@@ -9,30 +8,28 @@ def setup_scheduler():
 
 def test_assign_simple_lecture():
     sch = setup_scheduler()
-    table = pd.DataFrame("", index=sch.days, columns=sch.slots)
-    faculty_busy = {day: {slot: [] for slot in sch.slots} for day in sch.days}
+    table = sch._new_grid()
     labs = {day: False for day in sch.days}
 
     ok = sch._assign_session(
-        table, faculty_busy, labs,
+        table, sch.faculty_ledger, labs,
         "Monday", "ProfX", "CS101",
         hrs=1.0, session_type="L",
         is_elective=False, sheet_name="TestSheet"
     )
     assert ok
-    assert any("CS101" in table.at["Monday", s] for s in sch.slots)
+    assert any("CS101" in table.cell("Monday", s) for s in sch.slots)
 
 def test_assign_fails_on_occupied():
     sch = setup_scheduler()
-    table = pd.DataFrame("", index=sch.days, columns=sch.slots)
-    some_slot = sch.slots[0]
-    table.at["Monday", some_slot] = "BUSY"
+    table = sch._new_grid()
+    for some_slot in sch.slots:
+        table.set_cell("Monday", some_slot, "BUSY")
 
-    faculty_busy = {day: {slot: [] for slot in sch.slots} for day in sch.days}
     labs = {day: False for day in sch.days}
 
     ok = sch._assign_session(
-        table, faculty_busy, labs,
+        table, sch.faculty_ledger, labs,
         "Monday", "ProfX", "CS101",
         hrs=1.0, session_type="L",
         is_elective=False, sheet_name="TestSheet"
@@ -41,12 +38,11 @@ def test_assign_fails_on_occupied():
 
 def test_assign_elective_has_empty_room():
     sch = setup_scheduler()
-    table = pd.DataFrame("", index=sch.days, columns=sch.slots)
-    faculty_busy = {day: {slot: [] for slot in sch.slots} for day in sch.days}
+    table = sch._new_grid()
     labs = {day: False for day in sch.days}
 
     ok = sch._assign_session(
-        table, faculty_busy, labs,
+        table, sch.faculty_ledger, labs,
         "Tuesday", "ProfX", "Elective_1",
         hrs=1.0, session_type="L",
         is_elective=True, sheet_name="TestSheet"
@@ -54,3 +50,41 @@ def test_assign_elective_has_empty_room():
     assert ok
     rec = next(r for r in sch.records if r["code"] == "Elective_1")
     assert rec["room"] == ""
+
+def setup_capacity_scheduler(tmp_path, students):
+    rooms = tmp_path / "rooms.csv"
+    rooms.write_text("Room_ID,Capacity\nC1,240\nC2,60\nC3,-\nC4,96\nC5,96\nL1,45\n")
+    courses = tmp_path / "courses.csv"
+    courses.write_text("Course_Code,Course_Title,Faculty,L-T-P-S-C,Semester_Half,Elective,Students\n"
+                       f"CS101,Intro,ProfX,3-0-0-0-3,1,0,{students}\n")
+    return Scheduler("tests/data/slots.csv", str(courses), str(rooms), global_room_usage={})
+
+def test_parse_capacity_tolerates_placeholders():
+    from timetable_automation.main import parse_capacity
+
+    assert parse_capacity("96") == 96 and parse_capacity(78.0) == 78
+    assert parse_capacity("-") is None and parse_capacity("") is None and parse_capacity(float("nan")) is None
+
+def test_room_pick_is_best_fit(tmp_path):
+    sch = setup_capacity_scheduler(tmp_path, 85)
+    order = sch._room_order("CS101", "L")
+    assert set(order[:2]) == {"C4", "C5"} and order[2:] == ["C1", "C3", "C2"]
+    cells = [("Monday", "09:00-10:00")]
+    assert sch._pick_room("CS101", "L", cells) in ("C4", "C5")
+    # both 96-seaters taken: the 240-seat hall is the smallest room left that fits
+    sch.course_room_map = {}
+    sch.room_ledger.book("C4", cells)
+    sch.room_ledger.book("C5", cells)
+    assert sch._pick_room("CS101", "L", cells) == "C1"
+
+def test_unknown_capacity_rooms_come_before_too_small(tmp_path):
+    sch = setup_capacity_scheduler(tmp_path, 300)
+    order = sch._room_order("CS101", "L")
+    assert order[:2] == ["C3", "C1"] and set(order[2:4]) == {"C4", "C5"} and order[4:] == ["C2"]
+
+def test_mapped_room_is_not_double_booked(tmp_path):
+    sch = setup_capacity_scheduler(tmp_path, 85)
+    cells = [("Monday", "09:00-10:00")]
+    sch.course_room_map["CS101"] = "C4"
+    sch.room_ledger.book("C4", cells)
+    assert sch._pick_room("CS101", "L", cells) == "C5"
@@ -1,4 +1,3 @@
-import pandas as pd
 from timetable_automation import Scheduler
 
 def dummy_scheduler():
@@ -17,15 +16,15 @@ def test_slot_len_1_5hour():
 
 def test_free_blocks_all_free():
     sch = dummy_scheduler()
-    table = pd.DataFrame("", index=sch.days, columns=sch.slots)
+    table = sch._new_grid()
     blocks = sch._free_blocks(table, "Monday")
     assert len(blocks) > 0
     assert set(blocks[0]).issubset(set(sch.slots))
 
 def test_free_blocks_with_excluded():
     sch = dummy_scheduler()
-    table = pd.DataFrame("", index=sch.days, columns=sch.slots)
+    table = sch._new_grid()
     excluded = sch.excluded[0]
-    table.at["Monday", excluded] = "X"
+    table.set_cell("Monday", excluded, "X")
     blocks = sch._free_blocks(table, "Monday")
     assert all(excluded not in block for block in blocks)
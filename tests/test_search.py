@@ -0,0 +1,42 @@
+import pytest
+
+from timetable_automation import Scheduler
+
+def run(engine, courses="tests/data/search_courses.csv"):
+    sch = Scheduler("tests/data/slots.csv", courses, "tests/data/rooms.csv", {}, engine=engine)
+    sch.schedule_all()
+    return sch
+
+def test_search_completes_what_greedy_misses():
+    assert run("greedy").unscheduled_list
+    sch = run("search")
+    assert sch.unscheduled_list == []
+
+    # hard constraints still hold: a course meets once a day, one lab a day, rooms are not shared
+    days = [(r["day"], r["code"]) for r in sch.records]
+    by_session = {(s.day, s.code) for s in sch.sessions}
+    assert len(by_session) == len(sch.sessions)
+    labs = [s.day for s in sch.sessions if s.session_type == "P"]
+    assert len(labs) == len(set(labs))
+    used = [(r["day"], r["slot"], r["room"]) for r in sch.records if r["room"]]
+    assert len(used) == len(set(used))
+    assert len(days) == sum(len(s.span) for s in sch.sessions)
+
+def test_search_is_reproducible_with_node_cap():
+    def capped():
+        sch = Scheduler("tests/data/slots.csv", "tests/data/courses.csv", "tests/data/rooms.csv", {}, engine="search")
+        sch.search_budget, sch.search_max_nodes = None, 50
+        sch.schedule_all()
+        return [(s.sheet, s.day, s.span, s.code, s.room) for s in sch.sessions]
+    assert capped() == capped()
+
+def test_search_leaves_no_tentative_state_behind():
+    sch = run("search", "tests/data/too_many_hours.csv")
+    # HUGE1 needs more days than the week has: what was placed is consistent, the rest is reported
+    assert sch.unscheduled_list
+    assert len(sch.records) == sum(len(s.span) for s in sch.sessions)
+    assert sch.faculty_ledger.load_summary()["Sessions"].sum() == len(sch.sessions)
+
+def test_unknown_engine_is_rejected():
+    with pytest.raises(ValueError):
+        run("annealing")
@@ -0,0 +1,45 @@
+import datetime as dt
+
+import numpy as np
+import pandas as pd
+
+from timetable_automation.exams import _record, SLOTS
+from timetable_automation.seating import interleave, room_pieces, seating_plan, write_seating_plan
+
+MON = dt.date(2025, 12, 1)
+
+def test_interleave_alternates_and_overflows_into_spare_seats():
+    first, second = interleave(3, 2, seats=8)
+    assert first.tolist() == [1, 3, 5] and second.tolist() == [2, 4]
+    first, second = interleave(5, 1, seats=6)
+    assert first.tolist() == [1, 3, 5, 4, 6] and second.tolist() == [2]
+    first, _ = interleave(4, 0)
+    assert sorted(first.tolist()) == [1, 2, 3, 4]
+
+def test_room_pieces_parse_rooms_and_offsets():
+    records = [_record("1CSEA", MON, SLOTS[0], "MA101", 30, "C1 (20); C2 (5) (PARTIAL)"),
+               _record("1CSEB", MON, SLOTS[0], "MA102", 0, "")]
+    pieces = room_pieces(records)
+    assert pieces[["record", "Room", "seats", "offset"]].values.tolist() == [[0, "C1", 20, 0], [0, "C2", 5, 20]]
+
+def test_seating_plan_splits_rosters_and_shares_rooms(tmp_path):
+    courses = {"1CSEA": [{"course": "MA101", "students": 4}],
+               "4CSE": [{"course": "E1", "students": 2, "group": ("all-4th year", "elective-1")},
+                        {"course": "E2", "students": 2, "group": ("all-4th year", "elective-1")}]}
+    records = [_record("1CSEA", MON, SLOTS[0], "MA101", 4, "C1 (3); C2 (1)"),
+               _record("4CSE", MON, SLOTS[0], "E1", 2, "C1 (2)"),
+               _record("4CSE", MON, SLOTS[0], "E2", 2, "C2 (2)")]
+    rosters = {"1CSEA": np.array(["A1", "A2", "A3", "A4"], dtype=object),
+               "4CSEA": np.array(["F1", "F2"], dtype=object), "4CSEB": np.array(["F3"], dtype=object)}
+    plan = list(seating_plan(courses, records, rosters, {"C1": 6}))
+    assert [room for _, _, room, _ in plan] == ["C1", "C2"]
+    c1 = pd.DataFrame(plan[0][3])
+    assert c1[["Seat", "Roll Number", "Course"]].values.tolist() == [
+        [1, "A1", "MA101"], [2, "F1", "E1"], [3, "A2", "MA101"], [4, "F2", "E1"], [5, "A3", "MA101"]]
+    # E2 takes the next run of the 4th-year roster, which only has one student left
+    c2 = pd.DataFrame(plan[1][3])
+    assert c2[["Seat", "Roll Number"]].values.tolist() == [[1, "A4"], [2, "F3"]]
+
+    assert write_seating_plan(iter(plan), tmp_path / "plan.xlsx") == 7
+    sheets = pd.read_excel(tmp_path / "plan.xlsx", sheet_name=None)
+    assert list(sheets) == ["01-Dec-2025 Morning"] and len(sheets["01-Dec-2025 Morning"]) == 7
@@ -0,0 +1,64 @@
+import pandas as pd
+
+from timetable_automation import Scheduler
+from timetable_automation.columnar import write_columnar
+from timetable_automation.validate import load, validate, read_courses
+
+def run(tmp_path, name="A", courses="tests/data/courses.csv"):
+    sch = Scheduler("tests/data/slots.csv", courses, "tests/data/rooms.csv", {})
+    sch.run_all_outputs(name, student_filename=str(tmp_path / f"{name}_timetable.xlsx"), columnar="csv")
+    return sch
+
+def test_workbook_and_columnar_agree(tmp_path):
+    run(tmp_path)
+    from_xlsx, courses = load([str(tmp_path / "A_timetable.xlsx")])
+    from_csv, _ = load([str(tmp_path / "A_placements.csv")])
+    key = ["sheet", "day", "slot", "code", "room"]
+    assert from_xlsx[key].sort_values(key).values.tolist() == from_csv[key].sort_values(key).values.tolist()
+    assert set(courses["code"]) == {"CS101", "CS102", "CS103"}
+
+def test_clean_run_has_no_clashes(tmp_path):
+    run(tmp_path)
+    placements, _ = load([str(tmp_path)])
+    issues = validate(placements, read_courses({"A": "tests/data/courses.csv"}))
+    assert issues[issues["check"] != "contact_hours"].empty
+
+def test_detects_injected_problems(tmp_path):
+    run(tmp_path)
+    placements, courses = load([str(tmp_path / "A_placements.csv")])
+    first = placements.iloc[0]
+    lab = placements[placements["session_type"] == "P"].iloc[0]
+    extra = pd.DataFrame([
+        dict(first, dept="B", code="XX100"),                             # same room and faculty, other dept
+        dict(lab, code="CS999", room="L999", faculty="Prof Q"),         # second lab that day
+        dict(first, dept="C", slot="13:15-14:00", room="C999", faculty=""),  # excluded slot
+    ])
+    issues = validate(pd.concat([placements, extra], ignore_index=True),
+                      read_courses({"A": "tests/data/courses.csv"}))
+    found = issues.groupby("check").size().to_dict()
+    assert found["room_clash"] == 1 and found["faculty_clash"] >= 1
+    assert found["labs_per_day"] == 1 and found["excluded_slot"] == 1
+    assert "XX100" in issues[issues["check"] == "room_clash"]["detail"].iloc[0]
+
+def test_contact_hours_compare_clock_time(tmp_path):
+    # the test grid has 1h and 1.5h slots, so a 1.5h lecture spans 2.5h of clock time
+    run(tmp_path)
+    placements, _ = load([str(tmp_path / "A_placements.csv")])
+    courses = read_courses({"A": "tests/data/courses.csv"})
+    issues = validate(placements, courses, checks=("contact_hours",))
+    assert "L: 5.0h placed, 3.0h expected" in issues[issues["subject"] == "CS101"]["detail"].tolist()
+
+    courses.loc[courses["code"] == "CS101", "ltp"] = "5-1-0-0-5"
+    issues = validate(placements, courses, checks=("contact_hours",))
+    assert "CS101" not in issues["subject"].tolist()
+
+def test_codes_ending_in_t_are_not_read_as_tutorials(tmp_path):
+    courses = tmp_path / "courses.csv"
+    courses.write_text(open("tests/data/courses.csv").read().replace("CS101", "MAT").replace("CS103", "CST"))
+    run(tmp_path, courses=str(courses))
+    from_xlsx, legend = load([str(tmp_path / "A_timetable.xlsx")])
+    from_csv, _ = load([str(tmp_path / "A_placements.csv")])
+    key = ["sheet", "day", "slot", "code", "room", "session_type"]
+    assert from_xlsx[key].sort_values(key).values.tolist() == from_csv[key].sort_values(key).values.tolist()
+    assert {"MAT", "CST"} <= set(from_xlsx["code"]) and "MA" not in set(from_xlsx["code"])
+    assert (from_xlsx.loc[from_xlsx["code"] == "MAT", "session_type"] == "T").any()
@@ -0,0 +1,4 @@
+from .main import Course, Scheduler
+from .occupancy import OccupancyGrid
+from .records import Placement, RecordStore
+from .ledgers import RoomLedger, FacultyLedger
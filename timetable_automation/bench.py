@@ -0,0 +1,185 @@
+import io
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import tracemalloc
+import contextlib
+
+from .main import Scheduler
+from .ledgers import RoomLedger
+from .compiler import compile_problem
+from .export import write_student_workbook, write_faculty_workbook, write_room_workbook
+from .synthetic import PRESETS, generate_institution
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+# phases nest: generate_timetable includes _assign_session, export includes elective_rooms
+PHASES = ("compile", "generate_timetable", "_assign_session", "elective_rooms", "export", "views")
+
+
+# --------------------- Timing ---------------------
+class PhaseTimer:
+    """Accumulated wall time and call counts per phase; wrap() times a method on a class."""
+
+    def __init__(self):
+        self.seconds = {p: 0.0 for p in PHASES}
+        self.calls = {p: 0 for p in PHASES}
+        self._patched = []
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        t = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[name] += time.perf_counter() - t
+            self.calls[name] += 1
+
+    def wrap(self, owner, attr, name):
+        original = getattr(owner, attr)
+
+        def timed(*args, **kwargs):
+            with self.phase(name):
+                return original(*args, **kwargs)
+
+        setattr(owner, attr, timed)
+        self._patched.append((owner, attr, original))
+
+    def unwrap(self):
+        for owner, attr, original in reversed(self._patched):
+            setattr(owner, attr, original)
+        self._patched = []
+
+    def as_dict(self):
+        return {p: {"seconds": round(self.seconds[p], 4), "calls": self.calls[p]} for p in PHASES}
+
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+# --------------------- Benchmark ---------------------
+def run_case(size="small", trace_memory=False, seed=0, **overrides):
+    """
+    Generate one synthetic institution ('size' preset from synthetic.PRESETS plus any
+    generate_institution() overrides), schedule every department on shared ledgers and
+    export it, timing each phase. With trace_memory the Python heap peak is recorded too
+    (tracemalloc slows the run, so compare timings only between runs with the same flag).
+    """
+    params = dict(PRESETS[size], **overrides)
+    timer = PhaseTimer()
+    with tempfile.TemporaryDirectory() as work:
+        departments, rooms_file, slots_file, faculty_file = generate_institution(work, seed=seed, **params)
+        if trace_memory:
+            tracemalloc.start()
+        timer.wrap(Scheduler, "generate_timetable", "generate_timetable")
+        timer.wrap(Scheduler, "_assign_session", "_assign_session")
+        timer.wrap(Scheduler, "_compute_elective_room_assignments_legally", "elective_rooms")
+        t0 = time.perf_counter()
+        try:
+            with timer.phase("compile"):
+                model = compile_problem(departments, rooms_file, slots_file, faculty_file, cache_dir=None)
+            room_ledger, faculty_ledger = RoomLedger(model.rooms), model.faculty_ledger()
+            schedulers = {}
+            for name in departments:
+                scheduler = Scheduler.from_model(model, name, room_ledger, faculty_ledger)
+                scheduler.schedule_all()
+                schedulers[name] = scheduler
+            # exports print progress lines; keep the benchmark output readable
+            with contextlib.redirect_stdout(io.StringIO()):
+                for name, scheduler in schedulers.items():
+                    with timer.phase("export"):
+                        write_student_workbook(scheduler, f"{work}/{name}_timetable.xlsx")
+                with timer.phase("views"):
+                    records = {name: s.records for name, s in schedulers.items()}
+                    write_faculty_workbook(records, f"{work}/faculty.xlsx", Scheduler.DAYS, model.slots)
+                    write_room_workbook(records, f"{work}/rooms.xlsx", Scheduler.DAYS, model.slots)
+            total = time.perf_counter() - t0
+        finally:
+            timer.unwrap()
+            traced = tracemalloc.get_traced_memory()[1] if trace_memory else None
+            if trace_memory:
+                tracemalloc.stop()
+
+    return {
+        "size": size,
+        "params": dict(params, seed=seed),
+        "total_seconds": round(total, 4),
+        "phases": timer.as_dict(),
+        "placements": sum(len(s.records) for s in schedulers.values()),
+        "unscheduled_hours": round(sum(u["remaining_hours"] for s in schedulers.values() for u in s.unscheduled_list), 2),
+        "peak_rss_mb": _peak_rss_mb(),
+        "peak_traced_mb": round(traced / 2 ** 20, 1) if traced is not None else None,
+    }
+
+
+def compare(current, baseline, tolerance=1.5, floor=0.25):
+    """
+    Phases (and totals) that got more than 'tolerance' times slower than the baseline, for
+    sizes present in both; phases under 'floor' seconds in both runs are ignored as noise.
+    Returns [(size, phase, baseline seconds, current seconds), ...].
+    """
+    base = {run["size"]: run for run in baseline["runs"]}
+    slower = []
+    for run in current["runs"]:
+        old = base.get(run["size"])
+        if old is None:
+            continue
+        pairs = [("total", old["total_seconds"], run["total_seconds"])]
+        pairs += [(p, old["phases"][p]["seconds"], run["phases"][p]["seconds"]) for p in PHASES if p in old["phases"]]
+        for phase, before, now in pairs:
+            if max(before, now) >= floor and now > before * tolerance:
+                slower.append((run["size"], phase, before, now))
+    return slower
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the scheduler on synthetic institutions of growing size.")
+    parser.add_argument("--sizes", nargs="+", default=["tiny", "small", "medium"], choices=list(PRESETS))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--trace-memory", action="store_true", help="record the Python heap peak with tracemalloc")
+    parser.add_argument("--out", help="write the results as JSON")
+    parser.add_argument("--baseline", help="compare against an earlier --out file")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="slowdown factor reported as a regression")
+    args = parser.parse_args(argv)
+
+    results = {"python": platform.python_version(), "platform": platform.platform(),
+               "created": time.strftime("%Y-%m-%dT%H:%M:%S"), "trace_memory": args.trace_memory, "runs": []}
+    print(f"{'size':<8} {'total':>8} " + " ".join(f"{p:>18}" for p in PHASES) + f" {'placements':>10} {'rss MB':>7}")
+    for size in args.sizes:
+        run = run_case(size, args.trace_memory, args.seed)
+        results["runs"].append(run)
+        print(f"{size:<8} {run['total_seconds']:>8.3f} "
+              + " ".join(f"{run['phases'][p]['seconds']:>18.3f}" for p in PHASES)
+              + f" {run['placements']:>10} {run['peak_rss_mb'] or '-':>7}")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get("trace_memory", False) != args.trace_memory:
+            print("Baseline and this run differ in --trace-memory; timings are not comparable.")
+            return 2
+        slower = compare(results, baseline, args.tolerance)
+        for size, phase, before, now in slower:
+            print(f"REGRESSION {size}/{phase}: {before:.3f}s -> {now:.3f}s")
+        if slower:
+            return 1
+        print(f"No phase slower than {args.tolerance}x the baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+import os
+import pandas as pd
+
+# Parquet and Arrow need pyarrow; CSV and JSON Lines always work
+try:
+    import pyarrow  # noqa: F401
+    HAVE_ARROW = True
+except ImportError:
+    HAVE_ARROW = False
+
+FORMATS = ("auto", "parquet", "arrow", "csv", "jsonl")
+EXTENSIONS = {"parquet": ".parquet", "arrow": ".arrow", "csv": ".csv", "jsonl": ".jsonl"}
+
+UNSCHEDULED_COLUMNS = ("dept", "sheet", "course_code", "course_title", "faculty", "type", "remaining_hours", "semester_half")
+ELECTIVE_ROOM_COLUMNS = ("dept", "sheet", "basket", "title", "room")
+
+
+def resolve_format(fmt):
+    """Concrete format for 'fmt' ("auto" is parquet when pyarrow is installed, else csv)."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown columnar format {fmt!r}; expected one of {FORMATS}")
+    if fmt == "auto":
+        return "parquet" if HAVE_ARROW else "csv"
+    if fmt in ("parquet", "arrow") and not HAVE_ARROW:
+        raise ImportError(f"format {fmt!r} needs pyarrow; use 'csv' or 'jsonl' instead")
+    return fmt
+
+
+def write_table(columns, path_base, fmt="auto"):
+    """
+    Write {column: [values...]} to path_base + the format's extension and return the path.
+    Column order follows the dict; empty tables still get their header (csv) or schema.
+    """
+    fmt = resolve_format(fmt)
+    path = path_base + EXTENSIONS[fmt]
+    df = pd.DataFrame(columns)
+    if fmt == "parquet":
+        df.to_parquet(path, index=False)
+    elif fmt == "arrow":
+        df.to_feather(path)
+    elif fmt == "csv":
+        df.to_csv(path, index=False)
+    else:
+        df.to_json(path, orient="records", lines=True)
+    return path
+
+
+# --------------------- Scheduler export ---------------------
+def placement_columns(scheduler, dept_name):
+    """dept plus every Placement field (sheet, day, slot, code, display, faculty, room, session_type)."""
+    cols = scheduler.records.to_columns()
+    return {"dept": [dept_name] * len(scheduler.records), **cols}
+
+
+def unscheduled_columns(scheduler, dept_name):
+    rows = scheduler.unscheduled_list
+    return {c: [dept_name] * len(rows) if c == "dept" else [u.get(c) for u in rows] for c in UNSCHEDULED_COLUMNS}
+
+
+def elective_room_columns(scheduler, dept_name):
+    """
+    The elective room map as rows. Keys are 'Elective_<basket>||<title>'; sheets whose map
+    was not computed yet (no Excel export ran) are computed here.
+    """
+    cols = {c: [] for c in ELECTIVE_ROOM_COLUMNS}
+    for sheet in scheduler.grids:
+        if sheet not in scheduler.elective_room_map:
+            scheduler._compute_elective_room_assignments_legally(sheet)
+        for key, room in scheduler.elective_room_map[sheet].items():
+            basket, _, title = key.partition("||")
+            for c, v in zip(ELECTIVE_ROOM_COLUMNS, (dept_name, sheet, basket[len("Elective_"):], title, room)):
+                cols[c].append(v)
+    return cols
+
+
+def write_columnar(scheduler, dept_name, out_dir=".", fmt="auto"):
+    """
+    Write a scheduled run as three tables: <dept>_placements (one row per placed slot),
+    <dept>_unscheduled and <dept>_elective_rooms. Returns the paths written.
+    """
+    base = os.path.join(out_dir, dept_name)
+    return [
+        write_table(placement_columns(scheduler, dept_name), f"{base}_placements", fmt),
+        write_table(unscheduled_columns(scheduler, dept_name), f"{base}_unscheduled", fmt),
+        write_table(elective_room_columns(scheduler, dept_name), f"{base}_elective_rooms", fmt),
+    ]
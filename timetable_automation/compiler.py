@@ -0,0 +1,164 @@
+import os
+import pickle
+import hashlib
+import pandas as pd
+
+from .main import Course, Scheduler, stable_hash_val
+from .ledgers import FacultyLedger
+
+# bump when the model layout changes so stale caches are ignored
+MODEL_VERSION = 2
+
+
+# --------------------- Problem model ---------------------
+class ProblemModel:
+    """
+    Every scheduler input, parsed once and interned to integer IDs.
+
+    - values: table of distinct cell values; course rows are stored as tuples of value IDs
+    - slots / rooms / faculty: entity lists, the position being the entity ID
+    - departments: dept name -> (column IDs, [row tuples])
+    - stable_hashes: precomputed stable_hash_val() for every string the scheduler sorts by
+      (room IDs, course codes, elective placeholders and "<day>-<L|T|P>" labels); they are
+      seed-independent, so one model serves every Scheduler seed
+    The model is plain data and pickles cheaply; see compile_problem() for the cache.
+    """
+
+    def __init__(self):
+        self.values = []
+        self._value_id = {}
+        self.slots = []
+        self.rooms = []
+        self.room_capacity = {}   # room -> raw Capacity cell (may be non-numeric)
+        self.faculty = []
+        self.departments = {}
+        self.stable_hashes = {}
+        self.sources = {}         # label -> sha256 of the file it was compiled from
+        self._room_id = {}
+        self._faculty_id = {}
+
+    def intern(self, value):
+        """Integer ID for a cell value (numpy scalars are stored as Python values)."""
+        if hasattr(value, "item"):
+            value = value.item()
+        key = (type(value), value) if value == value else (float, "nan")
+        vid = self._value_id.get(key)
+        if vid is None:
+            vid = self._value_id[key] = len(self.values)
+            self.values.append(value)
+        return vid
+
+    # --------------------- Entity IDs ---------------------
+    def room_id(self, room):
+        return self._room_id[room]
+
+    def faculty_id(self, name):
+        return self._faculty_id[name]
+
+    # --------------------- Course access ---------------------
+    def course_rows(self, dept_name):
+        """Course rows of one department as plain dicts (column -> value)."""
+        columns, rows = self.departments[dept_name]
+        names = [self.values[c] for c in columns]
+        return [{n: self.values[v] for n, v in zip(names, row)} for row in rows]
+
+    def courses_for(self, dept_name):
+        return [Course(row) for row in self.course_rows(dept_name)]
+
+    def all_course_rows(self):
+        """Every department's course rows concatenated, in department order."""
+        return [row for name in self.departments for row in self.course_rows(name)]
+
+    def faculty_ledger(self):
+        return FacultyLedger(self.faculty)
+
+
+def file_digest(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+# --------------------- Compilation ---------------------
+def _build_model(departments, rooms_file, slots_file, faculty_file):
+    model = ProblemModel()
+
+    slot_frame = pd.read_csv(slots_file)
+    model.slots = [f"{str(s).strip()}-{str(e).strip()}" for s, e in zip(slot_frame["Start_Time"], slot_frame["End_Time"])]
+
+    rooms_df = pd.read_csv(rooms_file)
+    capacity = rooms_df["Capacity"] if "Capacity" in rooms_df.columns else [None] * len(rooms_df)
+    for room, cap in zip(rooms_df["Room_ID"], capacity):
+        room = str(room).strip()
+        model.rooms.append(room)
+        model.room_capacity[room] = cap.item() if hasattr(cap, "item") else cap
+
+    model.faculty = list(FacultyLedger.from_csv(faculty_file).roster)
+    model._room_id = {r: i for i, r in enumerate(model.rooms)}
+    model._faculty_id = {f: i for i, f in enumerate(model.faculty)}
+
+    codes = set()
+    for name, course_file in departments.items():
+        df = pd.read_csv(course_file)
+        columns = tuple(model.intern(c) for c in df.columns)
+        rows = [tuple(model.intern(v) for v in values) for values in df.itertuples(index=False, name=None)]
+        model.departments[name] = (columns, rows)
+        for course in model.courses_for(name):
+            codes.add(course.code)
+            if course.is_elective:
+                codes.add(f"Elective_{course.basket}")
+
+    labels = set(model.rooms) | codes
+    labels.update(f"{d}-{t}" for d in Scheduler.DAYS for t in "LTP")
+    model.stable_hashes = {x: stable_hash_val(x) for x in labels}
+    return model
+
+
+def compile_problem(departments, rooms_file, slots_file, faculty_file, cache_dir=".timetable_cache"):
+    """
+    Load every input CSV once and return a ProblemModel.
+
+    The model is pickled to '<cache_dir>/model-<inputs>-<key>.pkl', where 'inputs' hashes
+    the department names and input paths, and the key hashes the contents of every input
+    file together with MODEL_VERSION. A later run with unchanged inputs loads the pickle and
+    skips CSV parsing entirely; any edit to an input produces a new key, and the stale
+    pickle of the same inputs is deleted once the new one is written, so the cache holds
+    one model per set of inputs. cache_dir=None disables the cache.
+    """
+    sources = {"rooms": rooms_file, "slots": slots_file, "faculty": faculty_file}
+    sources.update({f"dept:{name}": path for name, path in departments.items()})
+    digests = {label: file_digest(path) for label, path in sources.items()}
+
+    key = hashlib.sha256()
+    key.update(f"v{MODEL_VERSION}".encode("utf-8"))
+    for label, digest in digests.items():
+        key.update(f"|{label}={digest}".encode("utf-8"))
+    inputs = hashlib.sha256("|".join(f"{label}={os.path.abspath(path)}" for label, path in sources.items()).encode("utf-8"))
+    prefix = f"model-{inputs.hexdigest()[:12]}-"
+    cache_path = None
+    if cache_dir:
+        cache_path = os.path.join(cache_dir, f"{prefix}{key.hexdigest()[:20]}.pkl")
+        if os.path.exists(cache_path):
+            try:
+                with open(cache_path, "rb") as f:
+                    return pickle.load(f)
+            except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+                pass  # unreadable cache: rebuild it below
+
+    model = _build_model(departments, rooms_file, slots_file, faculty_file)
+    model.sources = digests
+    if cache_path:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(model, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, cache_path)
+        for name in os.listdir(cache_dir):
+            if name.startswith(prefix) and name.endswith(".pkl") and name != os.path.basename(cache_path):
+                try:
+                    os.remove(os.path.join(cache_dir, name))
+                except OSError:
+                    pass  # already gone (another run cleaned up)
+    return model
@@ -0,0 +1,105 @@
+import heapq
+
+import numpy as np
+
+
+class ConflictGraph:
+    """
+    Undirected weighted graph in CSR form: the neighbours of v are
+    indices[indptr[v]:indptr[v + 1]], with the matching weights (e.g. students in common).
+    """
+
+    def __init__(self, n, indptr, indices, weights):
+        self.n = n
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+
+    def neighbours(self, v):
+        return self.indices[self.indptr[v]:self.indptr[v + 1]]
+
+    def degree(self):
+        return np.diff(self.indptr)
+
+    def weighted_degree(self):
+        return np.bincount(np.repeat(np.arange(self.n), self.degree()), weights=self.weights, minlength=self.n)
+
+    def edges(self):
+        """(u, v, weight) arrays with u < v."""
+        rows = np.repeat(np.arange(self.n), self.degree())
+        keep = rows < self.indices
+        return rows[keep], self.indices[keep], self.weights[keep]
+
+
+def conflict_graph(n, members, units, unit_weights=None, exclusive=None):
+    """
+    Sparse conflict graph of 'n' vertices from an enrolment list: vertex members[k] is in
+    unit units[k] (a section, or a student), and two vertices conflict when they share a
+    unit; the edge weight is the total weight of the shared units (unit_weights, default 1).
+    Vertices with the same exclusive[v] >= 0 are alternatives nobody takes together (one
+    elective out of a basket) and get no edge. Pairs are built per unit with array
+    arithmetic, so the cost follows the number of (unit, vertex, vertex) triples rather than
+    n squared; units with the same members can be merged beforehand with their weights summed.
+    """
+    members = np.asarray(members, dtype=np.int64)
+    units = np.asarray(units, dtype=np.int64)
+    if unit_weights is None:
+        unit_weights = np.ones(int(units.max()) + 1 if len(units) else 0, dtype=np.int64)
+    unit_weights = np.asarray(unit_weights)
+
+    # one row per (unit, vertex), sorted by unit then vertex
+    pairs = np.unique(units * n + members)
+    units, members = pairs // n, pairs % n
+    starts = np.flatnonzero(np.r_[True, units[1:] != units[:-1]]) if len(units) else units
+    ends = np.r_[starts[1:], len(units)] if len(units) else units
+    # each row pairs with every later row of its unit
+    later = np.repeat(ends, ends - starts) - np.arange(len(units)) - 1
+    left = np.repeat(np.arange(len(units)), later)
+    offsets = np.arange(len(left)) - np.repeat(np.cumsum(later) - later, later)
+    right = left + offsets + 1
+    u, v, w = members[left], members[right], unit_weights[units[left]]
+    if exclusive is not None:
+        exclusive = np.asarray(exclusive)
+        keep = (exclusive[u] < 0) | (exclusive[u] != exclusive[v])
+        u, v, w = u[keep], v[keep], w[keep]
+
+    # merge parallel edges, then store both directions
+    codes, inverse = np.unique(u * n + v, return_inverse=True)
+    weights = np.bincount(inverse, weights=w).astype(unit_weights.dtype) if len(codes) else w[:0]
+    rows = np.r_[codes // n, codes % n]
+    cols = np.r_[codes % n, codes // n]
+    order = np.lexsort((cols, rows))
+    indptr = np.r_[0, np.cumsum(np.bincount(rows, minlength=n))]
+    return ConflictGraph(n, indptr, cols[order], np.r_[weights, weights][order])
+
+
+def dsatur(graph, choose, group=None):
+    """
+    Colour the graph most-saturated vertex first (DSatur): saturation is the number of
+    distinct groups among a vertex's coloured neighbours, ties go to the larger weighted
+    degree, then the lower index. choose(v, blocked) returns v's colour given the set of
+    groups its coloured neighbours hold (or None to leave it uncoloured); group(colour) is
+    what neighbours must differ in (the colour itself by default, e.g. a date for a
+    (date, slot) colour). Returns the colour of every vertex.
+    """
+    group = group or (lambda colour: colour)
+    colours = [None] * graph.n
+    done = [False] * graph.n
+    blocked = [set() for _ in range(graph.n)]
+    weight = graph.weighted_degree().tolist()
+    heap = [(0, -weight[v], v) for v in range(graph.n)]
+    heapq.heapify(heap)
+    while heap:
+        saturation, _, v = heapq.heappop(heap)
+        if done[v] or -saturation != len(blocked[v]):
+            continue
+        done[v] = True
+        colours[v] = choose(v, blocked[v])
+        if colours[v] is None:
+            continue
+        g = group(colours[v])
+        for u in graph.neighbours(v).tolist():
+            if not done[u] and g not in blocked[u]:
+                blocked[u].add(g)
+                heapq.heappush(heap, (-len(blocked[u]), -weight[u], u))
+    return colours
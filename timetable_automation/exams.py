@@ -0,0 +1,656 @@
+import re
+import sys
+import heapq
+import bisect
+import argparse
+import datetime as dt
+from pathlib import Path
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.styles import Alignment, Font
+
+from .conflicts import conflict_graph, dsatur
+
+SLOTS = ["Morning (10:00 AM – 11:30 AM)", "Afternoon (02:00 PM – 03:30 PM)"]
+HEADERS = ["Batch", "Date", "Day", "Slot", "Course", "Students", "Rooms"]
+
+# combined batches in FINAL_EXCEL.csv (lower-cased BATCH_REAL) -> the batches they cover
+SPLIT_MAP = {
+    "all 1st-year": ["1csea", "1cseb", "1ece", "1dsai"],
+    "all 1st year": ["1csea", "1cseb", "1ece", "1dsai"],
+    "all-1st-year": ["1csea", "1cseb", "1ece", "1dsai"],
+    "all-2nd year": ["2cse-a", "2cse-b", "2ece", "2dsai"],
+    "all-2nd-year": ["2cse-a", "2cse-b", "2ece", "2dsai"],
+    "all-3rd year": ["3csea", "3cseb", "3ece", "3dsai"],
+    "all-3rd-year": ["3csea", "3cseb", "3ece", "3dsai"],
+    "all 3rd year": ["3csea", "3cseb", "3ece", "3dsai"],
+    "all-4th year": ["4cse", "4ece", "4dsai"],
+    "all-4th-year": ["4cse", "4ece", "4dsai"],
+    "all 4th year": ["4cse", "4ece", "4dsai"],
+}
+
+
+# --------------------- Utility functions ---------------------
+def safe_int(x):
+    """Integer from a CSV cell ("1,200", 85.0, ...); None for blanks, "-", "NA" and the like."""
+    try:
+        if pd.isna(x):
+            return None
+        s = str(x).replace(",", "").strip()
+        if s in ("", "-", "NA", "N/A", "nan"):
+            return None
+        return int(float(s))
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_date(s):
+    """date from 'DD-MM-YYYY'."""
+    return dt.datetime.strptime(s.strip(), "%d-%m-%Y").date()
+
+
+def generate_weekdays(start, end):
+    """Monday-Friday dates from 'start' to 'end' inclusive."""
+    d = start
+    res = []
+    while d <= end:
+        if d.weekday() < 5:
+            res.append(d)
+        d += dt.timedelta(days=1)
+    return res
+
+
+# --------------------- Inputs ---------------------
+def expand_batches(courses_df, split_map=SPLIT_MAP):
+    """
+    Exam entries per batch from a FINAL_EXCEL.csv-style frame (columns 'course code',
+    'batch_real', 'no. of students', any case). Combined batches listed in 'split_map'
+    are split into their member batches with the students shared out evenly.
+    Electives also get a "group", (batch_real, slot name): the basket a student picks one of.
+    Returns OrderedDict {batch: [{"course": code, "students": n}, ...]} in input order.
+    """
+    df = courses_df.rename(columns=lambda c: c.strip().lower())
+    courses_by_batch = OrderedDict()
+    for _, row in df.iterrows():
+        course = str(row.get("course code", "")).strip()
+        batch_raw = str(row.get("batch_real", "")).strip()
+        students = safe_int(row.get("no. of students")) or 0
+        extra = {}
+        if str(row.get("elective or not", "")).strip().lower().startswith("y"):
+            extra["group"] = (batch_raw.lower(), str(row.get("slot name", "")).strip().lower())
+        targets = split_map.get(batch_raw.lower())
+        if targets is not None:
+            base, rem = divmod(students, len(targets)) if targets else (0, 0)
+            for i, t in enumerate(targets):
+                courses_by_batch.setdefault(t.upper(), []).append(
+                    dict(course=course, students=base + (1 if i < rem else 0), **extra))
+        else:
+            courses_by_batch.setdefault(batch_raw, []).append(dict(course=course, students=int(students), **extra))
+    return courses_by_batch
+
+
+def exam_rooms(rooms_df):
+    """
+    Exam rooms from a rooms.csv-style frame, largest first. Only half of a room's seats
+    are used, shared by up to two courses, so each course may seat 'per_course_quota'
+    (a quarter of the capacity). Rooms without a usable capacity are skipped.
+    Returns [{"room": id, "per_course_quota": n}, ...].
+    """
+    df = rooms_df.rename(columns=lambda c: c.strip().lower())
+    room_id_col = cap_col = None
+    for c in df.columns:
+        if c in ("room", "room_id", "roomid", "room id"):
+            room_id_col = c
+        if c in ("capacity", "cap", "seats", "seat"):
+            cap_col = c
+    if room_id_col is None:
+        room_id_col = df.columns[0]
+    if cap_col is None:
+        cap_col = next((c for c in df.columns if df[c].apply(lambda x: safe_int(x) is not None).sum() > 0), None)
+    if cap_col is None:
+        raise ValueError("could not find a capacity column in the rooms table")
+
+    rooms = []
+    for room, cap in zip(df[room_id_col], df[cap_col]):
+        cap = safe_int(cap)
+        if cap is None or cap <= 0:
+            continue
+        per_course_quota = (cap // 2) // 2
+        if per_course_quota > 0:
+            rooms.append({"room": str(room).strip(), "per_course_quota": int(per_course_quota)})
+    rooms.sort(key=lambda x: x["per_course_quota"], reverse=True)
+    return rooms
+
+
+def load_inputs(course_file="FINAL_EXCEL.csv", room_file="rooms.csv", split_map=SPLIT_MAP):
+    """(courses_by_batch, rooms) read from the two CSVs, ready for schedule_exams()."""
+    for path in (course_file, room_file):
+        if not Path(path).exists():
+            raise FileNotFoundError(f"Missing file: {path}")
+    return expand_batches(pd.read_csv(course_file), split_map), exam_rooms(pd.read_csv(room_file))
+
+
+# --------------------- Scheduling ---------------------
+def _record(batch, d, slot, course, students, rooms_text):
+    return {
+        "Batch": batch,
+        "Date": d,
+        "Date_str": d.strftime("%d-%b-%Y"),
+        "Day": d.strftime("%A"),
+        "Slot": slot,
+        "Course": course,
+        "Students": students,
+        "Rooms": rooms_text,
+    }
+
+
+def _rooms_text(assigned, students):
+    return "; ".join(f"{r} ({c})" for r, c in assigned) + (" (PARTIAL)" if sum(a for _, a in assigned) < students else "")
+
+
+class SlotPacker:
+    """
+    The rooms of one (date, slot) as exams are seated in them, at most two courses per room
+    (see exam_rooms). Free seats are kept as sorted arrays of (seats, room index), one for
+    empty rooms and one for rooms holding a course. seat() puts the rest of an exam in the
+    tightest shared room that takes it all, else the tightest empty room that does, else
+    fills the roomiest room and carries on, so small exams pair up and few rooms are opened.
+    """
+
+    def __init__(self, rooms, by_size=None):
+        self.rooms = rooms
+        self.empty = list(by_size) if by_size is not None else self.by_size(rooms)
+        self.shared = []
+        self.free = sum(q for q, _ in self.empty)
+
+    @staticmethod
+    def by_size(rooms):
+        """Sorted (seats, room index) of every usable room; pass to the constructor to reuse."""
+        return sorted((r["per_course_quota"], k) for k, r in enumerate(rooms) if r["per_course_quota"] > 0)
+
+    def copy(self):
+        other = SlotPacker.__new__(SlotPacker)
+        other.rooms, other.empty, other.shared, other.free = self.rooms, list(self.empty), list(self.shared), self.free
+        return other
+
+    def seat(self, students):
+        """Seat up to 'students'; returns [(room, seats), ...] (fewer seats than asked when full)."""
+        empty, shared = self.empty, self.shared
+        assigned = []
+        remaining = students
+        while remaining > 0 and (empty or shared):
+            pos = bisect.bisect_left(shared, (remaining,))
+            if pos < len(shared):
+                free, k = shared.pop(pos)
+                opened = False
+            elif shared and bisect.bisect_left(empty, (remaining,)) == len(empty) \
+                    and (not empty or shared[-1][0] >= empty[-1][0]):
+                free, k = shared.pop()
+                opened = False
+            else:
+                free, k = empty.pop(min(bisect.bisect_left(empty, (remaining,)), len(empty) - 1))
+                opened = True
+            take = min(free, remaining)
+            # a room's second course closes it, leftover seats and all
+            if opened and free > take:
+                bisect.insort(shared, (free - take, k))
+                self.free -= take
+            else:
+                self.free -= free
+            assigned.append((self.rooms[k]["room"], int(take)))
+            remaining -= take
+        return assigned
+
+
+def pack_slot(demands, rooms, overflow=(), by_size=None):
+    """
+    Seat every exam of one (date, slot) at once, first-fit-decreasing: 'demands' largest
+    first through a SlotPacker, then 'overflow' exams (known not to fit) in their given
+    order in whatever is left. 'by_size' is SlotPacker.by_size(rooms), to reuse.
+    Returns ([(room, seats), ...] per exam of demands + overflow, the packer afterwards).
+    """
+    packer = SlotPacker(rooms, by_size)
+    assigned = [None] * (len(demands) + len(overflow))
+    for c in sorted(range(len(demands)), key=lambda c: -demands[c]):
+        assigned[c] = packer.seat(demands[c])
+    for c, students in enumerate(overflow, start=len(demands)):
+        assigned[c] = packer.seat(students)
+    return assigned, packer
+
+
+def schedule_exams(courses_by_batch, rooms, dates, slots=SLOTS, allocator="slot"):
+    """
+    Place every batch's exams on (date, slot) pairs, one exam per batch per date, and split
+    each exam's students over rooms (see exam_rooms; at most two courses per room).
+    With allocator="slot" an exam goes to the first pair whose unreserved seats hold it
+    (else the pair with the most), and once every exam has a pair each pair's exams are
+    packed together by pack_slot. allocator="course" is the original greedy: an exam takes
+    the first pair with any free seats and its rooms right away, largest first.
+    Either way an exam that fits nowhere takes the pair with the most free seats. Nothing
+    is read or written and the inputs are not modified, so one process can try many date
+    windows and room sets.
+    Returns (records, short): a dict per exam (Batch, Date, Date_str, Day, Slot, Course,
+    Students, Rooms; Rooms ends in " (PARTIAL)" when seats ran out) and whether any exam
+    was short of seats.
+    """
+    if not rooms:
+        raise ValueError("no usable rooms after applying half-capacity and the per-course split")
+    if not dates:
+        raise ValueError("no weekdays in the given date range")
+    if allocator == "slot":
+        return _schedule_per_slot(courses_by_batch, rooms, dates, slots)
+    if allocator == "course":
+        return _schedule_per_course(courses_by_batch, rooms, dates, slots)
+    raise ValueError(f"unknown room allocator {allocator!r}")
+
+
+def _seated(assigned):
+    return sum(seats for _, seats in assigned)
+
+
+class _Seating:
+    """
+    Rooms per (date, slot) position while exams are given pairs: a SlotPacker per position,
+    the records seated there in full and those that only got what was left, and the
+    smallest exam that failed to fit since a position last changed (larger ones aren't
+    tried there until it does).
+    """
+
+    def __init__(self, rooms, positions):
+        self.rooms = rooms
+        self.by_size = SlotPacker.by_size(rooms)
+        self.packers = [SlotPacker(rooms, self.by_size) for _ in range(positions)]
+        self.fitted = [[] for _ in range(positions)]
+        self.overflow = [[] for _ in range(positions)]
+        self.too_big = [None] * positions
+        self.assigned = {}
+
+    def free(self, i):
+        return self.packers[i].free
+
+    def fit(self, i, r, students):
+        """Seat record r at position i if everyone fits (on a copy first); returns whether it did."""
+        if self.packers[i].free < students or (self.too_big[i] is not None and students >= self.too_big[i]):
+            return False
+        trial = self.packers[i].copy()
+        assigned = trial.seat(students)
+        if _seated(assigned) < students:
+            self.too_big[i] = students
+            return False
+        self.packers[i] = trial
+        self.fitted[i].append(r)
+        self.assigned[r] = assigned
+        self.too_big[i] = None
+        return True
+
+    def squeeze(self, i, r, students):
+        """Seat record r at position i in whatever is left."""
+        self.assigned[r] = self.packers[i].seat(students)
+        self.overflow[i].append(r)
+        self.too_big[i] = None
+
+    def finish(self, records):
+        """
+        Fill in every seated record's Rooms: each position's exams are repacked together,
+        largest first, and that is kept when it seats as many students in no more rooms
+        than seating them one by one did. Returns whether any exam is short of seats.
+        """
+        for fitted, overflow in zip(self.fitted, self.overflow):
+            exam_ids = fitted + overflow
+            if not exam_ids:
+                continue
+            assigned = [self.assigned[r] for r in exam_ids]
+            repacked, _ = pack_slot([records[r]["Students"] for r in fitted], self.rooms,
+                                    [records[r]["Students"] for r in overflow], self.by_size)
+            if sum(map(_seated, repacked)) >= sum(map(_seated, assigned)) and \
+                    all(_seated(got) == records[r]["Students"] for r, got in zip(fitted, repacked)) and \
+                    len({room for got in repacked for room, _ in got}) <= len({room for got in assigned for room, _ in got}):
+                assigned = repacked
+            for r, got in zip(exam_ids, assigned):
+                records[r]["Rooms"] = _rooms_text(got, records[r]["Students"])
+        return any(r["Rooms"].endswith(" (PARTIAL)") or (not r["Rooms"] and r["Students"] > 0) for r in records)
+
+
+def _schedule_per_slot(courses_by_batch, rooms, dates, slots):
+    date_slots = [(d, slot) for d in dates for slot in slots]
+    seating = _Seating(rooms, len(date_slots))
+    records = []
+    for batch, course_list in courses_by_batch.items():
+        used_calendar_dates = set()
+        for entry in course_list:
+            course_code, students, r = entry["course"], int(entry["students"]), len(records)
+            # the first pair that still seats this exam in full, else the pair with the
+            # most free seats on a free date, else (as the greedy does) at all
+            roomiest = None
+            for i, (d, _) in enumerate(date_slots):
+                if d in used_calendar_dates or seating.free(i) <= 0:
+                    continue
+                if seating.fit(i, r, students):
+                    break
+                if roomiest is None or seating.free(i) > seating.free(roomiest):
+                    roomiest = i
+            else:
+                if roomiest is None:
+                    roomiest = max(range(len(date_slots)), key=lambda i: (seating.free(i), -i))
+                    if seating.free(roomiest) <= 0:
+                        records.append(_record(batch, dates[0], slots[0], course_code, students, ""))
+                        continue
+                i = roomiest
+                seating.squeeze(i, r, students)
+            d, slot = date_slots[i]
+            used_calendar_dates.add(d)
+            records.append(_record(batch, d, slot, course_code, students, ""))
+    return records, seating.finish(records)
+
+
+def _schedule_per_course(courses_by_batch, rooms, dates, slots):
+    date_slots = [(d, slot) for d in dates for slot in slots]
+    names = [r["room"] for r in rooms]
+    quotas = [r["per_course_quota"] for r in rooms]
+    # per (date, slot) position: a heap of the rooms that can still take a course, as
+    # (-free seats, courses so far, room index) - most seats first, then empty rooms, then
+    # room order - built on first use; and the running total of those rooms' free seats
+    open_rooms = [None] * len(date_slots)
+    free_seats = [sum(quotas)] * len(date_slots)
+    # max-heap of (-free seats, position) for the fallback; entries go stale as seats are
+    # taken and are dropped lazily (a fresh entry is pushed on every change)
+    by_free_seats = [(-total, i) for i, total in enumerate(free_seats)]
+    heapq.heapify(by_free_seats)
+
+    def allocate_rooms_for_course(students_needed, i):
+        """Fill rooms with no or one course so far, most free seats first; returns [(room, seats)]."""
+        if students_needed <= 0:
+            return []
+        heap = open_rooms[i]
+        if heap is None:
+            heap = open_rooms[i] = [(-q, 0, k) for k, q in enumerate(quotas) if q > 0]
+            heapq.heapify(heap)
+
+        assigned, reopened = [], []
+        remaining = students_needed
+        while remaining > 0 and heap:
+            neg_quota, courses, k = heapq.heappop(heap)
+            take = min(-neg_quota, remaining)
+            left = -neg_quota - take
+            assigned.append((names[k], int(take)))
+            remaining -= take
+            if courses == 0 and left > 0:
+                reopened.append((-left, 1, k))
+            # a room with its second course is closed: its leftover seats stop counting too
+            free_seats[i] -= take + (left if courses == 1 else 0)
+        for entry in reopened:
+            heapq.heappush(heap, entry)
+        if assigned:
+            heapq.heappush(by_free_seats, (-free_seats[i], i))
+        return assigned
+
+    def most_free_seats():
+        """Position with the most free seats (earliest on ties), or None when all are full."""
+        while by_free_seats and -by_free_seats[0][0] != free_seats[by_free_seats[0][1]]:
+            heapq.heappop(by_free_seats)
+        if not by_free_seats or by_free_seats[0][0] == 0:
+            return None
+        return by_free_seats[0][1]
+
+    records = []
+    short = False
+    for batch, course_list in courses_by_batch.items():
+        used_calendar_dates = set()
+        for entry in course_list:
+            course_code, students = entry["course"], int(entry["students"])
+            scheduled = False
+            for i, (d, slot) in enumerate(date_slots):
+                if free_seats[i] <= 0 or d in used_calendar_dates:
+                    continue
+                assigned = allocate_rooms_for_course(students, i)
+                seated = sum(a for _, a in assigned)
+                if seated >= students or assigned:
+                    # a partial fit still takes the date (as much of the batch as possible sits it)
+                    short |= seated < students
+                    used_calendar_dates.add(d)
+                    records.append(_record(batch, d, slot, course_code, students, _rooms_text(assigned, students)))
+                    scheduled = True
+                    break
+            if scheduled:
+                continue
+
+            # nothing fits: the pair with the most free seats (or an empty record if none has any)
+            best = most_free_seats()
+            if best is None:
+                records.append(_record(batch, dates[0], slots[0], course_code, students, ""))
+                short = True
+            else:
+                d_best, slot_best = date_slots[best]
+                assigned = allocate_rooms_for_course(students, best)
+                short |= sum(a for _, a in assigned) < students
+                records.append(_record(batch, d_best, slot_best, course_code, students, _rooms_text(assigned, students)))
+    return records, short
+
+
+# --------------------- Student conflicts ---------------------
+def section_key(name):
+    """'1st Year CSE A', '1CSEA' and '1-CSE-A' all give '1CSEA', the form batches and roll-list sections are matched in."""
+    s = re.sub(r"^\s*(\d)\s*(?:st|nd|rd|th)?\s*year", r"\1", str(name), flags=re.I)
+    return re.sub(r"[^0-9A-Za-z]", "", s).upper()
+
+
+def load_sections(roll_file="student_roll_numbers.csv"):
+    """{section key: students} from a roll list with a Batch column, one row per student."""
+    rolls = pd.read_csv(roll_file, usecols=lambda c: c.strip().lower() == "batch")
+    if rolls.shape[1] != 1:
+        raise ValueError(f"no Batch column in {roll_file}")
+    return rolls.iloc[:, 0].map(section_key).value_counts(sort=False).to_dict()
+
+
+def batch_sections(batches, sections=None):
+    """
+    {batch: [section key, ...]}: the sections whose students sit a batch's exams. Each
+    '+'-joined part of a batch covers the sections whose keys start with its key ('1CSE'
+    covers '1CSEA' and '1CSEB'), or stands for itself when none do. Without 'sections'
+    (see load_sections) the parts of all the batches serve, less those prefixing another.
+    """
+    parts = {b: [section_key(p) for p in str(b).split("+")] for b in batches}
+    if sections is None:
+        keys = {k for ks in parts.values() for k in ks}
+        sections = [k for k in keys if not any(o != k and o.startswith(k) for o in keys)]
+    sections = sorted(sections)
+    return {b: sorted({s for k in ks for s in ([s for s in sections if s.startswith(k)] or [k])})
+            for b, ks in parts.items()}
+
+
+def exam_conflicts(courses_by_batch, sections=None):
+    """
+    Conflict graph (conflicts.ConflictGraph) over the exam entries of courses_by_batch in
+    order, which is also the order of the records schedule_exams returns. Two exams
+    conflict when a section sits both (see batch_sections), weighted by the students in
+    the sections they share ('sections' {key: students}, see load_sections; one per
+    section without it). Electives of one basket (same "group") are never taken together
+    and don't conflict.
+    """
+    entries = [(b, e) for b, course_list in courses_by_batch.items() for e in course_list]
+    covers = batch_sections(courses_by_batch, sections)
+    section_ids = {s: k for k, s in enumerate(sorted({s for ss in covers.values() for s in ss}))}
+    members = [v for v, (b, _) in enumerate(entries) for _ in covers[b]]
+    units = [section_ids[s] for b, _ in entries for s in covers[b]]
+    weights = [(sections or {}).get(s, 1) for s in section_ids]
+    groups = {}
+    exclusive = [groups.setdefault(e["group"], len(groups)) if e.get("group") is not None else -1 for _, e in entries]
+    return conflict_graph(len(entries), members, units, weights, exclusive)
+
+
+def student_clashes(courses_by_batch, records, sections=None):
+    """Pairs of exams (indices into records) sharing students on one date: [(a, b, students), ...]."""
+    u, v, w = exam_conflicts(courses_by_batch, sections).edges()
+    days = np.array([r["Date"].toordinal() for r in records], dtype=np.int64)
+    same = days[u] == days[v] if len(records) else np.zeros(0, dtype=bool)
+    return list(zip(u[same].tolist(), v[same].tolist(), w[same].tolist()))
+
+
+def schedule_exams_clash_free(courses_by_batch, rooms, dates, slots=SLOTS, sections=None):
+    """
+    Like schedule_exams, but no student sits two exams on one date where it can be helped:
+    the exams are coloured with (date, slot) pairs over exam_conflicts() by DSatur, most
+    constrained first. Each takes the first pair on a date none of its conflicting exams
+    holds that seats it in full, else the roomiest such pair, else the roomiest pair at all
+    (a clash student_clashes will report). Rooms are packed as with allocator="slot".
+    Returns (records, short) in the order of courses_by_batch.
+    """
+    if not rooms:
+        raise ValueError("no usable rooms after applying half-capacity and the per-course split")
+    if not dates:
+        raise ValueError("no weekdays in the given date range")
+    entries = [(b, e) for b, course_list in courses_by_batch.items() for e in course_list]
+    date_slots = [(d, slot) for d in dates for slot in slots]
+    seating = _Seating(rooms, len(date_slots))
+
+    def choose(v, blocked_days):
+        students = int(entries[v][1]["students"])
+        roomiest = None
+        for i in range(len(date_slots)):
+            if i // len(slots) in blocked_days or seating.free(i) <= 0:
+                continue
+            if seating.fit(i, v, students):
+                return i
+            if roomiest is None or seating.free(i) > seating.free(roomiest):
+                roomiest = i
+        if roomiest is None:
+            roomiest = max(range(len(date_slots)), key=lambda i: (seating.free(i), -i))
+            if seating.free(roomiest) <= 0:
+                return None
+        seating.squeeze(roomiest, v, students)
+        return roomiest
+
+    pairs = dsatur(exam_conflicts(courses_by_batch, sections), choose, group=lambda i: i // len(slots))
+    records = [_record(batch, *(date_slots[i] if i is not None else (dates[0], slots[0])),
+                       e["course"], int(e["students"]), "")
+               for (batch, e), i in zip(entries, pairs)]
+    return records, seating.finish(records)
+
+
+# --------------------- Export ---------------------
+def write_exam_workbook(records, output_file="Exam_Timetable_Final.xlsx"):
+    """
+    Write the master timetable and one sheet per batch. If the file is locked (open in
+    Excel), '<name>_1.xlsx', '<name>_2.xlsx', ... are tried. Returns the path written.
+    """
+    out_df = pd.DataFrame(records)
+    if out_df.empty:
+        raise ValueError("no exam records to write")
+    out_df = out_df.sort_values(by=["Batch", "Date", "Slot", "Course"]).reset_index(drop=True)
+
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Master_Timetable"
+    for i, h in enumerate(HEADERS, start=1):
+        ws.cell(row=1, column=i, value=h).font = Font(bold=True)
+        ws.cell(row=1, column=i).alignment = Alignment(horizontal="center")
+    columns = ["Batch", "Date_str", "Day", "Slot", "Course", "Students", "Rooms"]
+    for r_idx, vals in enumerate(out_df[columns].itertuples(index=False, name=None), start=2):
+        for c_idx, v in enumerate(vals, start=1):
+            ws.cell(row=r_idx, column=c_idx, value=v).alignment = Alignment(horizontal="center")
+
+    for batch, sub in out_df.groupby("Batch", sort=False):
+        ws2 = wb.create_sheet(title=str(batch)[:31])
+        ws2.merge_cells("A1:G1")
+        ws2["A1"] = f"Exam Timetable - {batch}"
+        ws2["A1"].font = Font(bold=True, size=13)
+        ws2["A1"].alignment = Alignment(horizontal="center")
+        for i, h in enumerate(HEADERS, start=1):
+            ws2.cell(row=2, column=i, value=h).font = Font(bold=True)
+            ws2.cell(row=2, column=i).alignment = Alignment(horizontal="center")
+        for r_idx, vals in enumerate(sub[columns].itertuples(index=False, name=None), start=3):
+            for c_idx, v in enumerate(vals, start=1):
+                ws2.cell(row=r_idx, column=c_idx, value=v).alignment = Alignment(horizontal="center")
+
+    for col_cells in ws.columns:
+        max_len = max(len(str(cell.value or "")) for cell in col_cells)
+        ws.column_dimensions[col_cells[0].column_letter].width = min(max(10, max_len + 2), 60)
+
+    out_path = Path(output_file)
+    base, ext, i = out_path.stem, out_path.suffix or ".xlsx", 1
+    while True:
+        try:
+            wb.save(out_path)
+            return out_path
+        except PermissionError:
+            out_path = out_path.with_name(f"{base}_{i}{ext}")
+            i += 1
+
+
+# --------------------- CLI ---------------------
+def _ask_date(prompt):
+    while True:
+        try:
+            return parse_date(input(prompt + " (DD-MM-YYYY): "))
+        except ValueError:
+            print("Invalid format. Use DD-MM-YYYY.")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate the exam timetable from FINAL_EXCEL.csv and rooms.csv.")
+    parser.add_argument("--start", type=parse_date, help="first exam date, DD-MM-YYYY (asked for when omitted)")
+    parser.add_argument("--end", type=parse_date, help="last exam date, DD-MM-YYYY (asked for when omitted)")
+    parser.add_argument("--courses", default="FINAL_EXCEL.csv")
+    parser.add_argument("--rooms", default="rooms.csv")
+    parser.add_argument("--slot", action="append", dest="slots", metavar="LABEL",
+                        help="exam slot label, repeat for several (default: the morning and afternoon slots)")
+    parser.add_argument("--allocator", choices=["slot", "course"],
+                        help="pack each slot's exams together (default) or seat exams one at a time as they are placed")
+    parser.add_argument("--clash-free", action="store_true",
+                        help="give exams dates by colouring the student conflict graph (no student sits two a day)")
+    parser.add_argument("--rolls", default="student_roll_numbers.csv",
+                        help="roll list mapping students to sections, used for conflicts when the file exists")
+    parser.add_argument("--out", default="Exam_Timetable_Final.xlsx")
+    parser.add_argument("--seating", metavar="FILE",
+                        help="also write a per-room seating plan from the roll list (.csv, or .xlsx)")
+    parser.add_argument("--half-capacity", default="room_half_capacity.csv",
+                        help="exam seats per room for the seating plan, used when the file exists")
+    args = parser.parse_args(argv)
+    if args.clash_free and args.allocator == "course":
+        parser.error("--clash-free packs rooms per slot; it can't be combined with --allocator course")
+
+    print("=== Exam Timetable Generator (final) ===")
+    start = args.start or _ask_date("Enter exam START date")
+    end = args.end or _ask_date("Enter exam END date")
+    if end < start:
+        print("End date is before start date. Exiting.")
+        return 1
+    try:
+        courses_by_batch, rooms = load_inputs(args.courses, args.rooms)
+        if not courses_by_batch:
+            raise ValueError("no courses found to schedule after expansion")
+        sections = load_sections(args.rolls) if args.rolls and Path(args.rolls).exists() else None
+        dates, slots = generate_weekdays(start, end), args.slots or SLOTS
+        if args.clash_free:
+            records, short = schedule_exams_clash_free(courses_by_batch, rooms, dates, slots, sections)
+        else:
+            records, short = schedule_exams(courses_by_batch, rooms, dates, slots, args.allocator or "slot")
+        clashes = student_clashes(courses_by_batch, records, sections)
+        out_path = write_exam_workbook(records, args.out)
+        seated = None
+        if args.seating:
+            from .seating import load_rosters, load_room_seats, seating_plan, write_seating_plan
+            room_seats = load_room_seats(args.half_capacity) if Path(args.half_capacity).exists() else None
+            plan = seating_plan(courses_by_batch, records, load_rosters(args.rolls), room_seats)
+            seated = write_seating_plan(plan, args.seating)
+    except (OSError, ValueError) as exc:
+        print(f"Error: {exc}. Exiting.")
+        return 1
+
+    print(f"\n🎯 Timetable generated → {out_path}")
+    if seated is not None:
+        print(f"🪑 Seating plan ({seated} seats assigned) → {args.seating}")
+    if short:
+        print("⚠ Warning: some courses were only partially accommodated due to limited room capacity. "
+              "Check '(PARTIAL)' tags in the Rooms column.")
+    if clashes:
+        print(f"⚠ Warning: {len(clashes)} pairs of exams share students on the same date "
+              f"({sum(w for *_, w in clashes)} students in common)" + ("." if args.clash_free else "; try --clash-free."))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,277 @@
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Side, PatternFill, NamedStyle
+from openpyxl.utils import get_column_letter
+from openpyxl.worksheet.cell_range import CellRange
+
+from .occupancy import OccupancyGrid
+
+PALETTE = ["FFC7CE", "C6EFCE", "FFEB9C", "BDD7EE", "D9EAD3", "F4CCCC", "D9D2E9", "FCE5CD", "C9DAF8", "EAD1DC"]
+BREAK_COLOR = "D9D9D9"
+LEGEND_HEADERS = ["S.No", "Course Code", "Course Title", "L-T-P-S-C", "Faculty", "Color"]
+
+THIN_BORDER = Border(left=Side(style="thin"), right=Side(style="thin"), top=Side(style="thin"), bottom=Side(style="thin"))
+CENTER = Alignment(horizontal="center", vertical="center")
+
+
+def _fill(color):
+    return PatternFill(start_color=color, end_color=color, fill_type="solid")
+
+
+# --------------------- Styles ---------------------
+class StyleRegistry:
+    """
+    Named cell styles of one workbook. Each style is registered once, on first use, and
+    cells refer to it by name, so a workbook keeps one style record per course color
+    rather than a fill/border/alignment per cell. The names also show up in Excel's
+    cell style gallery.
+    """
+
+    def __init__(self, wb):
+        self.wb = wb
+        self._names = set()
+
+    def _named(self, name, **attrs):
+        if name not in self._names:
+            self.wb.add_named_style(NamedStyle(name, **attrs))
+            self._names.add(name)
+        return name
+
+    def cell(self):
+        """Bordered cell (free slots, legend text)."""
+        return self._named("tt_cell", border=THIN_BORDER)
+
+    def centered(self):
+        """Bordered, centered cell (legend header, L-T-P-S-C)."""
+        return self._named("tt_centered", border=THIN_BORDER, alignment=CENTER)
+
+    def session(self, color):
+        return self._named(f"tt_session_{color}", fill=_fill(color), border=THIN_BORDER, alignment=CENTER)
+
+    def break_cell(self):
+        return self._named("tt_break", fill=_fill(BREAK_COLOR), border=THIN_BORDER, alignment=CENTER)
+
+    def swatch(self, color):
+        """Legend color sample."""
+        return self._named(f"tt_swatch_{color}", fill=_fill(color), border=THIN_BORDER)
+
+
+class _SheetBuilder:
+    """
+    Rows of one sheet held as WriteOnlyCells until the column widths are known (openpyxl's
+    streaming mode needs widths, merges and panes before the first row goes out). Widths
+    are tracked as cells are added instead of scanning the sheet afterwards.
+    """
+
+    def __init__(self, ws):
+        self.ws = ws
+        self.rows = []
+        self.widths = {}
+
+    def cell(self, value=None, style=None):
+        c = WriteOnlyCell(self.ws, value)
+        if style is not None:
+            c.style = style
+        return c
+
+    def add_row(self, cells):
+        for col, c in enumerate(cells, start=1):
+            if c is not None and c.value is not None:
+                self.widths[col] = max(self.widths.get(col, 0), len(str(c.value)))
+        self.rows.append(cells)
+
+    def merge(self, row, start_col, end_col):
+        self.ws.merged_cells.add(CellRange(min_row=row, min_col=start_col, max_row=row, max_col=end_col))
+
+    def flush(self, freeze_panes="B2"):
+        for col, width in self.widths.items():
+            self.ws.column_dimensions[get_column_letter(col)].width = width + 2
+        self.ws.freeze_panes = freeze_panes
+        for cells in self.rows:
+            self.ws.append(cells)
+
+
+# --------------------- Student workbook ---------------------
+def session_spans(sessions, sheet_name):
+    """{(day, first slot index): last slot index} of every multi-slot session on one sheet."""
+    return {(s.day, s.span[0]): s.span[-1] for s in sessions if s.sheet == sheet_name and len(s.span) > 1}
+
+
+def write_student_workbook(scheduler, filename):
+    """
+    Write the formatted student workbook of a scheduled run in one streaming pass: one sheet
+    per grid with colored session cells merged over each session's span, grey breaks, a
+    legend of the courses seen so far (colors are shared across sheets) and fitted column
+    widths.
+    """
+    wb = Workbook(write_only=True)
+    styles = StyleRegistry(wb)
+    color_map = {}
+    # first match wins, as in the course list order
+    courses = {}
+    for c in scheduler.courses:
+        courses.setdefault(c.code, c)
+
+    for sheet_name in scheduler.grids:
+        scheduler._compute_elective_room_assignments_legally(sheet_name)
+
+    for sheet_name, grid in scheduler.grids.items():
+        sheet = _SheetBuilder(wb.create_sheet(sheet_name))
+        spans = session_spans(scheduler.sessions, sheet_name)
+        frame = grid.to_frame()
+        sheet.add_row([None] + [sheet.cell(slot) for slot in frame.columns])
+
+        for row_idx, (day, values) in enumerate(zip(frame.index, frame.values.tolist()), start=2):
+            cells = [sheet.cell(day)]
+            col, n = 0, len(values)
+            while col < n:
+                val = str(values[col]).strip()
+                if val and val not in (OccupancyGrid.FREE, OccupancyGrid.BREAK):
+                    # a tutorial label is "<code>T", but a course code may end in T itself
+                    code = val.split(" ")[0]
+                    if code not in courses and code.endswith("T"):
+                        code = code[:-1]
+                    if code not in color_map:
+                        color_map[code] = PALETTE[len(color_map) % len(PALETTE)]
+                    style = styles.session(color_map[code])
+                    end = spans.get((day, col), col)
+                    cells.append(sheet.cell(values[col], style))
+                    cells.extend(sheet.cell(None, style) for _ in range(col + 1, end + 1))
+                    if end > col:
+                        sheet.merge(row_idx, col + 2, end + 2)
+                    col = end + 1
+                elif val == OccupancyGrid.BREAK:
+                    cells.append(sheet.cell(values[col], styles.break_cell()))
+                    col += 1
+                else:
+                    cells.append(sheet.cell(values[col] or None, styles.cell()))
+                    col += 1
+            sheet.add_row(cells)
+
+        # legend below the timetable (student timetable legend)
+        sheet.add_row([])
+        sheet.add_row([])
+        sheet.add_row([None] + [sheet.cell(h, styles.centered()) for h in LEGEND_HEADERS])
+        i = 1
+        for code, color in color_map.items():
+            if code.startswith("Elective_"):
+                continue
+            course = courses.get(code)
+            sheet.add_row([
+                None,
+                sheet.cell(i, styles.cell()),
+                sheet.cell(code, styles.cell()),
+                sheet.cell(course.title if course else code, styles.cell()),
+                sheet.cell(course.ltp if course else "", styles.centered()),
+                sheet.cell(course.faculty if course else "", styles.cell()),
+                sheet.cell("", styles.swatch(color)),
+            ])
+            i += 1
+
+        sheet.flush()
+        print(f"Saved timetable sheet: {sheet_name}")
+
+    wb.save(filename)
+    print(f"Formatted student timetable saved in {filename}")
+
+
+# --------------------- Faculty and room views ---------------------
+def group_records(records_by_dept, by="faculty"):
+    """
+    Group the placements of every department by faculty member (by="faculty") or room
+    (by="room") in one pass over the RecordStore indices.
+    Returns {owner: [(dept_name, Placement), ...]} in first-seen order.
+    """
+    if by not in ("faculty", "room"):
+        raise ValueError(f"Unknown view {by!r}; expected 'faculty' or 'room'")
+    groups = {}
+    for dept_name, store in records_by_dept.items():
+        owners, lookup = (store.faculty(), store.for_faculty) if by == "faculty" else (store.rooms(), store.for_room)
+        for owner in owners:
+            groups.setdefault(owner, []).extend((dept_name, rec) for rec in lookup(owner))
+    return groups
+
+
+def _sheet_title(name, used):
+    """A unique worksheet title for 'name' (Excel allows 31 characters and no []:*?/\\)."""
+    base = "".join("_" if ch in '[]:*?/\\' else ch for ch in name).strip() or "Sheet"
+    title, n = base[:31], 1
+    while title.lower() in used:
+        n += 1
+        title = f"{base[:31 - len(str(n)) - 1]}~{n}"
+    used.add(title.lower())
+    return title
+
+
+def write_view_workbook(groups, filename, days, slots):
+    """
+    Write one sheet per owner of 'groups' (see group_records), with a days x slots block per
+    timetable sheet (First_Half, Second_Half, ...). Each cell shows the placement's display
+    text and department; cells booked more than once are joined with " / " so clashes stay
+    visible. Runs of identical cells in a row are merged.
+    """
+    wb = Workbook(write_only=True)
+    styles = StyleRegistry(wb)
+    slot_index = {slot: i for i, slot in enumerate(slots)}
+    day_index = {day: i for i, day in enumerate(days)}
+    color_map = {}
+    used = set()
+
+    for owner, entries in groups.items():
+        # (sheet) -> day x slot grid of labels, filled straight from the records
+        blocks = {}
+        codes = {}
+        for dept_name, rec in entries:
+            grid = blocks.get(rec.sheet)
+            if grid is None:
+                grid = blocks[rec.sheet] = [[None] * len(slots) for _ in days]
+            d, i = day_index[rec.day], slot_index[rec.slot]
+            label = f"{rec.display} [{dept_name}]"
+            grid[d][i] = label if grid[d][i] is None else f"{grid[d][i]} / {label}"
+            codes[grid[d][i]] = rec.code
+
+        sheet = _SheetBuilder(wb.create_sheet(_sheet_title(owner, used)))
+        row_idx = 0
+        for sheet_name, grid in blocks.items():
+            if row_idx:
+                sheet.add_row([])
+                row_idx += 1
+            sheet.add_row([sheet.cell(sheet_name, styles.centered())] + [sheet.cell(slot, styles.centered()) for slot in slots])
+            row_idx += 1
+            for day, labels in zip(days, grid):
+                row_idx += 1
+                cells = [sheet.cell(day, styles.cell())]
+                col = 0
+                while col < len(labels):
+                    label = labels[col]
+                    if label is None:
+                        cells.append(sheet.cell(None, styles.cell()))
+                        col += 1
+                        continue
+                    code = codes[label]
+                    if code not in color_map:
+                        color_map[code] = PALETTE[len(color_map) % len(PALETTE)]
+                    style = styles.session(color_map[code])
+                    end = col + 1
+                    while end < len(labels) and labels[end] == label:
+                        end += 1
+                    cells.append(sheet.cell(label, style))
+                    cells.extend(sheet.cell(None, style) for _ in range(col + 1, end))
+                    if end - col > 1:
+                        sheet.merge(row_idx, col + 2, end + 1)
+                    col = end
+                sheet.add_row(cells)
+        sheet.flush(freeze_panes="B1")
+
+    wb.save(filename)
+    print(f"Saved {len(groups)} timetable view(s) in {filename}")
+
+
+def write_faculty_workbook(records_by_dept, filename, days, slots):
+    """Per-faculty timetables ({dept_name: RecordStore} -> one sheet per faculty member)."""
+    write_view_workbook(group_records(records_by_dept, "faculty"), filename, days, slots)
+
+
+def write_room_workbook(records_by_dept, filename, days, slots):
+    """Per-room timetables ({dept_name: RecordStore} -> one sheet per room)."""
+    write_view_workbook(group_records(records_by_dept, "room"), filename, days, slots)
@@ -0,0 +1,124 @@
+import os
+import pickle
+
+from .main import Scheduler, Random_SEED
+from .ledgers import RoomLedger
+from .records import RecordStore
+
+# bump when the saved state layout changes; an unknown version forces a full build
+STATE_VERSION = 4
+
+
+# --------------------- Saved state ---------------------
+def load_state(path):
+    """The saved incremental state, or None if there is none (or it is unreadable/outdated)."""
+    try:
+        with open(path, "rb") as f:
+            state = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        return None
+    return state if state.get("version") == STATE_VERSION else None
+
+
+def save_state(path, state):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+
+
+def saved_records(path):
+    """{dept_name: RecordStore} of every department in the saved state (for the combined views)."""
+    state = load_state(path)
+    if state is None:
+        return {}
+    return {name: RecordStore(state["departments"][name]["records"]) for name in state["order"]}
+
+
+# --------------------- Incremental run ---------------------
+def schedule_incremental(model, state_path, engine="greedy", seed=None, settings=None):
+    """
+    Bring the saved timetables up to date with 'model' (see compiler.compile_problem),
+    rescheduling only the departments whose course CSV changed.
+
+    The state saved at 'state_path' holds the shared room/faculty ledgers and, per
+    department in commit order, its sessions, unscheduled list, elective choices and a
+    ledger checkpoint taken just before it was scheduled. On the next run:
+    - the ledgers are rolled back to the checkpoint of the first changed (or removed)
+      department, which releases its bookings and those of everything after it;
+    - unchanged departments after that point get their saved sessions re-applied as they
+      were (no rescheduling, so their timetables stay exactly the same);
+    - changed and new departments are then scheduled against all of that.
+    A change to rooms, timeslots or the faculty roster, or to engine/seed/settings, makes
+    every department "changed" (a full build).
+
+    Returns (changed dept names, {dept_name: Scheduler} for every department touched in
+    this run, room_ledger, faculty_ledger). Only the changed schedulers need write_outputs().
+    """
+    seed = Random_SEED if seed is None else seed
+    config = {"engine": engine, "seed": seed, "settings": dict(settings or {}),
+              "shared": {k: v for k, v in model.sources.items() if not k.startswith("dept:")}}
+    digests = {name: model.sources.get(f"dept:{name}") for name in model.departments}
+
+    state = load_state(state_path)
+    if state is None or state["config"] != config:
+        room_ledger, faculty_ledger = RoomLedger(model.rooms), model.faculty_ledger()
+        saved, order, first = {}, [], 0
+    else:
+        room_ledger, faculty_ledger = state["room_ledger"], state["faculty_ledger"]
+        saved, order = state["departments"], state["order"]
+        stale = [i for i, name in enumerate(order) if digests.get(name) != saved[name]["digest"]]
+        first = stale[0] if stale else len(order)
+        if first < len(order):
+            room_cp, faculty_cp = saved[order[first]]["checkpoint"]
+            room_ledger.rollback(room_cp)
+            faculty_ledger.rollback(faculty_cp)
+
+    kept = [name for name in order if name in digests and digests[name] == saved[name]["digest"]]
+    changed = [name for name in model.departments if name not in kept]
+    new_order = [name for name in order[:first]]
+    schedulers = {}
+
+    def make(name):
+        scheduler = Scheduler.from_model(model, name, room_ledger, faculty_ledger, engine, seed)
+        for attr, value in (settings or {}).items():
+            setattr(scheduler, attr, value)
+        return scheduler
+
+    departments = {name: saved[name] for name in new_order}
+    # unchanged departments after the first change: re-apply their saved sessions
+    for name in order[first:]:
+        if name in kept:
+            checkpoint = (room_ledger.checkpoint(), faculty_ledger.checkpoint())
+            scheduler = make(name)
+            entry = saved[name]
+            scheduler.restore(entry["sessions"], entry["unscheduled"], entry["elective_groups"])
+            departments[name] = dict(entry, checkpoint=checkpoint)
+            new_order.append(name)
+            schedulers[name] = scheduler
+    # changed and new departments, in model order
+    for name in changed:
+        checkpoint = (room_ledger.checkpoint(), faculty_ledger.checkpoint())
+        scheduler = make(name)
+        scheduler.schedule_all()
+        departments[name] = {
+            "digest": digests[name],
+            "checkpoint": checkpoint,
+            "sessions": list(scheduler.sessions),
+            "unscheduled": list(scheduler.unscheduled_list),
+            "elective_groups": dict(scheduler.elective_groups),
+            "records": list(scheduler.records),
+        }
+        new_order.append(name)
+        schedulers[name] = scheduler
+
+    save_state(state_path, {
+        "version": STATE_VERSION,
+        "config": config,
+        "order": new_order,
+        "departments": departments,
+        "room_ledger": room_ledger,
+        "faculty_ledger": faculty_ledger,
+    })
+    return changed, schedulers, room_ledger, faculty_ledger
@@ -0,0 +1,81 @@
+import json
+import time
+import cProfile
+import contextlib
+from collections import Counter
+
+# why _assign_session turned a block down (one reason per failed call)
+REJECT_REASONS = ("duplicate_day", "lab_day_taken", "no_free_span", "faculty_busy", "no_room")
+SESSION_TYPES = {"Lecture": "L", "Tutorial": "T", "Lab": "P"}
+
+# shared no-op context for phases of a scheduler without stats
+NO_PHASE = contextlib.nullcontext()
+
+
+class SchedulerStats:
+    """
+    Opt-in counters and timers for one Scheduler (set scheduler.stats = SchedulerStats()).
+    Phases accumulate wall time and call counts; rejections are counted per reason and per
+    (sheet, course, L/T/P) so an unscheduled course can be traced back to what blocked it;
+    room_candidates counts room picks by the number of free rooms on offer.
+    """
+
+    def __init__(self):
+        self.seconds = {}
+        self.calls = {}
+        self.counters = Counter()
+        self.rejections = Counter()
+        self.course_rejections = {}
+        self.room_candidates = Counter()
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        t = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[name] = self.seconds.get(name, 0.0) + time.perf_counter() - t
+            self.calls[name] = self.calls.get(name, 0) + 1
+
+    def reject(self, sheet, code, session_type, reason):
+        self.rejections[reason] += 1
+        key = (sheet, code, session_type)
+        per_course = self.course_rejections.get(key)
+        if per_course is None:
+            per_course = self.course_rejections[key] = Counter()
+        per_course[reason] += 1
+
+    def report(self, unscheduled=()):
+        """JSON-ready summary; 'unscheduled' entries (Scheduler.unscheduled_list) get their rejections attached."""
+        return {
+            "phases": {p: {"seconds": round(s, 4), "calls": self.calls[p]} for p, s in self.seconds.items()},
+            "counters": dict(self.counters),
+            "rejections": {r: self.rejections[r] for r in REJECT_REASONS},
+            "room_candidates": {str(n): c for n, c in sorted(self.room_candidates.items())},
+            "unscheduled": [
+                dict(u, rejections=dict(self.course_rejections.get(
+                    (u["sheet"], u["course_code"], SESSION_TYPES.get(u["type"], u["type"])), {})))
+                for u in unscheduled
+            ],
+        }
+
+
+def write_report(reports, path):
+    """Write {name: report} (see SchedulerStats.report) as indented JSON."""
+    with open(path, "w") as f:
+        json.dump(reports, f, indent=2)
+
+
+@contextlib.contextmanager
+def profiled(path=None):
+    """Run the block under cProfile and dump the stats to 'path' (no-op when path is None)."""
+    if not path:
+        yield None
+        return
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        yield profile
+    finally:
+        profile.disable()
+        profile.dump_stats(path)
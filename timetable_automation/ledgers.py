@@ -0,0 +1,427 @@
+import sys
+import pandas as pd
+
+from .records import faculty_members
+
+
+# --------------------- Shared cell interning ---------------------
+class _CellLedger:
+    """
+    Interns cells to bit positions so a slot span becomes one integer mask. A cell is a
+    (day, slot) pair, booked for the whole semester, or (half, day, slot) when booked
+    through a half() view for one semester half only.
+    """
+
+    def __init__(self):
+        self._cell_bit = {}     # cell -> bit position in cell masks
+        self._cells = []        # bit position -> cell
+
+    def _cell(self, cell):
+        bit = self._cell_bit.get(cell)
+        if bit is None:
+            bit = len(self._cells)
+            self._cell_bit[cell] = bit
+            self._cells.append(cell)
+        return bit
+
+    def cells_mask(self, cells):
+        """Bitmask over cells for an iterable of (day, slot) pairs (or half-qualified cells)."""
+        mask = 0
+        for cell in cells:
+            mask |= 1 << self._cell(cell)
+        return mask
+
+    def _day_masks(self, mask, days, slots, half=None):
+        """
+        Split a cell mask into one bitmask over slot indices per day (in 'days' order).
+        With 'half', cells booked for the other semester half are left out.
+        """
+        day_pos = {d: i for i, d in enumerate(days)}
+        slot_pos = {s: i for i, s in enumerate(slots)}
+        out = [0] * len(days)
+        for bit in _bits(mask):
+            cell = self._cells[bit]
+            if half is not None and len(cell) == 3 and cell[0] != half:
+                continue
+            day, slot = cell[-2:]
+            if day in day_pos and slot in slot_pos:
+                out[day_pos[day]] |= 1 << slot_pos[slot]
+        return out
+
+
+# --------------------- Room ledger ---------------------
+class RoomLedger(_CellLedger):
+    """
+    Shared room bookings across departments.
+
+    (day, slot) cells and rooms are both interned to bit positions on first use:
+    - _room_cells[room] is a bitmask over cells (one mask per room)
+    - _cell_rooms[cell] is a bitmask over rooms (used for free-room queries)
+    "Which of these rooms are free for this whole span" is an OR over the span's
+    cells followed by a mask test, independent of how many rooms are booked.
+    """
+
+    def __init__(self, rooms=()):
+        super().__init__()
+        self._room_bit = {}     # room -> bit position in room masks
+        self._rooms = []        # bit position -> room
+        self._room_cells = {}   # room -> mask over cells
+        self._cell_rooms = {}   # cell bit -> mask over rooms
+        for r in rooms:
+            self.add_room(r)
+
+    @classmethod
+    def from_usage(cls, usage, rooms=()):
+        """Build a ledger from the legacy nested dict[day][slot] -> [rooms]."""
+        ledger = cls(rooms)
+        for day, by_slot in (usage or {}).items():
+            if day == "MAPPING":
+                continue
+            for slot, booked in by_slot.items():
+                for room in booked:
+                    ledger.book(room, [(day, slot)])
+        return ledger
+
+    # --------------------- Interning ---------------------
+    def add_room(self, room):
+        bit = self._room_bit.get(room)
+        if bit is None:
+            bit = len(self._rooms)
+            self._room_bit[room] = bit
+            self._rooms.append(sys.intern(room))
+            self._room_cells[room] = 0
+        return bit
+
+    @property
+    def rooms(self):
+        return list(self._rooms)
+
+    def rooms_mask(self, rooms):
+        mask = 0
+        for r in rooms:
+            mask |= 1 << self.add_room(r)
+        return mask
+
+    # --------------------- Queries ---------------------
+    def occupied_mask(self, cells):
+        """Bitmask of rooms booked in any of the given cells."""
+        mask = 0
+        for cell in cells:
+            bit = self._cell_bit.get(cell)
+            if bit is not None:
+                mask |= self._cell_rooms.get(bit, 0)
+        return mask
+
+    def free_rooms(self, candidates, cells):
+        """Rooms from 'candidates' (order preserved) that are free in every cell."""
+        busy = self.occupied_mask(cells)
+        if not busy:
+            return list(candidates)
+        return [r for r in candidates if not (busy >> self.add_room(r)) & 1]
+
+    def is_free(self, room, cells):
+        return not self._room_cells.get(room, 0) & self.cells_mask(cells)
+
+    def free_count(self, room, cells):
+        """Number of the given cells in which 'room' is free."""
+        span = self.cells_mask(cells)
+        return bin(span & ~self._room_cells.get(room, 0)).count("1")
+
+    def occupied(self, day, slot):
+        """Rooms booked at (day, slot), in ledger order."""
+        bit = self._cell_bit.get((day, slot))
+        mask = self._cell_rooms.get(bit, 0) if bit is not None else 0
+        return [self._rooms[i] for i in _bits(mask)]
+
+    # --------------------- Updates ---------------------
+    def book(self, room, cells):
+        rbit = 1 << self.add_room(room)
+        for cell in cells:
+            cbit = self._cell(cell)
+            self._room_cells[room] |= 1 << cbit
+            self._cell_rooms[cbit] = self._cell_rooms.get(cbit, 0) | rbit
+
+    def release(self, room, cells):
+        if room not in self._room_bit:
+            return
+        rbit = 1 << self._room_bit[room]
+        for cell in cells:
+            cbit = self._cell_bit.get(cell)
+            if cbit is None:
+                continue
+            self._room_cells[room] &= ~(1 << cbit)
+            self._cell_rooms[cbit] = self._cell_rooms.get(cbit, 0) & ~rbit
+
+    def snapshot(self, room, cells):
+        """Capture the bookings of 'room' and of the given cells so restore() can undo a book()."""
+        self.add_room(room)
+        cbits = [self._cell(cell) for cell in cells]
+        return room, self._room_cells[room], {cb: self._cell_rooms.get(cb, 0) for cb in cbits}
+
+    def restore(self, state):
+        room, room_mask, cell_masks = state
+        self._room_cells[room] = room_mask
+        self._cell_rooms.update(cell_masks)
+
+    def checkpoint(self):
+        """Capture every booking; rollback() returns the ledger to this point."""
+        return dict(self._room_cells), dict(self._cell_rooms)
+
+    def rollback(self, state):
+        room_cells, cell_rooms = state
+        self._room_cells, self._cell_rooms = dict(room_cells), dict(cell_rooms)
+        for room in self._rooms:
+            self._room_cells.setdefault(room, 0)
+
+    def busy_by_day(self, room, days, slots):
+        """Bookings of 'room' as one slot-index bitmask per day."""
+        return self._day_masks(self._room_cells.get(room, 0), days, slots)
+
+    # --------------------- Export ---------------------
+    def to_usage(self):
+        """Export to the legacy nested dict[day][slot] -> [rooms]."""
+        usage = {}
+        for cbit, mask in self._cell_rooms.items():
+            if mask:
+                day, slot = self._cells[cbit][-2:]
+                booked = usage.setdefault(day, {}).setdefault(slot, [])
+                booked.extend(self._rooms[i] for i in _bits(mask) if self._rooms[i] not in booked)
+        return usage
+
+    def half(self, half):
+        """View of this ledger for one semester half (see HalfView)."""
+        return _RoomHalf(self, half)
+
+
+# --------------------- Faculty ledger ---------------------
+class FacultyLedger(_CellLedger):
+    """
+    Faculty availability shared by every department and semester half.
+
+    Each faculty member has one bitmask over (day, slot) cells, so a busy check
+    for a whole span is a single AND. Co-taught courses list several members
+    separated by "/" (e.g. "Dr. A/Dr. B"); all of them must be free.
+    Teaching load (sessions, hours, days) is accumulated as sessions are booked.
+    """
+
+    def __init__(self, roster=()):
+        super().__init__()
+        self.roster = []
+        self._busy = {}   # member -> mask over cells
+        self._load = {}   # member -> {"sessions": int, "hours": float, "days": set}
+        for name in roster:
+            self.add(name)
+
+    @classmethod
+    def from_csv(cls, faculty_file):
+        """Build the ledger from a roster CSV with a 'Name' column (data/Faculty.csv)."""
+        df = pd.read_csv(faculty_file)
+        names = [str(n).strip() for n in df["Name"].dropna()]
+        return cls(n for n in names if n)
+
+    @staticmethod
+    def members(faculty):
+        """Split a course's Faculty field into individual names."""
+        return faculty_members(faculty)
+
+    def add(self, name):
+        if name not in self._busy:
+            self.roster.append(sys.intern(name))
+            self._busy[name] = 0
+            self._load[name] = {"sessions": 0, "hours": 0.0, "days": set()}
+
+    # --------------------- Queries ---------------------
+    def is_busy(self, faculty, cells):
+        span = self.cells_mask(cells)
+        return any(self._busy.get(m, 0) & span for m in self.members(faculty))
+
+    def load_summary(self):
+        """Per-faculty teaching load as a DataFrame (one row per roster member)."""
+        rows = []
+        for name in self.roster:
+            load = self._load[name]
+            rows.append({
+                "Faculty": name,
+                "Sessions": load["sessions"],
+                "Hours": round(load["hours"], 2),
+                "Days": len(load["days"]),
+            })
+        return pd.DataFrame(rows, columns=["Faculty", "Sessions", "Hours", "Days"])
+
+    # --------------------- Updates ---------------------
+    def book(self, faculty, cells, hours=0.0):
+        """Book a teaching session for every member over the given cells."""
+        cells = list(cells)
+        span = self.cells_mask(cells)
+        for m in self.members(faculty):
+            self.add(m)
+            self._busy[m] |= span
+            load = self._load[m]
+            load["sessions"] += 1
+            load["hours"] += hours
+            load["days"].update(cell[-2] for cell in cells)
+
+    def block(self, faculty, cells):
+        """Mark members busy without counting it as teaching (e.g. post-session breaks)."""
+        span = self.cells_mask(cells)
+        for m in self.members(faculty):
+            self.add(m)
+            self._busy[m] |= span
+
+    def snapshot(self, faculty):
+        """Capture busy masks and load of every member so restore() can undo book()/block()."""
+        state = {}
+        for m in self.members(faculty):
+            load = self._load.get(m)
+            state[m] = None if load is None else (self._busy[m], load["sessions"], load["hours"], set(load["days"]))
+        return state
+
+    def restore(self, state):
+        for m, saved in state.items():
+            if saved is None:
+                if m in self._busy:
+                    self.roster.remove(m)
+                    del self._busy[m], self._load[m]
+                continue
+            self._busy[m] = saved[0]
+            self._load[m] = {"sessions": saved[1], "hours": saved[2], "days": saved[3]}
+
+    def checkpoint(self):
+        """Capture every member's busy mask and load; rollback() returns the ledger to this point."""
+        loads = {m: (l["sessions"], l["hours"], set(l["days"])) for m, l in self._load.items()}
+        return list(self.roster), dict(self._busy), loads
+
+    def rollback(self, state):
+        roster, busy, loads = state
+        self.roster, self._busy = list(roster), dict(busy)
+        self._load = {m: {"sessions": n, "hours": h, "days": set(d)} for m, (n, h, d) in loads.items()}
+
+    def busy_by_day(self, member, days, slots):
+        """Busy cells of one member as a slot-index bitmask per day."""
+        return self._day_masks(self._busy.get(member, 0), days, slots)
+
+    def release(self, faculty, cells, hours=0.0):
+        span = self.cells_mask(cells)
+        for m in self.members(faculty):
+            if m in self._busy:
+                self._busy[m] &= ~span
+                if hours:
+                    self._load[m]["sessions"] -= 1
+                    self._load[m]["hours"] -= hours
+
+    def half(self, half):
+        """View of this ledger for one semester half (see HalfView)."""
+        return _FacultyHalf(self, half)
+
+
+# --------------------- Semester halves ---------------------
+class HalfView:
+    """
+    One semester half of a shared ledger. The First_Half and Second_Half timetables run in
+    different weeks, so a booking made through a view only holds its own half: cells are
+    stored as (half, day, slot). Queries see the view's half plus whole-semester (day, slot)
+    bookings made on the ledger itself. Checkpoints, rollback and the
+    roster/load are the underlying ledger's, so views can be created freely.
+    """
+
+    def __init__(self, ledger, half):
+        self.ledger = ledger
+        self.key = half
+
+    def _own(self, cells):
+        """Cells as stored by this view's bookings."""
+        return [(self.key, day, slot) for day, slot in cells]
+
+    def _seen(self, cells):
+        """Cells a query must check: this half and the whole semester."""
+        cells = list(cells)
+        return self._own(cells) + cells
+
+    def half(self, half):
+        return self.ledger.half(half)
+
+    def checkpoint(self):
+        return self.ledger.checkpoint()
+
+    def rollback(self, state):
+        self.ledger.rollback(state)
+
+    def restore(self, state):
+        self.ledger.restore(state)
+
+
+class _RoomHalf(HalfView):
+    @property
+    def rooms(self):
+        return self.ledger.rooms
+
+    def add_room(self, room):
+        return self.ledger.add_room(room)
+
+    def occupied_mask(self, cells):
+        return self.ledger.occupied_mask(self._seen(cells))
+
+    def free_rooms(self, candidates, cells):
+        return self.ledger.free_rooms(candidates, self._seen(cells))
+
+    def is_free(self, room, cells):
+        return self.ledger.is_free(room, self._seen(cells))
+
+    def free_count(self, room, cells):
+        return sum(1 for cell in cells if self.is_free(room, [cell]))
+
+    def book(self, room, cells):
+        self.ledger.book(room, self._own(cells))
+
+    def release(self, room, cells):
+        self.ledger.release(room, self._own(cells))
+
+    def snapshot(self, room, cells):
+        return self.ledger.snapshot(room, self._own(cells))
+
+    def busy_by_day(self, room, days, slots):
+        ledger = self.ledger
+        return ledger._day_masks(ledger._room_cells.get(room, 0), days, slots, self.key)
+
+    def to_usage(self):
+        return self.ledger.to_usage()
+
+
+class _FacultyHalf(HalfView):
+    members = staticmethod(faculty_members)
+
+    @property
+    def roster(self):
+        return self.ledger.roster
+
+    def add(self, name):
+        self.ledger.add(name)
+
+    def load_summary(self):
+        return self.ledger.load_summary()
+
+    def is_busy(self, faculty, cells):
+        return self.ledger.is_busy(faculty, self._seen(cells))
+
+    def book(self, faculty, cells, hours=0.0):
+        self.ledger.book(faculty, self._own(cells), hours)
+
+    def block(self, faculty, cells):
+        self.ledger.block(faculty, self._own(cells))
+
+    def release(self, faculty, cells, hours=0.0):
+        self.ledger.release(faculty, self._own(cells), hours)
+
+    def snapshot(self, faculty):
+        return self.ledger.snapshot(faculty)
+
+    def busy_by_day(self, member, days, slots):
+        ledger = self.ledger
+        return ledger._day_masks(ledger._busy.get(member, 0), days, slots, self.key)
+
+
+def _bits(mask):
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
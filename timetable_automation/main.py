@@ -1,16 +1,33 @@
 
 import os
+import sys
 import math
+import argparse
 import pandas as pd
 import random
 import hashlib
-from openpyxl import load_workbook
-from openpyxl.styles import Alignment, Border, Side, PatternFill
+import contextlib
+from bisect import bisect_left
+from functools import lru_cache
+from itertools import takewhile
+
+if __package__ in (None, ""):
+    # allow `python timetable_automation/main.py` as well as `python -m timetable_automation.main`
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    __package__ = "timetable_automation"
+
+from .occupancy import OccupancyGrid
+from .records import RecordStore, Session
+from .ledgers import RoomLedger, FacultyLedger
+from .export import write_student_workbook, write_faculty_workbook, write_room_workbook
+from .instrument import NO_PHASE
+from .matching import max_matching
 
 Random_SEED = 314156
 random.seed(Random_SEED)
 
 # --------------------- Utility functions ---------------------
+@lru_cache(maxsize=None)
 def stable_hash_val(x: object) -> int:
     """Return a stable integer hash for object x using SHA-256 (deterministic across runs)."""
     h = hashlib.sha256(str(x).encode("utf-8")).hexdigest()
@@ -22,6 +39,24 @@ def stable_key(x: object) -> int:
     return stable_hash_val(x) ^ Random_SEED
 
 
+def seed_salt(seed: int) -> int:
+    """
+    Value XOR-ed into stable hashes for 'seed'. A small seed only flips low bits, which
+    rarely changes an ordering, so other seeds are spread over all 64 bits; Random_SEED
+    keeps its historical keys (and therefore the historical timetables).
+    """
+    return Random_SEED if seed == Random_SEED else stable_hash_val(f"seed:{seed}")
+
+
+def parse_capacity(value):
+    """Seat count from a Capacity/Students cell; None for blanks and placeholders like "-"."""
+    try:
+        n = float(str(value).strip())
+    except (TypeError, ValueError):
+        return None
+    return int(n) if n == n and n > 0 else None
+
+
 # --------------------- Data container ---------------------
 class Course:
     """Container for course attributes (code, title, L-T-P-S-C, faculty, basket, elective flag)."""
@@ -35,6 +70,7 @@ class Course:
         # keep original CSV field name semantics
         self.sem_half = str(row.get("Semester_Half", "0")).strip()
         self.is_elective = str(row.get("Elective", 0)).strip() == "1"
+        self.students = parse_capacity(row.get("Students")) or 0  # 0 = unknown
         # parse L-T-P-S-C; be tolerant to malformed values
         try:
             parts = list(map(int, self.ltp.split("-")))
@@ -61,192 +97,379 @@ class Scheduler:
     - Exporting timetables and faculty sheets to Excel and applying formatting
     """
 
-    def __init__(self, slots_file, courses_file, rooms_file, global_room_usage):
+    DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+    EXCLUDED = ["07:30-09:00", "13:15-14:00", "17:40-18:30"]  # slots never used for teaching
+    # timetable sheet -> semester half; each sheet also gets the full-semester ("0") courses
+    HALVES = {"First_Half": "1", "Second_Half": "2"}
+
+    ENGINES = ("greedy", "search")
+    SEARCH_NODES = 1000  # search_max_nodes for runs that must not depend on timing (--workers/--portfolio)
+
+    def __init__(self, slots_file, courses_file, rooms_file, global_room_usage, faculty_ledger=None, engine="greedy", seed=None):
         # Read timeslots
         slot_frame = pd.read_csv(slots_file)
-        self.slots = [f"{r['Start_Time'].strip()}-{r['End_Time'].strip()}" for _, r in slot_frame.iterrows()]
-        self.slot_lengths = {s: self._slot_len(s) for s in self.slots}
+        slots = [f"{r['Start_Time'].strip()}-{r['End_Time'].strip()}" for _, r in slot_frame.iterrows()]
 
         # Read courses
         course_data = pd.read_csv(courses_file)
-        self.courses = [Course(row) for _, row in course_data.iterrows()]
+        courses = [Course(row) for _, row in course_data.iterrows()]
 
         # Read rooms
         rooms_df = pd.read_csv(rooms_file)
-        self.classrooms, self.labs, self.all_rooms = [], [], []
-        for _, row in rooms_df.iterrows():
-            room_id = str(row["Room_ID"]).strip()
-            self.all_rooms.append(room_id)
-            if room_id.upper().startswith("L"):
-                self.labs.append(room_id)
-            elif room_id.upper().startswith("C"):
-                self.classrooms.append(room_id)
+        rooms = [str(row["Room_ID"]).strip() for _, row in rooms_df.iterrows()]
+        capacity = dict(zip(rooms, rooms_df["Capacity"])) if "Capacity" in rooms_df.columns else {}
+
+        self._setup(slots, courses, rooms, global_room_usage, faculty_ledger, engine, seed, room_capacity=capacity)
+
+    @classmethod
+    def from_model(cls, model, dept_name, global_room_usage, faculty_ledger=None, engine="greedy", seed=None):
+        """Build the scheduler for one department of a compiled ProblemModel, without reading any CSV."""
+        self = cls.__new__(cls)
+        self._setup(model.slots, model.courses_for(dept_name), model.rooms, global_room_usage, faculty_ledger, engine, seed,
+                    model.stable_hashes, model.room_capacity)
+        return self
+
+    def _setup(self, slots, courses, rooms, global_room_usage, faculty_ledger=None, engine="greedy", seed=None, stable_hashes=None,
+               room_capacity=None):
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown engine {engine!r}; expected one of {self.ENGINES}")
+        # "greedy": MAX_ATTEMPTS passes per course; "search": backtracking solver (see search.SheetSearch)
+        # that runs first, with the greedy pass filling whatever it leaves open
+        self.engine = engine
+        self.search_budget = 2.0     # seconds per sheet for engine="search"
+        self.search_max_nodes = None  # optional node cap for reproducible search runs
+        self.optimize_iterations = 0  # >0 runs the local-search pass (optimize.SheetOptimizer) per sheet
+
+        # seed for every deterministic ordering and room pick (Random_SEED unless given)
+        self.seed = Random_SEED if seed is None else seed
+        self._salt = seed_salt(self.seed)
+        # precomputed stable hashes (from a compiled model) avoid hashing during sorts
+        self._stable_hashes = dict(stable_hashes or {})
+
+        self.slots = list(slots)
+        self.slot_lengths = {s: self._slot_len(s) for s in self.slots}
+        self.slot_index = {s: i for i, s in enumerate(self.slots)}
+        self.courses = list(courses)
+        self.all_rooms = list(rooms)
+        # seats per room (None when the rooms file gives none) and per course code (first row wins)
+        self.room_capacity = {r: parse_capacity((room_capacity or {}).get(r)) for r in self.all_rooms}
+        self._students = {}
+        for c in self.courses:
+            self._students.setdefault(c.code, c.students)
+        self.limit_rooms(None)
 
         # Scheduling parameters
-        self.days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
-        self.excluded = ["07:30-09:00", "13:15-14:00", "17:40-18:30"]
+        self.days = list(self.DAYS)
+        self.excluded = list(self.EXCLUDED)
         self.MAX_ATTEMPTS = 10
+        # day preference order per session type (L/T/P), fixed for the run
+        self._day_order = {t: sorted(self.days, key=lambda d: self._stable(f"{d}-{t}")) for t in "LTP"}
 
         # Mutable state that gets populated during scheduling
         self.unscheduled_list = []
         self.course_room_map = {}
-        self.global_room_usage = global_room_usage  # external mapping across depts
-        self.records = []  # each scheduled placement as dict
+        # shared room bookings across depts; a legacy dict[day][slot] -> [rooms] is converted
+        if isinstance(global_room_usage, RoomLedger):
+            self.room_ledger = global_room_usage
+        else:
+            self.room_ledger = RoomLedger.from_usage(global_room_usage, self.all_rooms)
+        # faculty bookings; pass one FacultyLedger to every department to avoid cross-dept clashes
+        self.faculty_ledger = faculty_ledger if faculty_ledger is not None else FacultyLedger()
+        self.records = []  # each scheduled placement (wrapped in a RecordStore)
         self.elective_groups = {}
         self.elective_room_map = {}
+        self._elective_room_cache = {}  # sheet_name -> (inputs key, {key: room}), see _assign_elective_rooms
+        self.grids = {}  # sheet_name -> OccupancyGrid
+        self.sessions = []  # every committed Session, in placement order
         self.break_after_slots = 1
+        self.day_rotation = 0  # shifts every day preference order; used to spread parallel speculative runs
+        self.stats = None  # optional instrument.SchedulerStats; None keeps the hot paths uninstrumented
+
+    def _stable(self, x):
+        """stable_key(x) for this scheduler's seed, hashing only strings missing from the precomputed table."""
+        h = self._stable_hashes.get(x)
+        if h is None:
+            h = self._stable_hashes[x] = stable_hash_val(x)
+        return h ^ self._salt
+
+    @property
+    def global_room_usage(self):
+        """Legacy nested dict view of the room ledger (read-only snapshot)."""
+        return self.room_ledger.to_usage()
+
+    @property
+    def records(self):
+        return self._records
+
+    @records.setter
+    def records(self, records):
+        self._records = records if isinstance(records, RecordStore) else RecordStore(records)
+
+    def limit_rooms(self, allowed):
+        """
+        Restrict new room picks to 'allowed' (None restores every room from the rooms file).
+        Candidates are kept in stable-key order so filtering preserves deterministic picks.
+        """
+        allowed = None if allowed is None else set(allowed)
+        self.labs = [r for r in self.all_rooms if r.upper().startswith("L") and (allowed is None or r in allowed)]
+        self.classrooms = [r for r in self.all_rooms if r.upper().startswith("C") and (allowed is None or r in allowed)]
+        self._lab_order = sorted(self.labs, key=self._stable)
+        self._classroom_order = sorted(self.classrooms, key=self._stable)
+        # capacity index per room kind: (sorted capacities, rooms in that order, rooms without a capacity)
+        self._capacity_index = {}
+        for kind, order in (("P", self._lab_order), ("C", self._classroom_order)):
+            known = sorted((r for r in order if self.room_capacity.get(r)), key=self.room_capacity.get)
+            self._capacity_index[kind] = ([self.room_capacity[r] for r in known], known,
+                                          [r for r in order if not self.room_capacity.get(r)])
+        self._fit_orders = {}
+
+    def _fit_order(self, kind, students):
+        """
+        Rooms of 'kind' ("P" labs, "C" classrooms) in best-fit order for 'students' seats:
+        rooms that fit, smallest first (found by bisecting the capacity index), then rooms
+        with unknown capacity, then rooms too small for the group, largest first. Without a
+        student count the stable-key order is kept.
+        """
+        if not students:
+            return self._lab_order if kind == "P" else self._classroom_order
+        order = self._fit_orders.get((kind, students))
+        if order is None:
+            caps, rooms, unknown = self._capacity_index[kind]
+            i = bisect_left(caps, students)
+            order = self._fit_orders[(kind, students)] = rooms[i:] + unknown + rooms[:i][::-1]
+        return order
+
+    def _room_order(self, code, session_type):
+        """Candidate rooms for a session of course 'code', best fit first (see _fit_order)."""
+        return self._fit_order("P" if session_type == "P" else "C", self._students.get(code, 0))
+
+    def _choose_room(self, code, free_rooms):
+        """
+        Seeded pick among 'free_rooms' (in _room_order order). With a known student count
+        only rooms of the best free capacity compete, so the seed varies rooms without
+        giving up the fit. Returns None if nothing is free.
+        """
+        if not free_rooms:
+            return None
+        if self._students.get(code):
+            best = self.room_capacity.get(free_rooms[0])
+            free_rooms = list(takewhile(lambda r: self.room_capacity.get(r) == best, free_rooms))
+        return free_rooms[self.seed % len(free_rooms)]
 
     # --------------------- Helpers ---------------------
+    def _rotate_days(self, days):
+        k = self.day_rotation % len(days) if days else 0
+        return days[k:] + days[:k]
+
     def _slot_len(self, slot):
         start, end = slot.split("-")
         h1, m1 = map(int, start.split(":"))
         h2, m2 = map(int, end.split(":"))
         return (h2 + m2 / 60) - (h1 + m1 / 60)
 
+    def _phase(self, name):
+        """Timer context for phase 'name' when stats are enabled, else a shared no-op."""
+        return self.stats.phase(name) if self.stats is not None else NO_PHASE
+
+    @contextlib.contextmanager
+    def _half_ledgers(self, sheet_name):
+        """
+        Point self.room_ledger and self.faculty_ledger at the semester half of 'sheet_name'
+        for the block, so bookings only hold that half (see ledgers.HalfView). Sheets outside
+        HALVES use the ledgers as they are, booking the whole semester.
+        """
+        half = self.HALVES.get(sheet_name)
+        if half is None:
+            yield
+            return
+        room_ledger, faculty_ledger = self.room_ledger, self.faculty_ledger
+        self.room_ledger, self.faculty_ledger = room_ledger.half(half), faculty_ledger.half(half)
+        try:
+            yield
+        finally:
+            self.room_ledger, self.faculty_ledger = room_ledger, faculty_ledger
+
+    def _new_grid(self):
+        """Create an empty occupancy grid for one timetable sheet."""
+        return OccupancyGrid(self.days, self.slots, self.excluded, [self.slot_lengths[s] for s in self.slots])
+
     def _free_blocks(self, table, day):
         """
         Return contiguous free-slot blocks (lists of slot keys) for a given day's timetable.
         Excluded slots are treated as occupied.
         """
-        blocks, tmp = [], []
-        for slot in self.slots:
-            if table.at[day, slot] == "" and slot not in self.excluded:
-                tmp.append(slot)
-            else:
-                if tmp:
-                    blocks.append(tmp)
-                    tmp = []
-        if tmp:
-            blocks.append(tmp)
-        return blocks
+        return [[self.slots[i] for i in block] for block in table.free_blocks(day)]
 
     # --------------------- Core allocation ---------------------
-    def _assign_session(self, table, faculty_busy, lab_flag, day, faculty, code, hrs, session_type="L", is_elective=False, sheet_name=None):
+    def _assign_session(self, table, faculty_ledger, lab_flag, day, faculty, code, hrs, session_type="L", is_elective=False, sheet_name=None):
         """
         Try to place a contiguous session of 'hrs' hours on 'day' for course 'code'.
+        'table' is the sheet's OccupancyGrid and 'faculty_ledger' the shared FacultyLedger.
         Respects faculty busy times, lab-day restrictions, room availability, and excluded slots.
-        Adds entries to self.records and updates global_room_usage when room assigned.
+        Adds entries to self.records and books the room ledger when room assigned.
         Returns True on successful placement.
         """
+        reason = self._place_session(table, faculty_ledger, lab_flag, day, faculty, code, hrs, session_type, is_elective, sheet_name)
+        if self.stats is not None:
+            self.stats.counters["assign_session"] += 1
+            if reason is not None:
+                self.stats.reject(sheet_name, code, session_type, reason)
+        return reason is None
+
+    def _place_session(self, table, faculty_ledger, lab_flag, day, faculty, code, hrs, session_type, is_elective, sheet_name):
+        """Body of _assign_session: None once placed, else why not (see instrument.REJECT_REASONS)."""
         # prevent placing same course multiple times on same day for same sheet
-        for rec in self.records:
-            if rec["day"] == day and rec["code"] == code and rec["sheet"] == sheet_name:
-                return False
+        if self.records.has_course_on_day(sheet_name, day, code):
+            return "duplicate_day"
 
         # cannot schedule practical if a lab already scheduled that day (policy from original code)
         if session_type == "P" and lab_flag[day]:
-            return False
+            return "lab_day_taken"
 
-        free_blocks = self._free_blocks(table, day)
-        for block in free_blocks:
-            total = sum(self.slot_lengths[s] for s in block)
-            if total >= hrs:
-                slots_to_use, dur_accum = [], 0.0
-                for s in block:
-                    slots_to_use.append(s)
-                    dur_accum += self.slot_lengths[s]
-                    if dur_accum >= hrs:
-                        break
-
-                # faculty availability check
-                if faculty:
-                    busy = any(faculty in faculty_busy[day][s] for s in slots_to_use)
-                    if busy:
-                        continue
-
-                # room assignment
-                if not is_elective:
-                    mapped = self.course_room_map.get(code)
-                    if mapped:
-                        # if mapped room suits session type, use it
-                        if (session_type == "P" and mapped.upper().startswith("L")) or (session_type != "P" and not mapped.upper().startswith("L")):
-                            room = mapped
-                        else:
-                            mapped = None
-                    if not mapped:
-                        possible_rooms = self.labs if session_type == "P" else self.classrooms
-                        available_rooms = [
-                            r for r in possible_rooms
-                            if all(r not in self.global_room_usage.get(day, {}).get(s, []) for s in slots_to_use)
-                        ]
-                        if not available_rooms:
-                            return False
-                        # deterministic selection using stable ordering and numeric seed
-                        room = sorted(available_rooms, key=lambda r: stable_key(r))[Random_SEED % len(available_rooms)]
-                        self.course_room_map[code] = room
-
-                    # mark room usage
-                    for s in slots_to_use:
-                        self.global_room_usage.setdefault(day, {}).setdefault(s, []).append(room)
-                else:
-                    room = ""
-
-                # write to timetable and records
-                for i, s in enumerate(slots_to_use):
-                    if session_type == "L":
-                        display_text = f"{code} ({room})" if (room and not is_elective) else code
-                    elif session_type == "T":
-                        display_text = f"{code}T ({room})" if (room and not is_elective) else f"{code}T"
-                    elif session_type == "P":
-                        display_text = f"{code} (Lab-{room})" if (room and not is_elective) else code
-                    else:
-                        display_text = code
-
-                    table.at[day, s] = display_text
-                    self.records.append({
-                        "sheet": sheet_name,
-                        "day": day,
-                        "slot": s,
-                        "code": code,
-                        "display": display_text,
-                        "faculty": faculty,
-                        "room": room,
-                    })
-
-                    # prevent tiny-gap double booking for quarter-hour small breaks
-                    if i < len(slots_to_use) - 1:
-                        idx = self.slots.index(s)
-                        if idx + 1 < len(self.slots):
-                            gap_slot = self.slots[idx + 1]
-                            if table.at[day, gap_slot] == "" and math.isclose(self.slot_lengths[gap_slot], 0.25):
-                                table.at[day, gap_slot] = "FREE"
-
-                # mark faculty busy
-                if faculty:
-                    for s in slots_to_use:
-                        faculty_busy[day][s].append(faculty)
-
-                # flag that a lab was scheduled that day
-                if session_type == "P":
-                    lab_flag[day] = True
-
-                # insert post-session break slots (if empty)
-                last_slot = slots_to_use[-1]
-                idx = self.slots.index(last_slot)
-                for extra in range(1, self.break_after_slots + 1):
-                    if idx + extra < len(self.slots):
-                        next_slot = self.slots[idx + extra]
-                        if table.at[day, next_slot] == "":
-                            table.at[day, next_slot] = "BREAK"
-                            if faculty:
-                                faculty_busy[day][next_slot].append(faculty)
-                            if not is_elective and room:
-                                self.global_room_usage.setdefault(day, {}).setdefault(next_slot, []).append(room)
-
-                return True
-
-        return False
+        reason = "no_free_span"
+        for span in table.candidate_spans(day, hrs):
+            cells = [(day, self.slots[i]) for i in span]
+
+            # faculty availability check
+            if faculty and faculty_ledger.is_busy(faculty, cells):
+                reason = "faculty_busy"
+                continue
+
+            # room assignment
+            if not is_elective:
+                room = self._pick_room(code, session_type, cells)
+                if room is None:
+                    return "no_room"
+            else:
+                room = ""
+
+            session = Session(sheet_name, day, span, code, faculty, room, session_type, is_elective, hrs)
+            self._commit_session(table, faculty_ledger, lab_flag, session)
+            return None
+
+        return reason
+
+    def _pick_room(self, code, session_type, cells):
+        """Return the course's mapped room if it suits the session and is free, else a free room (None if none)."""
+        mapped = self.course_room_map.get(code)
+        if mapped and mapped.upper().startswith("L") == (session_type == "P") and self.room_ledger.is_free(mapped, cells):
+            return mapped
+        # candidates come in best-fit order, so filtering preserves the deterministic ordering
+        available_rooms = self.room_ledger.free_rooms(self._room_order(code, session_type), cells)
+        if self.stats is not None:
+            self.stats.room_candidates[len(available_rooms)] += 1
+        room = self._choose_room(code, available_rooms)
+        if room is not None:
+            self.course_room_map[code] = room
+        return room
+
+    def _commit_session(self, table, faculty_ledger, lab_flag, session):
+        """
+        Apply a placement that has already been checked: book room and faculty, write the
+        grid and records, mark gaps/breaks and the lab-day flag, and log it in self.sessions.
+        """
+        day, span, code, room, faculty = session.day, session.span, session.code, session.room, session.faculty
+        session_type, is_elective = session.session_type, session.is_elective
+        slots_to_use = [self.slots[i] for i in span]
+        cells = [(day, s) for s in slots_to_use]
+
+        # mark room usage
+        if not is_elective:
+            self.room_ledger.book(room, cells)
+
+        # write to timetable and records
+        if session_type == "L":
+            display_text = f"{code} ({room})" if (room and not is_elective) else code
+        elif session_type == "T":
+            display_text = f"{code}T ({room})" if (room and not is_elective) else f"{code}T"
+        elif session_type == "P":
+            display_text = f"{code} (Lab-{room})" if (room and not is_elective) else code
+        else:
+            display_text = code
+
+        table.place(day, span, display_text)
+        for s in slots_to_use:
+            self.records.append({
+                "sheet": session.sheet,
+                "day": day,
+                "slot": s,
+                "code": code,
+                "display": display_text,
+                "faculty": faculty,
+                "room": room,
+                "session_type": session_type,
+            })
+
+        # prevent tiny-gap double booking for quarter-hour small breaks
+        for idx in span[:-1]:
+            if idx + 1 < len(self.slots) and math.isclose(table.slot_lengths[idx + 1], 0.25):
+                table.mark_gap(day, idx + 1)
+
+        # mark faculty busy
+        if faculty:
+            faculty_ledger.book(faculty, cells, sum(table.slot_lengths[i] for i in span))
+
+        # flag that a lab was scheduled that day
+        if session_type == "P":
+            lab_flag[day] = True
+
+        # insert post-session break slots (if empty)
+        idx = span[-1]
+        for extra in range(1, self.break_after_slots + 1):
+            if idx + extra < len(self.slots):
+                next_slot = self.slots[idx + extra]
+                if table.mark_break(day, idx + extra):
+                    if faculty:
+                        faculty_ledger.block(faculty, [(day, next_slot)])
+                    if not is_elective and room:
+                        self.room_ledger.book(room, [(day, next_slot)])
+
+        self.sessions.append(session)
+
+    def _replay_session(self, table, faculty_ledger, lab_flag, session):
+        """
+        Re-apply a session placed by an earlier run if it is still valid against the current
+        grid and shared ledgers. Returns True if it was committed.
+        """
+        day, span = session.day, session.span
+        cells = [(day, self.slots[i]) for i in span]
+        span_mask = sum(1 << i for i in span)
+        if self.records.has_course_on_day(session.sheet, day, session.code):
+            return False
+        if session.session_type == "P" and lab_flag[day]:
+            return False
+        if table.free_mask(day) & span_mask != span_mask:
+            return False
+        if session.faculty and faculty_ledger.is_busy(session.faculty, cells):
+            return False
+        if session.room and not self.room_ledger.is_free(session.room, cells):
+            return False
+        if session.room and not session.is_elective:
+            self.course_room_map.setdefault(session.code, session.room)
+        self._commit_session(table, faculty_ledger, lab_flag, session)
+        return True
 
     # --------------------- Timetable generation ---------------------
-    def generate_timetable(self, course_list, writer, sheet_name):
+    def generate_timetable(self, course_list, writer, sheet_name, preplaced=()):
         """
-        Build a timetable DataFrame for the given course_list and write it to the provided Excel writer
-        under 'sheet_name'. This fills self.records and possibly self.unscheduled_list.
+        Build a timetable for the given course_list and write it to the provided Excel writer
+        under 'sheet_name' (pass writer=None to only schedule). This fills self.records,
+        self.grids[sheet_name] and possibly self.unscheduled_list.
+        Placement works on an OccupancyGrid; the DataFrame is only built for the export.
+        'preplaced' sessions from an earlier run are re-applied first where still valid, and
+        only the hours they don't cover are scheduled (by the engine, then greedily).
+        Rooms and faculty are booked for the sheet's semester half only (see HALVES).
         """
-        timetable = pd.DataFrame("", index=self.days, columns=self.slots)
-        faculty_busy = {day: {slot: [] for slot in self.slots} for day in self.days}
+        with self._half_ledgers(sheet_name):
+            self._generate_timetable(course_list, writer, sheet_name, preplaced)
+
+    def _generate_timetable(self, course_list, writer, sheet_name, preplaced):
+        timetable = self._new_grid()
         labs_scheduled = {day: False for day in self.days}
         self.course_room_map = {}
+        if self.optimize_iterations:
+            checkpoint = (self.room_ledger.checkpoint(), self.faculty_ledger.checkpoint(),
+                          len(self.records), len(self.sessions), len(self.unscheduled_list))
 
         # separate electives and non-electives
         electives = [c for c in course_list if c.is_elective]
@@ -280,24 +503,51 @@ class Scheduler:
         self.elective_groups[sheet_name] = chosen_electives
 
         # deterministic ordering of non-electives (stable_key ensures constant ordering)
-        non_electives.sort(key=lambda c: stable_key(c.code))
+        non_electives.sort(key=lambda c: self._stable(c.code))
+
+        # re-apply still-valid sessions from an earlier run, within each course's L/T/P budget
+        budget = {}
+        for c in non_electives:
+            budget.update({(c.code, "L"): c.L, (c.code, "T"): c.T, (c.code, "P"): c.P})
+        placed_hours = {}
+        for session in preplaced:
+            key = (session.code, session.session_type)
+            if session.sheet != sheet_name or placed_hours.get(key, 0) + session.hours > budget.get(key, 0):
+                continue
+            if self._replay_session(timetable, self.faculty_ledger, labs_scheduled, session):
+                placed_hours[key] = placed_hours.get(key, 0) + session.hours
+
+        # engine="search": solve the remaining hours with backtracking and apply its best assignment
+        if self.engine == "search":
+            from .search import SheetSearch
+
+            search = SheetSearch(self, timetable, labs_scheduled, non_electives, placed_hours, sheet_name,
+                                 self.search_budget, self.search_max_nodes)
+            with self._phase("search"):
+                solution = search.solve()
+            for session in solution:
+                if self._replay_session(timetable, self.faculty_ledger, labs_scheduled, session):
+                    key = (session.code, session.session_type)
+                    placed_hours[key] = placed_hours.get(key, 0) + session.hours
 
         # allocate for each course: Lectures (L), Tutorials (T), Practicals (P)
+        # (with engine="search" this only fills hours the solver could not place)
         for course in non_electives:
             faculty, code, is_elective = course.faculty, course.code, course.code.startswith("Elective_")
 
             # Lectures (each lecture block may be 1.5 hours)
-            remaining, attempts = course.L, 0
-            while remaining > 0 and attempts < self.MAX_ATTEMPTS:
-                attempts += 1
-                days_to_try = sorted(self.days, key=lambda d: stable_key(f"{d}-L"))
-                for day in days_to_try:
-                    if remaining <= 0 or (faculty and faculty in faculty_busy[day]):
-                        continue
-                    alloc = min(1.5, remaining)
-                    if self._assign_session(timetable, faculty_busy, labs_scheduled, day, faculty, code, alloc, "L", is_elective, sheet_name):
-                        remaining -= alloc
-                        break
+            remaining, attempts = course.L - placed_hours.get((code, "L"), 0), 0
+            with self._phase("schedule_L"):
+                while remaining > 0 and attempts < self.MAX_ATTEMPTS:
+                    attempts += 1
+                    days_to_try = self._rotate_days(self._day_order["L"])
+                    for day in days_to_try:
+                        if remaining <= 0:
+                            continue
+                        alloc = min(1.5, remaining)
+                        if self._assign_session(timetable, self.faculty_ledger, labs_scheduled, day, faculty, code, alloc, "L", is_elective, sheet_name):
+                            remaining -= alloc
+                            break
 
             if remaining > 0:
                 self.unscheduled_list.append({
@@ -311,16 +561,17 @@ class Scheduler:
                 })
 
             # Tutorials (1 hour each)
-            remaining, attempts = course.T, 0
-            while remaining > 0 and attempts < self.MAX_ATTEMPTS:
-                attempts += 1
-                days_to_try = sorted(self.days, key=lambda d: stable_key(f"{d}-T"))
-                for day in days_to_try:
-                    if remaining <= 0 or (faculty and faculty in faculty_busy[day]):
-                        continue
-                    if self._assign_session(timetable, faculty_busy, labs_scheduled, day, faculty, code, 1, "T", is_elective, sheet_name):
-                        remaining -= 1
-                        break
+            remaining, attempts = course.T - placed_hours.get((code, "T"), 0), 0
+            with self._phase("schedule_T"):
+                while remaining > 0 and attempts < self.MAX_ATTEMPTS:
+                    attempts += 1
+                    days_to_try = self._rotate_days(self._day_order["T"])
+                    for day in days_to_try:
+                        if remaining <= 0:
+                            continue
+                        if self._assign_session(timetable, self.faculty_ledger, labs_scheduled, day, faculty, code, 1, "T", is_elective, sheet_name):
+                            remaining -= 1
+                            break
 
             if remaining > 0:
                 self.unscheduled_list.append({
@@ -334,18 +585,19 @@ class Scheduler:
                 })
 
             # Practicals (labs)
-            remaining, attempts = course.P, 0
-            while remaining > 0 and attempts < self.MAX_ATTEMPTS:
-                attempts += 1
-                days_without_labs = [d for d in self.days if not labs_scheduled[d]]
-                days_to_try = sorted(days_without_labs, key=lambda d: stable_key(f"{d}-P"))
-                for day in days_to_try:
-                    if remaining <= 0 or (faculty and faculty in faculty_busy[day]):
-                        continue
-                    alloc = 2 if remaining >= 2 else remaining
-                    if self._assign_session(timetable, faculty_busy, labs_scheduled, day, faculty, code, alloc, "P", is_elective, sheet_name):
-                        remaining -= alloc
-                        break
+            remaining, attempts = course.P - placed_hours.get((code, "P"), 0), 0
+            with self._phase("schedule_P"):
+                while remaining > 0 and attempts < self.MAX_ATTEMPTS:
+                    attempts += 1
+                    days_without_labs = [d for d in self._day_order["P"] if not labs_scheduled[d]]
+                    days_to_try = self._rotate_days(days_without_labs)
+                    for day in days_to_try:
+                        if remaining <= 0:
+                            continue
+                        alloc = 2 if remaining >= 2 else remaining
+                        if self._assign_session(timetable, self.faculty_ledger, labs_scheduled, day, faculty, code, alloc, "P", is_elective, sheet_name):
+                            remaining -= alloc
+                            break
 
             if remaining > 0:
                 self.unscheduled_list.append({
@@ -358,15 +610,22 @@ class Scheduler:
                     "semester_half": course.sem_half
                 })
 
+        # optional improvement pass over the finished sheet
+        if self.optimize_iterations:
+            from .optimize import SheetOptimizer
+
+            optimizer = SheetOptimizer(self, sheet_name, non_electives, checkpoint)
+            with self._phase("optimize"):
+                timetable, labs_scheduled = optimizer.run(self.optimize_iterations)
+
         # Clear excluded slots in final timetable (set to empty string)
-        for day in self.days:
-            for slot in self.excluded:
-                if slot in timetable.columns:
-                    timetable.at[day, slot] = ""
+        timetable.clear_excluded()
+        self.grids[sheet_name] = timetable
 
         # Write timetable sheet
-        timetable.to_excel(writer, sheet_name=sheet_name, index=True)
-        print(f"Saved timetable sheet: {sheet_name}")
+        if writer is not None:
+            timetable.to_frame().to_excel(writer, sheet_name=sheet_name, index=True)
+            print(f"Saved timetable sheet: {sheet_name}")
 
     # --------------------- Elective room assignment ---------------------
     def _compute_elective_room_assignments_legally(self, sheet_name):
@@ -375,257 +634,307 @@ class Scheduler:
         This produces a mapping self.elective_room_map[sheet_name] = {key: room}
         where key is 'Elective_basket||Title'.
         """
+        with self._phase("elective_rooms"), self._half_ledgers(sheet_name):
+            self._assign_elective_rooms(sheet_name)
+
+    def _assign_elective_rooms(self, sheet_name):
+        """
+        Each chosen elective needs its own room, free in every slot of its basket's placeholder.
+        The electives of one basket meet together, so that is a bipartite matching (the
+        basket's electives x rooms) per basket, solved with matching.max_matching so every
+        elective gets a conflict-free room whenever such an assignment exists; electives left
+        unmatched get "" rather than an occupied room. Baskets sit in disjoint cells, so they
+        may reuse each other's rooms. Rooms are preferred in best-fit order for the elective's
+        Students (classrooms, then labs), or in rooms file order when that is unknown. The
+        result is cached per sheet and reused until the placeholders or the bookings in their
+        slots change.
+        """
         electives = self.elective_groups.get(sheet_name, [])
         if not electives:
             self.elective_room_map[sheet_name] = {}
             return
 
-        # gather (day, slot) pairs where elective placeholders are scheduled
-        elective_slots = [(r["day"], r["slot"]) for r in self.records if r["sheet"] == sheet_name and r["code"].startswith("Elective_")]
-        elective_slots = sorted(list(dict.fromkeys(elective_slots)))
-
-        candidate_rooms = list(self.classrooms) + list(self.labs)
-        room_free_all_slots = {}
-        for r in candidate_rooms:
-            ok = True
-            for day, slot in elective_slots:
-                if r in self.global_room_usage.get(day, {}).get(slot, []):
-                    ok = False
-                    break
-            room_free_all_slots[r] = ok
-
-        free_rooms = [r for r, ok in room_free_all_slots.items() if ok]
-        if not free_rooms:
-            # compute counts of free slots per room and sort by best fit
-            room_free_counts = {r: 0 for r in candidate_rooms}
-            for r in candidate_rooms:
-                for day, slot in elective_slots:
-                    if r not in self.global_room_usage.get(day, {}).get(slot, []):
-                        room_free_counts[r] += 1
-            ordered = sorted(candidate_rooms, key=lambda x: (-room_free_counts[x], stable_key(x)))
-            free_rooms = ordered
+        # (day, slot) cells of each basket's placeholder, and the basket's electives
+        cells_by_basket, keys_by_basket = {}, {}
+        for basket, elective in electives:
+            if basket not in cells_by_basket:
+                cells_by_basket[basket] = sorted({(r.day, r.slot) for r in self.records.for_course(sheet_name, f"Elective_{basket}")})
+            keys_by_basket.setdefault(basket, []).append(f"Elective_{basket}||{elective.title}")
 
-        assigned = {}
-        used = set()
-        idx = 0
+        # best fit for the elective's own enrolment, classrooms before labs
+        candidates = {}
         for basket, elective in electives:
-            key = f"Elective_{basket}||{elective.title}"
-            chosen_room = None
-            for r in free_rooms:
-                if r in used:
-                    continue
-                ok = True
-                for day, slot in elective_slots:
-                    if r in self.global_room_usage.get(day, {}).get(slot, []):
-                        ok = False
-                        break
-                if ok:
-                    chosen_room = r
-                    break
-            if not chosen_room:
-                chosen_room = free_rooms[idx % len(free_rooms)] if free_rooms else ""
-            assigned[key] = chosen_room
-            used.add(chosen_room)
-            idx += 1
-
-        self.elective_room_map[sheet_name] = assigned
-
-    # --------------------- Excel formatting for student timetables ---------------------
-    def format_student_timetable_with_legend(self, filename):
-        """
-        Apply coloring, merges, borders and a legend to the student timetable workbook.
-        A legend is added below each sheet summarizing course codes, titles and colors.
-        """
-        wb = load_workbook(filename)
-        thin_border = Border(left=Side(style="thin"), right=Side(style="thin"), top=Side(style="thin"), bottom=Side(style="thin"))
-
-        color_map = {}
-        palette = ["FFC7CE", "C6EFCE", "FFEB9C", "BDD7EE", "D9EAD3", "F4CCCC", "D9D2E9", "FCE5CD", "C9DAF8", "EAD1DC"]
-        color_index = 0
-
-        # precompute elective room assignments
-        for sheet_name in wb.sheetnames:
-            self._compute_elective_room_assignments_legally(sheet_name)
-
-        for sheet_name in wb.sheetnames:
-            ws = wb[sheet_name]
-
-            # color and merge cells for each row
-            for row in range(2, ws.max_row + 1):
-                start_col = 2
-                while start_col <= ws.max_column:
-                    cell = ws.cell(row=row, column=start_col)
-                    val = str(cell.value).strip() if cell.value is not None else ""
-
-                    if val and val not in ["FREE", "BREAK"]:
-                        raw_code = val.split(" ")[0]
-                        code = raw_code.rstrip("T")
-                        if code not in color_map:
-                            color_map[code] = palette[color_index % len(palette)]
-                            color_index += 1
-                        fill = PatternFill(start_color=color_map[code], end_color=color_map[code], fill_type="solid")
-
-                        cell.fill = fill
-
-                        merge_count = 0
-                        for col in range(start_col + 1, ws.max_column + 1):
-                            next_cell = ws.cell(row=row, column=col)
-                            if next_cell.value == cell.value:
-                                next_cell.fill = fill
-                                merge_count += 1
-                            else:
-                                break
-                        if merge_count > 0:
-                            ws.merge_cells(start_row=row, start_column=start_col, end_row=row, end_column=start_col + merge_count)
-
-                        cell.alignment = Alignment(horizontal="center", vertical="center")
-                        for col_idx in range(start_col, start_col + merge_count + 1):
-                            ws.cell(row=row, column=col_idx).border = thin_border
-                        start_col += merge_count + 1
-                    elif val == "BREAK":
-                        cell.fill = PatternFill(start_color="D9D9D9", end_color="D9D9D9", fill_type="solid")
-                        cell.alignment = Alignment(horizontal="center", vertical="center")
-                        cell.border = thin_border
-                        start_col += 1
-                    else:
-                        cell.border = thin_border
-                        start_col += 1
-
-            # add legend header and entries (student timetable legend)
-            start_row = ws.max_row + 3
-            headers = ["S.No", "Course Code", "Course Title", "L-T-P-S-C", "Faculty", "Color"]
-            for idx, header in enumerate(headers, start=2):
-                ws.cell(start_row, idx, header).border = thin_border
-                ws.cell(start_row, idx).alignment = Alignment(horizontal="center", vertical="center")
-
-            i = 1
-            for code in color_map:
-                if code.startswith("Elective_"):
-                    continue
-                ws.cell(start_row + i, 2, i).border = thin_border
-                ws.cell(start_row + i, 3, code).border = thin_border
-                course_name = next((c.title for c in self.courses if c.code == code), code)
-                ltpsc = next((c.ltp for c in self.courses if c.code == code), "")
-                faculty = next((c.faculty for c in self.courses if c.code == code), "")
-                ws.cell(start_row + i, 4, course_name).border = thin_border
-                ws.cell(start_row + i, 5, ltpsc).border = thin_border
-                ws.cell(start_row + i, 5).alignment = Alignment(horizontal="center", vertical="center")
-                ws.cell(start_row + i, 6, faculty).border = thin_border
-                color_cell = ws.cell(start_row + i, 7, "")
-                color_cell.fill = PatternFill(start_color=color_map[code], end_color=color_map[code], fill_type="solid")
-                color_cell.border = thin_border
-                i += 1
-
-            # tidy borders for timetable region and column widths
-            timetable_max_row = len(self.days) + 1
-            timetable_max_col = ws.max_column
-            for row_cells in ws.iter_rows(min_row=2, max_row=timetable_max_row, min_col=2, max_col=timetable_max_col):
-                for cell in row_cells:
-                    cell.border = thin_border
-
-            ws.freeze_panes = "B2"
-            for col_cells in ws.columns:
-                try:
-                    column_letter = col_cells[0].column_letter
-                except Exception:
-                    continue
-                max_length = 0
-                for cell in col_cells:
-                    if cell.value is not None:
-                        max_length = max(max_length, len(str(cell.value)))
-                ws.column_dimensions[column_letter].width = max_length + 2
-
-        wb.save(filename)
-        print(f"Formatted student timetable saved in {filename}")
-
-    
+            students = getattr(elective, "students", 0)
+            candidates[f"Elective_{basket}||{elective.title}"] = (
+                self._fit_order("C", students) + self._fit_order("P", students) if students
+                else list(self.classrooms) + list(self.labs))
+        all_cells = [c for cells in cells_by_basket.values() for c in cells]
+        cache_key = (tuple((basket, tuple(cells), tuple((k, tuple(candidates[k])) for k in keys_by_basket[basket]))
+                           for basket, cells in cells_by_basket.items()),
+                     self.room_ledger.occupied_mask(all_cells))
+        cached = self._elective_room_cache.get(sheet_name)
+        if cached is not None and cached[0] == cache_key:
+            self.elective_room_map[sheet_name] = dict(cached[1])
+            return
+
+        assigned = {}
+        for basket, cells in cells_by_basket.items():
+            adjacency = {key: self.room_ledger.free_rooms(candidates[key], cells) for key in keys_by_basket[basket]}
+            matched = max_matching(adjacency)
+            assigned.update((key, matched.get(key, "")) for key in adjacency)
+        self._elective_room_cache[sheet_name] = (cache_key, assigned)
+        self.elective_room_map[sheet_name] = dict(assigned)
+
     # --------------------- Full run helper ---------------------
-    def run_all_outputs(self, dept_name_prefix="CSE", student_filename=None):
+    def schedule_all(self, preplaced=(), sheets=None):
         """
-        Generate student timetables (First_Half and Second_Half) and a combined faculty workbook.
-        Also writes an unscheduled courses file if any course couldn't be placed.
+        Reset per-run state and schedule First_Half and Second_Half (or just 'sheets') without
+        writing anything. Results are left in self.grids, self.records, self.sessions and
+        self.unscheduled_list. 'preplaced' sessions (e.g. from another run's self.sessions)
+        are re-applied where valid.
+        The halves book separate ledger cells, so neither depends on the other: scheduling
+        them one by one, or each in its own process (see parallel.schedule_departments),
+        gives the same sessions.
         """
-        if not student_filename:
-            student_filename = f"{dept_name_prefix}_timetable.xlsx"
-
-        # reset state for this run
+        preplaced = list(preplaced)
+        self.sessions = []
         self.records = []
         self.elective_groups = {}
         self.elective_room_map = {}
+        self.grids = {}
         self.unscheduled_list = []
 
-        # write student timetables
-        with pd.ExcelWriter(student_filename, engine="openpyxl") as writer:
-            # first half (semester_half == "1" or "0")
-            self.generate_timetable([c for c in self.courses if c.sem_half in ["1", "0"]], writer, "First_Half")
-            # second half (semester_half == "2" or "0")
-            self.generate_timetable([c for c in self.courses if c.sem_half in ["2", "0"]], writer, "Second_Half")
+        for sheet_name, half in self.HALVES.items():
+            if sheets is None or sheet_name in sheets:
+                # semester_half == half, or "0" for full-semester courses
+                self.generate_timetable([c for c in self.courses if c.sem_half in [half, "0"]], None, sheet_name, preplaced)
 
-        # export unscheduled courses if any
-        if self.unscheduled_list:
-            unsched_file = f"{dept_name_prefix}_unscheduled_courses.xlsx"
-            pd.DataFrame(self.unscheduled_list).to_excel(unsched_file, index=False)
-            print(f"Some courses couldn't be scheduled. See '{unsched_file}' for details.")
+    def restore(self, sessions, unscheduled_list=(), elective_groups=None):
+        """
+        Re-apply the sessions of an earlier run exactly as they were, without validity checks
+        or any new placement, rebuilding grids, records and ledger bookings (used by the
+        incremental mode for departments whose inputs did not change).
+        """
+        self.sessions = []
+        self.records = []
+        self.elective_room_map = {}
+        self.grids = {}
+        self.course_room_map = {}
+        labs = {}
+        # generate_timetable records every sheet in elective_groups, so empty sheets come back too
+        for sheet in list(elective_groups or {}) + [s.sheet for s in sessions]:
+            if sheet not in self.grids:
+                self.grids[sheet] = self._new_grid()
+                labs[sheet] = {day: False for day in self.days}
+        for session in sessions:
+            grid = self.grids[session.sheet]
+            if session.room and not session.is_elective:
+                self.course_room_map.setdefault(session.code, session.room)
+            with self._half_ledgers(session.sheet):
+                self._commit_session(grid, self.faculty_ledger, labs[session.sheet], session)
+        for grid in self.grids.values():
+            grid.clear_excluded()
+        self.unscheduled_list = list(unscheduled_list)
+        self.elective_groups = dict(elective_groups or {})
+
+    def write_outputs(self, dept_name_prefix="CSE", student_filename=None, columnar=None, excel=True):
+        """
+        Export an already scheduled run: the student workbook (formatted, with legend) and,
+        if any course couldn't be placed, the unscheduled courses file. 'columnar' names a
+        format from columnar.FORMATS to also write the placements, unscheduled list and
+        elective rooms as tables next to the student workbook; excel=False skips the
+        workbooks entirely.
+        """
+        if not student_filename:
+            student_filename = f"{dept_name_prefix}_timetable.xlsx"
+        out_dir = os.path.dirname(student_filename)
 
-        # remove default sheets left by pandas writer if any
-        wb = load_workbook(student_filename)
-        for default in ["Sheet", "Sheet1"]:
-            if default in wb.sheetnames and len(wb.sheetnames) > 1:
-                wb.remove(wb[default])
-        wb.save(student_filename)
+        if excel:
+            # formatted student workbook, written once straight from the grids
+            with self._phase("export"):
+                write_student_workbook(self, student_filename)
 
-        # compute elective room assignments using final records
-        for sheet in wb.sheetnames:
-            self._compute_elective_room_assignments_legally(sheet)
+            # export unscheduled courses if any (next to the student workbook)
+            if self.unscheduled_list:
+                unsched_file = os.path.join(out_dir, f"{dept_name_prefix}_unscheduled_courses.xlsx")
+                pd.DataFrame(self.unscheduled_list).to_excel(unsched_file, index=False)
+                print(f"Some courses couldn't be scheduled. See '{unsched_file}' for details.")
 
-        # format student workbook 
-        self.format_student_timetable_with_legend(student_filename)
+        if columnar:
+            from .columnar import write_columnar
+
+            with self._phase("columnar"):
+                paths = write_columnar(self, dept_name_prefix, out_dir or ".", columnar)
+            print(f"Saved placement tables: {', '.join(paths)}")
+
+    def run_all_outputs(self, dept_name_prefix="CSE", student_filename=None, faculty_filename=None, room_filename=None,
+                        columnar=None, excel=True):
+        """
+        Generate student timetables (First_Half and Second_Half) and, if filenames are given,
+        per-faculty and per-room workbooks for this department.
+        Also writes an unscheduled courses file if any course couldn't be placed.
+        See write_outputs() for 'columnar' and 'excel'.
+        """
+        self.schedule_all()
+        self.write_outputs(dept_name_prefix, student_filename, columnar, excel)
+        records_by_dept = {dept_name_prefix: self.records}
+        if faculty_filename and excel:
+            write_faculty_workbook(records_by_dept, faculty_filename, self.days, self.slots)
+        if room_filename and excel:
+            write_room_workbook(records_by_dept, room_filename, self.days, self.slots)
 
 
 # --------------------- Script entrypoint ---------------------
 if __name__ == "__main__":
-    # departments mapping (department_name -> courses csv)
-    departments = {
-        "CSE-3-A": "data/CSE_3_A_courses.csv",
-        "CSE-3-B": "data/CSE_3_B_courses.csv",
-        "CSE-1-A": "data/CSE_1_A_courses.csv",
-        "CSE-1-B": "data/CSE_1_B_courses.csv",
-        "CSE-5-A": "data/CSE_5_A_courses.csv",
-        "CSE-5-B": "data/CSE_5_B_courses.csv",
-        "7-SEM": "data/DSAI_7_courses.csv",
-        "DSAI-3": "data/DSAI_3_courses.csv",
-        "ECE-3": "data/ECE_3_courses.csv",
-        "DSAI-1": "data/DSAI_1_courses.csv",
-        "ECE-1": "data/ECE_1_courses.csv",
-        "DSAI-5": "data/DSAI_5_courses.csv",
-        "ECE-5": "data/ECE_5_courses.csv",
-    }
-    rooms_file = "data/rooms.csv"
-    slots_file = "data/timeslots.csv"
-    global_room_usage = {}
-
-    all_records = []
-
-    # generate per-department timetables
-    for dept_name, course_file in departments.items():
-        print(f"\nGenerating student timetable for {dept_name}...")
-        scheduler = Scheduler(slots_file, course_file, rooms_file, global_room_usage)
-        student_file = f"{dept_name}_timetable.xlsx"
-        scheduler.run_all_outputs(dept_name_prefix=dept_name, student_filename=student_file)
-
-        # collect scheduled entries and course-room map for a combined faculty book later
-        all_records.extend(scheduler.records)
-        for k, v in scheduler.course_room_map.items():
-            global_room_usage.setdefault("MAPPING", {})[k] = v
-
-    # build combined faculty workbook from all departments
-    combined_courses = []
-    for dept_name, course_file in departments.items():
-        df = pd.read_csv(course_file)
-        for _, row in df.iterrows():
-            combined_courses.append(Course(row))
-
-    helper = Scheduler(slots_file, departments[list(departments.keys())[0]], rooms_file, global_room_usage)
-    helper.courses = combined_courses
-    helper.records = all_records
+    from timetable_automation.columnar import FORMATS, resolve_format
+    from timetable_automation.instrument import SchedulerStats, write_report, profiled
+
+    parser = argparse.ArgumentParser(description="Generate student timetables for every department.")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="schedule departments in a process pool with this many workers (0 = one after another)")
+    parser.add_argument("--engine", choices=Scheduler.ENGINES, default="greedy",
+                        help="placement engine: greedy passes, or backtracking search with a greedy fill")
+    parser.add_argument("--search-nodes", type=int, default=None, metavar="N",
+                        help="stop engine=search after N nodes per sheet instead of its time budget, so runs are "
+                             f"reproducible (default with --workers or --portfolio: {Scheduler.SEARCH_NODES})")
+    parser.add_argument("--optimize", type=int, default=0, metavar="N",
+                        help="run N simulated-annealing moves per sheet after placement (0 = off)")
+    parser.add_argument("--seed", type=int, default=Random_SEED,
+                        help="seed for the deterministic orderings and room picks")
+    parser.add_argument("--portfolio", type=int, default=1, metavar="N",
+                        help="try seeds SEED..SEED+N-1 in a process pool (--workers) and keep the best run")
+    parser.add_argument("--incremental", action="store_true",
+                        help="reschedule and rewrite only departments whose course CSV changed since the last --incremental run")
+    parser.add_argument("--columnar", choices=FORMATS, default=None,
+                        help="also write placements, unscheduled courses and elective rooms as tables "
+                             "(auto = parquet if pyarrow is installed, else csv)")
+    parser.add_argument("--no-excel", dest="excel", action="store_false",
+                        help="skip every .xlsx output (use with --columnar)")
+    parser.add_argument("--stats", metavar="JSON",
+                        help="write phase timers, placement counters and rejection reasons per department to this file")
+    parser.add_argument("--profile", metavar="PSTATS", help="run under cProfile and dump the stats to this file")
+    args = parser.parse_args()
+    if args.stats and (args.workers or args.portfolio > 1 or args.incremental):
+        parser.error("--stats needs a plain sequential run (no --workers, --portfolio or --incremental)")
+    if args.columnar:
+        try:
+            resolve_format(args.columnar)
+        except ImportError as exc:
+            parser.error(str(exc))
+    if args.search_nodes is not None and args.search_nodes < 1:
+        parser.error("--search-nodes must be at least 1")
+    settings = {"optimize_iterations": args.optimize}
+    # a wall-clock budget fits a different number of nodes under pool contention
+    if args.search_nodes is None and args.engine == "search" and (args.workers or args.portfolio > 1):
+        args.search_nodes = Scheduler.SEARCH_NODES
+    if args.search_nodes is not None:
+        settings.update(search_max_nodes=args.search_nodes, search_budget=None)
+    outputs = {"columnar": args.columnar, "excel": args.excel}
+    run_stats = SchedulerStats()  # compile and cross-department views
+    dept_reports = {}
+
+    # the profile is dumped even when a run fails part-way
+    with profiled(args.profile):
+        # departments mapping (department_name -> courses csv)
+        departments = {
+            "CSE-3-A": "data/CSE_3_A_courses.csv",
+            "CSE-3-B": "data/CSE_3_B_courses.csv",
+            "CSE-1-A": "data/CSE_1_A_courses.csv",
+            "CSE-1-B": "data/CSE_1_B_courses.csv",
+            "CSE-5-A": "data/CSE_5_A_courses.csv",
+            "CSE-5-B": "data/CSE_5_B_courses.csv",
+            "7-SEM": "data/DSAI_7_courses.csv",
+            "DSAI-3": "data/DSAI_3_courses.csv",
+            "ECE-3": "data/ECE_3_courses.csv",
+            "DSAI-1": "data/DSAI_1_courses.csv",
+            "ECE-1": "data/ECE_1_courses.csv",
+            "DSAI-5": "data/DSAI_5_courses.csv",
+            "ECE-5": "data/ECE_5_courses.csv",
+        }
+        rooms_file = "data/rooms.csv"
+        slots_file = "data/timeslots.csv"
+        faculty_file = "data/Faculty.csv"
+        from timetable_automation.compiler import compile_problem
+
+        # parse every input once; unchanged inputs are loaded from .timetable_cache/
+        with run_stats.phase("load"):
+            model = compile_problem(departments, rooms_file, slots_file, faculty_file)
+        room_ledger = RoomLedger(model.rooms)
+        faculty_ledger = model.faculty_ledger()
+
+        records_by_dept = {}  # dept name -> RecordStore, for the faculty and room views
+
+        # generate per-department timetables
+        if args.incremental:
+            from timetable_automation.incremental import schedule_incremental, saved_records
+
+            state_path = os.path.join(".timetable_cache", "state.pkl")
+            changed, schedulers, room_ledger, faculty_ledger = schedule_incremental(
+                model, state_path, args.engine, args.seed, settings)
+            print(f"\nRescheduled {len(changed)} of {len(departments)} department(s): {', '.join(changed) or 'none'}")
+            for dept_name in changed:
+                print(f"\nWriting student timetable for {dept_name}...")
+                # an earlier run may have left an unscheduled file that no longer applies
+                stale = f"{dept_name}_unscheduled_courses.xlsx"
+                if os.path.exists(stale):
+                    os.remove(stale)
+                schedulers[dept_name].write_outputs(dept_name_prefix=dept_name, student_filename=f"{dept_name}_timetable.xlsx", **outputs)
+            for dept_name, records in saved_records(state_path).items():
+                records_by_dept[dept_name] = records
+        elif args.portfolio > 1:
+            from timetable_automation.portfolio import schedule_portfolio, METRICS
+
+            seeds = [args.seed + i for i in range(args.portfolio)]
+            print(f"\nTrying {len(seeds)} seeds with {args.workers or 'default'} worker(s)...")
+            best_seed, schedulers, table = schedule_portfolio(model, seeds, args.workers or None, args.engine, settings)
+            print("seed      " + "  ".join(METRICS))
+            for seed, metrics in table:
+                print(f"{seed:<9} " + "  ".join(f"{metrics[m]:>{len(m)}}" for m in METRICS))
+            print(f"Keeping seed {best_seed}")
+            # the winning run has its own ledgers; the load summary below reads them
+            faculty_ledger = next(iter(schedulers.values())).faculty_ledger
+            for dept_name, scheduler in schedulers.items():
+                print(f"\nWriting student timetable for {dept_name}...")
+                scheduler.write_outputs(dept_name_prefix=dept_name, student_filename=f"{dept_name}_timetable.xlsx", **outputs)
+                records_by_dept[dept_name] = scheduler.records
+        elif args.workers:
+            from timetable_automation.parallel import schedule_departments
+
+            print(f"\nScheduling {len(departments)} departments with {args.workers} worker(s)...")
+            schedulers = schedule_departments(departments, slots_file, rooms_file, room_ledger, faculty_ledger, args.workers,
+                                              model=model, engine=args.engine, settings=settings, seed=args.seed)
+            for dept_name, scheduler in schedulers.items():
+                print(f"\nWriting student timetable for {dept_name}...")
+                scheduler.write_outputs(dept_name_prefix=dept_name, student_filename=f"{dept_name}_timetable.xlsx", **outputs)
+                records_by_dept[dept_name] = scheduler.records
+        else:
+            for dept_name, course_file in departments.items():
+                print(f"\nGenerating student timetable for {dept_name}...")
+                scheduler = Scheduler.from_model(model, dept_name, room_ledger, faculty_ledger, args.engine, args.seed)
+                for name, value in settings.items():
+                    setattr(scheduler, name, value)
+                if args.stats:
+                    scheduler.stats = SchedulerStats()
+                student_file = f"{dept_name}_timetable.xlsx"
+                scheduler.run_all_outputs(dept_name_prefix=dept_name, student_filename=student_file, **outputs)
+                if scheduler.stats is not None:
+                    dept_reports[dept_name] = scheduler.stats.report(scheduler.unscheduled_list)
+
+                # collect scheduled entries for the combined faculty and room books later
+                records_by_dept[dept_name] = scheduler.records
+
+        # per-faculty and per-room timetables across all departments
+        if args.excel:
+            days, slots = list(Scheduler.DAYS), list(model.slots)
+            with run_stats.phase("views"):
+                write_faculty_workbook(records_by_dept, "faculty_timetables.xlsx", days, slots)
+                write_room_workbook(records_by_dept, "room_timetables.xlsx", days, slots)
+
+        # per-faculty teaching load across all departments
+        faculty_ledger.load_summary().to_csv("faculty_load_summary.csv", index=False)
+    if args.stats:
+        write_report({"run": run_stats.report(), "departments": dept_reports}, args.stats)
+        print(f"Saved run statistics in {args.stats}")
+    if args.profile:
+        print(f"Saved cProfile stats in {args.profile}")
     print("\nAll done. Student timetables generated.")
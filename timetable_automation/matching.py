@@ -0,0 +1,47 @@
+from collections import deque
+
+
+def max_matching(adjacency):
+    """
+    Maximum bipartite matching for adjacency {left: [right, ...]} (Hopcroft-Karp).
+    Each left vertex is first given its first free choice in list order, and augmenting
+    paths only run for those left over, so when first-fit already matches everyone its
+    result is kept. Returns {left: right} for every matched left vertex.
+    """
+    match_left, match_right = {}, {}
+    for u, choices in adjacency.items():
+        for v in choices:
+            if v not in match_right:
+                match_left[u], match_right[v] = v, u
+                break
+
+    while len(match_left) < len(adjacency):
+        # BFS from every free left vertex, layering left vertices by alternating path length
+        dist = {u: 0 for u in adjacency if u not in match_left}
+        queue = deque(dist)
+        found = False
+        while queue:
+            u = queue.popleft()
+            for v in adjacency[u]:
+                w = match_right.get(v)
+                if w is None:
+                    found = True
+                elif w not in dist:
+                    dist[w] = dist[u] + 1
+                    queue.append(w)
+        if not found:
+            break
+
+        def augment(u):
+            for v in adjacency[u]:
+                w = match_right.get(v)
+                if w is None or (dist.get(w) == dist[u] + 1 and augment(w)):
+                    match_left[u], match_right[v] = v, u
+                    return True
+            dist[u] = None  # dead end for this phase
+            return False
+
+        for u in [u for u in adjacency if u not in match_left]:
+            augment(u)
+
+    return match_left
@@ -0,0 +1,181 @@
+import pandas as pd
+
+
+# --------------------- Occupancy grid ---------------------
+class OccupancyGrid:
+    """
+    Integer-indexed occupancy for one timetable sheet (days x slots).
+
+    Every day keeps three bitmasks over slot indices:
+    - busy:  any non-empty cell (session text, BREAK or FREE)
+    - break: cells holding the post-session "BREAK" marker
+    - gap:   quarter-hour cells holding the "FREE" marker
+    Session text is kept in a sparse label map and the DataFrame view is only
+    built by to_frame() when the sheet is exported.
+    """
+
+    BREAK = "BREAK"
+    FREE = "FREE"
+
+    def __init__(self, days, slots, excluded=(), slot_lengths=None):
+        self.days = list(days)
+        self.slots = list(slots)
+        self.day_index = {d: i for i, d in enumerate(self.days)}
+        self.slot_index = {s: i for i, s in enumerate(self.slots)}
+        self.slot_lengths = list(slot_lengths) if slot_lengths is not None else [1.0] * len(self.slots)
+
+        self.full_mask = (1 << len(self.slots)) - 1
+        self.excluded_mask = 0
+        for s in excluded:
+            if s in self.slot_index:
+                self.excluded_mask |= 1 << self.slot_index[s]
+
+        self.busy = [0] * len(self.days)
+        self.break_mask = [0] * len(self.days)
+        self.gap_mask = [0] * len(self.days)
+        self.labels = {}  # (day_idx, slot_idx) -> display text
+
+    # --------------------- Cell access ---------------------
+    def is_empty(self, day, slot_idx):
+        return not (self.busy[self.day_index[day]] >> slot_idx) & 1
+
+    def cell(self, day, slot):
+        """Return the display value of a cell, as it would appear in the exported sheet."""
+        d, i = self.day_index[day], self.slot_index[slot]
+        bit = 1 << i
+        if (d, i) in self.labels:
+            return self.labels[(d, i)]
+        if self.break_mask[d] & bit:
+            return self.BREAK
+        if self.gap_mask[d] & bit:
+            return self.FREE
+        return ""
+
+    def set_cell(self, day, slot, value):
+        """Write an arbitrary value into a cell ("" clears it). Slots outside the grid are ignored."""
+        if slot not in self.slot_index:
+            return
+        d, i = self.day_index[day], self.slot_index[slot]
+        self._clear(d, i)
+        if value == self.BREAK:
+            self.break_mask[d] |= 1 << i
+        elif value == self.FREE:
+            self.gap_mask[d] |= 1 << i
+        elif value:
+            self.labels[(d, i)] = value
+        else:
+            return
+        self.busy[d] |= 1 << i
+
+    def _clear(self, d, i):
+        keep = ~(1 << i)
+        self.busy[d] &= keep
+        self.break_mask[d] &= keep
+        self.gap_mask[d] &= keep
+        self.labels.pop((d, i), None)
+
+    # --------------------- Writes used by the scheduler ---------------------
+    def place(self, day, slot_idxs, text):
+        """Occupy the given slot indices on 'day' with a session label."""
+        d = self.day_index[day]
+        for i in slot_idxs:
+            self.labels[(d, i)] = text
+            self.busy[d] |= 1 << i
+
+    def mark_break(self, day, slot_idx):
+        """Mark an empty cell as BREAK. Returns True if the cell was empty."""
+        d = self.day_index[day]
+        bit = 1 << slot_idx
+        if self.busy[d] & bit:
+            return False
+        self.busy[d] |= bit
+        self.break_mask[d] |= bit
+        return True
+
+    def mark_gap(self, day, slot_idx):
+        """Mark an empty cell as FREE. Returns True if the cell was empty."""
+        d = self.day_index[day]
+        bit = 1 << slot_idx
+        if self.busy[d] & bit:
+            return False
+        self.busy[d] |= bit
+        self.gap_mask[d] |= bit
+        return True
+
+    def clear_excluded(self):
+        """Blank every excluded column (the sheet shows them empty)."""
+        for d in range(len(self.days)):
+            for i in self._bits(self.busy[d] & self.excluded_mask):
+                self._clear(d, i)
+
+    # --------------------- Block queries ---------------------
+    @staticmethod
+    def _bits(mask):
+        while mask:
+            low = mask & -mask
+            yield low.bit_length() - 1
+            mask ^= low
+
+    def free_mask(self, day):
+        """Bitmask of cells that are empty and not excluded."""
+        return ~(self.busy[self.day_index[day]] | self.excluded_mask) & self.full_mask
+
+    def free_blocks(self, day):
+        """Return contiguous runs of free slot indices for 'day', in slot order."""
+        mask = self.free_mask(day)
+        blocks = []
+        while mask:
+            start = (mask & -mask).bit_length() - 1
+            run = mask >> start
+            length = (~run & (run + 1)).bit_length() - 1
+            blocks.append(list(range(start, start + length)))
+            mask &= ~(((1 << length) - 1) << start)
+        return blocks
+
+    def candidate_spans(self, day, hrs, every_start=False):
+        """
+        Yield, for every free block long enough for 'hrs' hours, the shortest
+        prefix of that block whose slot lengths add up to at least 'hrs'.
+        With every_start=True, the shortest such span from every start position
+        inside each block is yielded (in slot order).
+        """
+        lengths = self.slot_lengths
+        for block in self.free_blocks(day):
+            for start in range(len(block) if every_start else 1):
+                span, dur = [], 0.0
+                for i in block[start:]:
+                    span.append(i)
+                    dur += lengths[i]
+                    if dur >= hrs:
+                        yield span
+                        break
+
+    def day_state(self, day):
+        """Masks of one day, for restore_day() (used to undo a tentative placement)."""
+        d = self.day_index[day]
+        return self.busy[d], self.break_mask[d], self.gap_mask[d]
+
+    def restore_day(self, day, state, slot_idxs=()):
+        """Restore a day's masks from day_state() and drop the labels of 'slot_idxs'."""
+        d = self.day_index[day]
+        self.busy[d], self.break_mask[d], self.gap_mask[d] = state
+        for i in slot_idxs:
+            self.labels.pop((d, i), None)
+
+    # --------------------- Export ---------------------
+    def to_frame(self):
+        """Materialize the grid as a DataFrame of strings (days x slots)."""
+        rows = []
+        for d in range(len(self.days)):
+            busy, brk, gap = self.busy[d], self.break_mask[d], self.gap_mask[d]
+            row = [""] * len(self.slots)
+            for i in self._bits(busy):
+                label = self.labels.get((d, i))
+                if label is not None:
+                    row[i] = label
+                elif (brk >> i) & 1:
+                    row[i] = self.BREAK
+                elif (gap >> i) & 1:
+                    row[i] = self.FREE
+            rows.append(row)
+        return pd.DataFrame(rows, index=self.days, columns=self.slots)
@@ -0,0 +1,111 @@
+import copy
+from concurrent.futures import ProcessPoolExecutor
+
+from .main import Scheduler, Random_SEED, seed_salt, stable_hash_val
+
+
+# --------------------- Room partitioning ---------------------
+def partition_rooms(rooms, dept_names, seed=Random_SEED):
+    """
+    Deal rooms out to departments round-robin in stable-key order, separately for labs and
+    classrooms so every department gets some of each. When there are fewer rooms of a kind
+    than departments, rooms are shared (clashes are then resolved at commit time).
+    """
+    shares = {name: [] for name in dept_names}
+    salt = seed_salt(seed)
+    key = lambda r: stable_hash_val(r) ^ salt
+    labs = sorted((r for r in rooms if r.upper().startswith("L")), key=key)
+    classrooms = sorted((r for r in rooms if r.upper().startswith("C")), key=key)
+    for pool in (labs, classrooms):
+        if not pool:
+            continue
+        for i, name in enumerate(dept_names):
+            shares[name].extend(pool[j] for j in range(i % len(pool), len(pool), len(dept_names)))
+    return shares
+
+
+# --------------------- Worker ---------------------
+def _make_scheduler(model, dept_name, course_file, slots_file, rooms_file, room_ledger, faculty_ledger,
+                    engine="greedy", settings=None, seed=None):
+    if model is not None:
+        scheduler = Scheduler.from_model(model, dept_name, room_ledger, faculty_ledger, engine, seed)
+    else:
+        scheduler = Scheduler(slots_file, course_file, rooms_file, room_ledger, faculty_ledger, engine, seed)
+    for name, value in (settings or {}).items():
+        setattr(scheduler, name, value)
+    return scheduler
+
+
+def _schedule_department(task):
+    """
+    Speculatively schedule one semester half of one department against a snapshot of the
+    shared ledgers, restricted to its room share and with its day preferences rotated so
+    departments that share faculty start on different days. Runs in a worker process.
+    """
+    (dept_name, sheet_name, course_file, slots_file, rooms_file, room_ledger, faculty_ledger, room_share, rotation,
+     model, engine, settings, seed) = task
+    scheduler = _make_scheduler(model, dept_name, course_file, slots_file, rooms_file, room_ledger, faculty_ledger,
+                                engine, settings, seed)
+    scheduler.limit_rooms(room_share)
+    scheduler.day_rotation = rotation
+    scheduler.schedule_all(sheets=[sheet_name])
+    return dept_name, scheduler.sessions
+
+
+# --------------------- Deterministic parallel run ---------------------
+def schedule_departments(departments, slots_file, rooms_file, room_ledger, faculty_ledger, workers=None, model=None, engine="greedy", settings=None, seed=None):
+    """
+    Schedule every department in 'departments' (name -> courses csv) in a process pool
+    and merge the results into the shared room/faculty ledgers without conflicts.
+
+    1. Speculative pass: every department is scheduled in parallel against the same ledger
+       snapshot, one task per semester half (the halves book separate ledger cells, see
+       Scheduler.schedule_all), so a pool can use twice as many workers as departments.
+    2. Ordered commit: in department order, each department is rebuilt in-process on the
+       shared ledgers by replaying its speculative sessions. Sessions that clash with a
+       department committed before it are dropped and only those hours are re-placed
+       greedily (with every room available), so the expensive search mostly ran in parallel.
+    The outcome depends only on department order, the inputs and the seed, never on worker
+    count or completion order (workers <= 1 runs the speculative pass in-process). The
+    exception is engine="search" with its wall-clock search_budget, since how many nodes fit
+    in it depends on pool contention: set search_max_nodes (and search_budget=None) in
+    'settings' for a reproducible run, as the CLI does (--search-nodes).
+
+    With a compiled 'model' (see compiler.compile_problem) no CSV is parsed, neither in
+    the workers nor during the commit. 'engine' is passed to every Scheduler
+    with 'seed', and 'settings' ({attribute: value}, e.g. optimize_iterations) is set on each one.
+
+    Returns {dept_name: Scheduler} in input order, each bound to the shared ledgers and
+    ready for write_outputs().
+    """
+    names = list(departments)
+    shares = partition_rooms(room_ledger.rooms, names, Random_SEED if seed is None else seed)
+    tasks = [
+        (name, sheet, departments[name], slots_file, rooms_file, room_ledger, faculty_ledger, shares[name], i, model, engine,
+         settings, seed)
+        for i, name in enumerate(names) for sheet in Scheduler.HALVES
+    ]
+    if workers is not None and workers <= 1:
+        # same isolation as a worker process: each task gets its own ledger snapshot
+        results = [_schedule_department(copy.deepcopy(t)) for t in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_schedule_department, tasks))
+
+    speculative = {}
+    for name, sessions in results:
+        speculative.setdefault(name, []).extend(sessions)
+
+    committed = {}
+    dropped = 0
+    for name, sessions in speculative.items():
+        scheduler = _make_scheduler(model, name, departments[name], slots_file, rooms_file, room_ledger, faculty_ledger,
+                                    engine, settings, seed)
+        scheduler.schedule_all(preplaced=sessions)
+        kept = {id(s) for s in scheduler.sessions}
+        dropped += sum(1 for s in sessions if id(s) not in kept)
+        committed[name] = scheduler
+
+    if dropped:
+        print(f"Parallel merge: {dropped} speculative session(s) clashed and were re-placed")
+    return committed
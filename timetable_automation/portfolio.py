@@ -0,0 +1,97 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from .main import Scheduler
+from .ledgers import RoomLedger
+from .optimize import idle_hours
+
+
+# --------------------- Scoring ---------------------
+METRICS = ("unscheduled_hours", "room_clashes", "room_changes", "idle_hours")
+
+
+def run_metrics(schedulers):
+    """
+    Quality of one complete run ({dept_name: Scheduler} sharing ledgers), lower is better:
+    - unscheduled_hours: hours left in the unscheduled lists
+    - room_clashes: (sheet, day, slot, room) cells booked by more than one placement
+    - room_changes: extra rooms per course and room kind (lecture room vs lab), per sheet
+    - idle_hours: student idle time between the first and last session of each day
+    """
+    unscheduled = clashes = changes = 0
+    idle = 0.0
+    seen = set()
+    for scheduler in schedulers.values():
+        unscheduled += sum(u["remaining_hours"] for u in scheduler.unscheduled_list)
+        for rec in scheduler.records:
+            if rec.room:
+                key = (rec.sheet, rec.day, rec.slot, rec.room)
+                clashes += key in seen
+                seen.add(key)
+
+        rooms, day_masks = {}, {}
+        for s in scheduler.sessions:
+            if s.room:
+                rooms.setdefault((s.sheet, s.code, s.session_type == "P"), set()).add(s.room)
+            key = (s.sheet, s.day)
+            day_masks[key] = day_masks.get(key, 0) | sum(1 << i for i in s.span)
+        changes += sum(len(r) - 1 for r in rooms.values())
+        grid = scheduler._new_grid()
+        lengths = [scheduler.slot_lengths[s] for s in scheduler.slots]
+        idle += sum(idle_hours(mask, grid.excluded_mask, lengths) for mask in day_masks.values())
+    return {"unscheduled_hours": unscheduled, "room_clashes": clashes,
+            "room_changes": changes, "idle_hours": round(idle, 2)}
+
+
+def rank_key(metrics):
+    return tuple(metrics[name] for name in METRICS)
+
+
+# --------------------- Worker ---------------------
+def _run_institution(model, seed, engine, settings):
+    """Schedule every department of the model in order with one seed, on fresh shared ledgers."""
+    room_ledger, faculty_ledger = RoomLedger(model.rooms), model.faculty_ledger()
+    schedulers = {}
+    for dept_name in model.departments:
+        scheduler = Scheduler.from_model(model, dept_name, room_ledger, faculty_ledger, engine, seed)
+        for name, value in (settings or {}).items():
+            setattr(scheduler, name, value)
+        scheduler.schedule_all()
+        schedulers[dept_name] = scheduler
+    return schedulers
+
+
+def _run_seed(task):
+    """Metrics of one seed's run. Runs in a worker process; the schedulers stay there."""
+    model, seed, engine, settings = task
+    return seed, run_metrics(_run_institution(model, seed, engine, settings))
+
+
+# --------------------- Portfolio ---------------------
+def schedule_portfolio(model, seeds, workers=None, engine="greedy", settings=None):
+    """
+    Run the whole institution once per seed in a process pool and keep the best run.
+
+    Runs are ranked by METRICS in order (unscheduled hours first); ties go to the seed listed
+    first. Every run is deterministic for its seed and the ranking does not depend on which
+    worker finishes first, so the result is reproducible for a given seed list (with
+    engine="search", set search_max_nodes in 'settings' to take the time budget out).
+    Workers send back only their metrics, and the winning seed is run again in-process, so
+    neither IPC nor memory grows with the number of seeds. workers <= 1 runs the seeds one
+    after another in-process and keeps only the best run so far.
+
+    Returns (best_seed, {dept_name: Scheduler}, [(seed, metrics), ...] in seed order); the
+    schedulers share one pair of ledgers and are ready for write_outputs().
+    """
+    if workers is not None and workers <= 1:
+        best, table = None, []
+        for seed in seeds:
+            schedulers = _run_institution(model, seed, engine, settings)
+            table.append((seed, run_metrics(schedulers)))
+            if best is None or rank_key(table[-1][1]) < rank_key(table[best][1]):
+                best, best_run = len(table) - 1, schedulers
+        return table[best][0], best_run, table
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        table = list(pool.map(_run_seed, [(model, seed, engine, settings) for seed in seeds]))
+    best_seed = min(table, key=lambda row: rank_key(row[1]))[0]  # min keeps the first of equals
+    return best_seed, _run_institution(model, best_seed, engine, settings), table
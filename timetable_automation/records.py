@@ -0,0 +1,190 @@
+import sys
+
+
+def faculty_members(faculty):
+    """Split a course's Faculty field ("Dr. A / Dr. B") into individual names."""
+    return [m.strip() for m in str(faculty or "").split("/") if m.strip()]
+
+
+# --------------------- Placement record ---------------------
+class Placement:
+    """
+    One scheduled (sheet, day, slot) cell. Uses __slots__ and interned strings so
+    hundreds of sections stay cheap, and supports rec["field"] / rec.get("field")
+    so callers written against the old list-of-dicts keep working.
+    """
+
+    __slots__ = ("sheet", "day", "slot", "code", "display", "faculty", "room", "session_type")
+    FIELDS = __slots__
+
+    def __init__(self, sheet=None, day="", slot="", code="", display="", faculty="", room="", session_type=""):
+        self.sheet = sys.intern(sheet) if isinstance(sheet, str) else sheet
+        self.day = sys.intern(day)
+        self.slot = sys.intern(slot)
+        self.code = sys.intern(code)
+        self.display = display
+        self.faculty = sys.intern(faculty) if faculty else ""
+        self.room = sys.intern(room) if room else ""
+        self.session_type = session_type
+
+    @classmethod
+    def from_dict(cls, rec):
+        return cls(**{f: rec[f] for f in cls.FIELDS if f in rec})
+
+    def __getitem__(self, key):
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in self.FIELDS else default
+
+    def keys(self):
+        return self.FIELDS
+
+    def to_dict(self):
+        return {f: getattr(self, f) for f in self.FIELDS}
+
+    def __eq__(self, other):
+        if isinstance(other, Placement):
+            other = other.to_dict()
+        return self.to_dict() == other
+
+    def __hash__(self):
+        # same fields as __eq__; records are not changed once stored
+        return hash(tuple(getattr(self, f) for f in self.FIELDS))
+
+    def __repr__(self):
+        return f"Placement({self.to_dict()!r})"
+
+
+# --------------------- Record store ---------------------
+class RecordStore:
+    """
+    Append-only store of Placement records with hash indices on
+    (sheet, day, code), (sheet, code), (day, slot), faculty member and room.
+    Iterating yields the records in insertion order, like the old list.
+    """
+
+    def __init__(self, records=()):
+        self._items = []
+        self._by_sheet_day_code = {}
+        self._by_sheet_code = {}
+        self._by_day_slot = {}
+        self._codes_by_sheet = {}
+        self._by_faculty = {}
+        self._by_room = {}
+        self.extend(records)
+
+    # --------------------- List-like view ---------------------
+    def append(self, rec):
+        if not isinstance(rec, Placement):
+            rec = Placement.from_dict(rec)
+        self._items.append(rec)
+        self._by_sheet_day_code.setdefault((rec.sheet, rec.day, rec.code), []).append(rec)
+        self._by_sheet_code.setdefault((rec.sheet, rec.code), []).append(rec)
+        self._codes_by_sheet.setdefault(rec.sheet, {})[rec.code] = None
+        self._by_day_slot.setdefault((rec.day, rec.slot), []).append(rec)
+        for member in faculty_members(rec.faculty):
+            self._by_faculty.setdefault(member, []).append(rec)
+        if rec.room:
+            self._by_room.setdefault(rec.room, []).append(rec)
+
+    def extend(self, records):
+        for rec in records:
+            self.append(rec)
+
+    def truncate(self, n):
+        """Drop every record appended after the first n (used to undo tentative placements)."""
+        while len(self._items) > n:
+            rec = self._items.pop()
+            keys = [(self._by_sheet_day_code, (rec.sheet, rec.day, rec.code)),
+                    (self._by_sheet_code, (rec.sheet, rec.code)),
+                    (self._by_day_slot, (rec.day, rec.slot))]
+            keys += [(self._by_faculty, member) for member in faculty_members(rec.faculty)]
+            if rec.room:
+                keys.append((self._by_room, rec.room))
+            for index, key in keys:
+                bucket = index[key]
+                bucket.pop()
+                if not bucket:
+                    del index[key]
+            if (rec.sheet, rec.code) not in self._by_sheet_code:
+                del self._codes_by_sheet[rec.sheet][rec.code]
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __getitem__(self, idx):
+        return self._items[idx]
+
+    def __bool__(self):
+        return bool(self._items)
+
+    def as_dicts(self):
+        """Return the records as a plain list of dicts."""
+        return [rec.to_dict() for rec in self._items]
+
+    def to_columns(self):
+        """Return a columnar view: {field: [values...]} in insertion order."""
+        return {f: [getattr(rec, f) for rec in self._items] for f in Placement.FIELDS}
+
+    # --------------------- Indexed lookups ---------------------
+    def has_course_on_day(self, sheet, day, code):
+        return (sheet, day, code) in self._by_sheet_day_code
+
+    def for_course(self, sheet, code):
+        """All placements of 'code' on 'sheet', in insertion order."""
+        return self._by_sheet_code.get((sheet, code), [])
+
+    def at(self, day, slot):
+        """All placements (any sheet) occupying (day, slot)."""
+        return self._by_day_slot.get((day, slot), [])
+
+    def codes(self, sheet):
+        """Distinct course codes placed on 'sheet'."""
+        return list(self._codes_by_sheet.get(sheet, ()))
+
+    def for_faculty(self, member):
+        """All placements taught by one faculty member (any sheet), in insertion order."""
+        return self._by_faculty.get(member, [])
+
+    def for_room(self, room):
+        """All placements held in 'room' (any sheet), in insertion order."""
+        return self._by_room.get(room, [])
+
+    def faculty(self):
+        """Distinct faculty members with at least one placement, in first-placement order."""
+        return list(self._by_faculty)
+
+    def rooms(self):
+        """Distinct rooms with at least one placement, in first-placement order."""
+        return list(self._by_room)
+
+
+# --------------------- Session ---------------------
+class Session:
+    """
+    One placed teaching session: a contiguous span of slot indices on one day of one sheet.
+    'hours' is the nominal allocation the scheduler asked for (e.g. 1.5 for a lecture).
+    Sessions can be replayed onto a fresh Scheduler (see Scheduler.schedule_all(preplaced=...)).
+    """
+
+    __slots__ = ("sheet", "day", "span", "code", "faculty", "room", "session_type", "is_elective", "hours")
+
+    def __init__(self, sheet, day, span, code, faculty, room, session_type, is_elective, hours):
+        self.sheet = sheet
+        self.day = day
+        self.span = tuple(span)
+        self.code = code
+        self.faculty = faculty
+        self.room = room
+        self.session_type = session_type
+        self.is_elective = is_elective
+        self.hours = hours
+
+    def __repr__(self):
+        return f"Session({self.sheet}, {self.day}, {self.span}, {self.code}, {self.session_type}, room={self.room!r})"
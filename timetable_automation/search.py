@@ -0,0 +1,234 @@
+import time
+
+from .records import Session
+
+
+class _Timeout(Exception):
+    pass
+
+
+# --------------------- Search units ---------------------
+class _Unit:
+    """One session still to be placed: a lecture block, a tutorial hour or a lab block of a course."""
+
+    __slots__ = ("index", "code", "faculty", "session_type", "hours", "is_elective",
+                 "static_days", "static_mask")
+
+    def __init__(self, index, code, faculty, session_type, hours, is_elective):
+        self.index = index
+        self.code = code
+        self.faculty = faculty
+        self.session_type = session_type
+        self.hours = hours
+        self.is_elective = is_elective
+        self.static_days = set()   # days with at least one value before the search started
+        self.static_mask = {}      # day -> union of slot masks of those values
+
+
+class _Placed:
+    """A tentative placement and everything needed to undo it."""
+
+    __slots__ = ("unit", "session", "mask", "grid_state", "room_state", "faculty_state",
+                 "map_state", "lab_state", "n_records")
+
+
+# --------------------- Solver ---------------------
+class SheetSearch:
+    """
+    Backtracking search for one timetable sheet (engine="search").
+
+    Every remaining L/T/P session of every course is a variable whose values are
+    (day, span) positions: any start inside a free block, not only the block prefix the
+    greedy pass tries. The search uses
+    - forward checking: after each tentative placement every open variable's domain is
+      recomputed against the grid and the shared room/faculty ledgers, and a wiped-out
+      domain fails the node immediately;
+    - most-constrained-first ordering: the variable with the fewest values goes next
+      (ties: longer sessions first);
+    - conflict-directed backjumping: a failure reports the placements that removed values
+      of the failing variable (same day and same course, lab-per-day, or overlapping grid
+      cells), and the search jumps straight back past placements not in that set.
+    Sessions that cannot be placed even on the starting state, or that would need more
+    days than the week has, are left out up front.
+
+    Tentative placements go through Scheduler._commit_session and are undone with grid
+    and ledger snapshots, so the solver sees exactly what the greedy pass sees. The
+    search stops at the first complete assignment or when time_budget seconds (or
+    max_nodes nodes, for reproducible runs) are used up. When it proves that no complete
+    assignment exists, the session behind the most wipe-outs is dropped and the search
+    restarts. solve() returns the sessions of the fullest assignment reached; nothing is
+    left applied.
+    """
+
+    def __init__(self, scheduler, table, lab_flag, courses, placed_hours, sheet_name, time_budget=2.0, max_nodes=None):
+        self.sch = scheduler
+        self.table = table
+        self.lab_flag = lab_flag
+        self.sheet = sheet_name
+        self.time_budget = time_budget
+        self.max_nodes = max_nodes
+        self.nodes = 0
+        self.stack = []
+        self.best, self.best_hours = [], 0.0
+        self.wipeouts = {}   # unit index -> number of forward-checking failures it caused
+        self.units = self._make_units(courses, placed_hours)
+
+    # --------------------- Setup ---------------------
+    def _make_units(self, courses, placed_hours):
+        units, per_code = [], {}
+        for course in courses:
+            code, is_elective = course.code, course.code.startswith("Elective_")
+            for session_type, total, size in (("L", course.L, 1.5), ("T", course.T, 1), ("P", course.P, 2)):
+                remaining = total - placed_hours.get((code, session_type), 0)
+                while remaining > 0:
+                    hrs = min(size, remaining)
+                    remaining -= hrs
+                    # a course meets at most once a day, so extra sessions can never be placed
+                    if per_code.get(code, 0) >= len(self.sch.days):
+                        continue
+                    unit = _Unit(len(units), code, course.faculty, session_type, hrs, is_elective)
+                    values = self._values(unit)
+                    if not values:
+                        continue
+                    for day, span in values:
+                        unit.static_days.add(day)
+                        unit.static_mask[day] = unit.static_mask.get(day, 0) | _mask(span)
+                    per_code[code] = per_code.get(code, 0) + 1
+                    units.append(unit)
+        return units
+
+    # --------------------- Domains ---------------------
+    def _room_order(self, unit):
+        return self.sch._room_order(unit.code, unit.session_type)
+
+    def _room(self, unit, cells):
+        """Room for a placement: the course's mapped room when it suits and is free, else a free room."""
+        mapped = self.sch.course_room_map.get(unit.code)
+        if mapped and (mapped.upper().startswith("L")) == (unit.session_type == "P") \
+                and self.sch.room_ledger.is_free(mapped, cells):
+            return mapped
+        return self.sch._choose_room(unit.code, self.sch.room_ledger.free_rooms(self._room_order(unit), cells))
+
+    def _values(self, unit):
+        sch, values = self.sch, []
+        for day in sch._rotate_days(sch._day_order[unit.session_type]):
+            if sch.records.has_course_on_day(self.sheet, day, unit.code):
+                continue
+            if unit.session_type == "P" and self.lab_flag[day]:
+                continue
+            for span in self.table.candidate_spans(day, unit.hours, every_start=True):
+                cells = [(day, sch.slots[i]) for i in span]
+                if unit.faculty and sch.faculty_ledger.is_busy(unit.faculty, cells):
+                    continue
+                if not unit.is_elective and self._room(unit, cells) is None:
+                    continue
+                values.append((day, tuple(span)))
+        return values
+
+    def _culprits(self, unit):
+        """Placed units that removed at least one of unit's starting values."""
+        out = set()
+        for placed in self.stack:
+            other, day = placed.unit, placed.session.day
+            if day not in unit.static_days:
+                continue
+            if other.code == unit.code or (other.session_type == unit.session_type == "P") \
+                    or placed.mask & unit.static_mask[day]:
+                out.add(other.index)
+        return out
+
+    # --------------------- Apply / undo ---------------------
+    def _apply(self, unit, value):
+        sch, table = self.sch, self.table
+        day, span = value
+        cells = [(day, sch.slots[i]) for i in span]
+        room = "" if unit.is_elective else self._room(unit, cells)
+        tail = [(day, sch.slots[i]) for i in range(span[-1] + 1, min(span[-1] + 1 + sch.break_after_slots, len(sch.slots)))]
+
+        placed = _Placed()
+        placed.unit = unit
+        placed.grid_state = table.day_state(day)
+        placed.room_state = sch.room_ledger.snapshot(room, cells + tail) if room else None
+        placed.faculty_state = sch.faculty_ledger.snapshot(unit.faculty)
+        placed.map_state = sch.course_room_map.get(unit.code)
+        placed.lab_state = self.lab_flag[day]
+        placed.n_records = len(sch.records)
+        if room and placed.map_state is None:
+            sch.course_room_map[unit.code] = room
+
+        placed.session = Session(self.sheet, day, span, unit.code, unit.faculty, room, unit.session_type, unit.is_elective, unit.hours)
+        sch._commit_session(table, sch.faculty_ledger, self.lab_flag, placed.session)
+        placed.mask = table.day_state(day)[0] & ~placed.grid_state[0]
+        self.stack.append(placed)
+
+        hours = sum(p.unit.hours for p in self.stack)
+        if hours > self.best_hours:
+            self.best, self.best_hours = [p.session for p in self.stack], hours
+
+    def _undo(self):
+        sch = self.sch
+        placed = self.stack.pop()
+        session = placed.session
+        self.table.restore_day(session.day, placed.grid_state, session.span)
+        if placed.room_state is not None:
+            sch.room_ledger.restore(placed.room_state)
+        sch.faculty_ledger.restore(placed.faculty_state)
+        if placed.map_state is None:
+            sch.course_room_map.pop(session.code, None)
+        self.lab_flag[session.day] = placed.lab_state
+        sch.records.truncate(placed.n_records)
+        sch.sessions.pop()
+
+    # --------------------- Search ---------------------
+    def _tick(self):
+        self.nodes += 1
+        if self.max_nodes is not None and self.nodes > self.max_nodes:
+            raise _Timeout()
+        if self.time_budget is not None and time.perf_counter() > self._deadline:
+            raise _Timeout()
+
+    def _search(self, open_units):
+        """Returns None once every unit is placed, else the conflict set of the failure."""
+        self._tick()
+        if not open_units:
+            return None
+        domains = {}
+        for unit in open_units:
+            domains[unit.index] = values = self._values(unit)
+            if not values:
+                self.wipeouts[unit.index] = self.wipeouts.get(unit.index, 0) + 1
+                return self._culprits(unit)   # forward-checking wipe-out
+
+        unit = min(open_units, key=lambda u: (len(domains[u.index]), -u.hours, u.index))
+        rest = [u for u in open_units if u is not unit]
+        conflict = self._culprits(unit)
+        for value in domains[unit.index]:
+            self._apply(unit, value)
+            result = self._search(rest)
+            if result is None:
+                return None
+            self._undo()
+            if unit.index not in result:
+                return result   # this placement is not to blame: jump further back
+            conflict |= result - {unit.index}
+        return conflict
+
+    def solve(self):
+        """Run the search and return the sessions of the fullest assignment found (nothing stays applied)."""
+        self._deadline = time.perf_counter() + (self.time_budget or 0)
+        units = list(self.units)
+        try:
+            # a proof that no complete assignment exists relaxes the problem: the session that
+            # failed most often is given up (the greedy fill may still place it) and we retry
+            while units and self._search(units) is not None:
+                drop = max(units, key=lambda u: (self.wipeouts.get(u.index, 0), -u.hours, u.index))
+                units.remove(drop)
+        except _Timeout:
+            pass
+        while self.stack:
+            self._undo()
+        return list(self.best)
+
+
+def _mask(span):
+    return sum(1 << i for i in span)
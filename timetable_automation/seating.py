@@ -0,0 +1,155 @@
+import re
+import csv
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+
+from .exams import section_key, batch_sections, safe_int
+
+COLUMNS = ["Date", "Slot", "Room", "Seat", "Roll Number", "Course", "Batch"]
+# one "<room> (<seats>)" piece of a Rooms cell
+ROOM_PIECE = r"\s*(?P<Room>[^;]+?) \((?P<seats>\d+)\)"
+
+
+def load_rosters(roll_file="student_roll_numbers.csv"):
+    """{section key: roll numbers (array, file order)} from a roll list with Batch and Roll Number columns."""
+    rolls = pd.read_csv(roll_file, dtype=str).rename(columns=lambda c: c.strip().lower())
+    if "batch" not in rolls or "roll number" not in rolls:
+        raise ValueError(f"{roll_file} needs Batch and Roll Number columns")
+    keys = rolls["batch"].map(section_key)
+    return {k: group.to_numpy() for k, group in rolls["roll number"].str.strip().groupby(keys, sort=False)}
+
+
+def load_room_seats(path="room_half_capacity.csv"):
+    """{room: seats usable in an exam} from room_half_capacity.csv (room_id, capacity)."""
+    df = pd.read_csv(path).rename(columns=lambda c: c.strip().lower())
+    return {str(room).strip(): n for room, n in zip(df["room_id"], df["capacity"].map(safe_int)) if n}
+
+
+def room_pieces(records):
+    """
+    The rooms of every record, parsed from its Rooms column: a frame of record (index into
+    records), Date, Slot, Room, seats and offset (seats the record filled in earlier rooms).
+    """
+    rooms = pd.Series([r["Rooms"] for r in records], dtype=object).str.replace(" (PARTIAL)", "", regex=False)
+    pieces = rooms.str.extractall(ROOM_PIECE).reset_index(names=["record", "match"])
+    pieces["seats"] = pieces["seats"].astype(np.int64)
+    pieces["offset"] = pieces.groupby("record")["seats"].cumsum() - pieces["seats"]
+    pieces["Date"] = [records[r]["Date"] for r in pieces["record"]]
+    pieces["Slot"] = [records[r]["Slot"] for r in pieces["record"]]
+    return pieces.drop(columns="match")
+
+
+def interleave(first, second, seats=0):
+    """
+    Seat numbers (from 1) for two courses sharing a room of 'seats' seats: the first takes
+    the odd seats and the second the even ones, so neighbours sit different papers; whoever
+    runs out of their own seats carries on in the other's spare ones.
+    """
+    n = max(seats, first + second)
+    odd, even = np.arange(1, n + 1, 2), np.arange(2, n + 1, 2)
+    return (np.r_[odd[:first], even[second:][:max(first - len(odd), 0)]],
+            np.r_[even[:second], odd[first:][:max(second - len(even), 0)]])
+
+
+def seating_plan(courses_by_batch, records, rosters, room_seats=None):
+    """
+    Yield (date, slot, room, {column: array} for COLUMNS, one row per student by seat) room
+    by room, in date, slot and room order (pd.DataFrame() of the dict gives a frame).
+    'records' come from schedule_exams or schedule_exams_clash_free for courses_by_batch
+    (same order). Each exam's students are the roll numbers of its batch's sections (see
+    batch_sections) laid out across its rooms in Rooms order. The data doesn't say who
+    took which elective, so the electives of one basket take consecutive, disjoint runs of
+    the roster. Seats past the end of the roster stay empty; students past an exam's last
+    room (PARTIAL) aren't seated. Only one room's arrays exist at a time.
+    """
+    room_seats = room_seats or {}
+    covers = batch_sections(courses_by_batch, rosters)
+    roster_of = {b: np.concatenate([rosters.get(s, np.empty(0, dtype=object)) for s in ss]) for b, ss in covers.items()}
+
+    # where each exam's students start in its batch's roster
+    start, basket_used = [], {}
+    for batch, course_list in courses_by_batch.items():
+        for entry in course_list:
+            key = (batch, entry.get("group"))
+            start.append(basket_used.get(key, 0))
+            if entry.get("group") is not None:
+                basket_used[key] = start[-1] + int(entry["students"])
+
+    pieces = room_pieces(records)
+    pieces = pieces.sort_values(["Date", "Slot", "Room", "record"], kind="stable")
+    for (date, slot, room), group in pieces.groupby(["Date", "Slot", "Room"], sort=False):
+        rolls, courses, batches = [], [], []
+        for r, seats, offset in zip(group["record"], group["seats"], group["offset"]):
+            batch = records[r]["Batch"]
+            begin = start[r] + offset
+            rolls.append(roster_of[batch][begin:begin + seats])
+            courses.append(records[r]["Course"])
+            batches.append(batch)
+        if len(rolls) == 1:
+            # every other seat while they last, roll numbers in seat order
+            seat_numbers = [np.sort(interleave(len(rolls[0]), 0, room_seats.get(room, 0))[0])]
+        else:
+            # the scheduler puts at most two courses in a room; any further ones follow on
+            seat_numbers = list(interleave(len(rolls[0]), len(rolls[1]), room_seats.get(room, 0)))
+            taken = sum(len(s) for s in seat_numbers)
+            for extra in rolls[2:]:
+                seat_numbers.append(np.arange(taken + 1, taken + len(extra) + 1))
+                taken += len(extra)
+        lengths = [len(x) for x in rolls]
+        seat = np.concatenate(seat_numbers)
+        order = np.argsort(seat, kind="stable")
+        yield date, slot, room, {
+            "Date": np.full(len(seat), records[group["record"].iloc[0]]["Date_str"], dtype=object),
+            "Slot": np.full(len(seat), slot, dtype=object),
+            "Room": np.full(len(seat), room, dtype=object),
+            "Seat": seat[order],
+            "Roll Number": np.concatenate(rolls)[order],
+            "Course": np.repeat(np.array(courses, dtype=object), lengths)[order],
+            "Batch": np.repeat(np.array(batches, dtype=object), lengths)[order],
+        }
+
+
+def _sheet_title(date, slot, taken):
+    title = re.sub(r"[\[\]:*?/\\]", "", f"{date:%d-%b-%Y} {slot.split()[0]}")[:31]
+    base, i = title, 1
+    while title in taken:
+        title = f"{base[:28]}_{i}"
+        i += 1
+    taken.add(title)
+    return title
+
+
+def write_seating_plan(plan, path):
+    """
+    Stream seating_plan() output to 'path': one CSV, or for .xlsx a write-only workbook
+    with a sheet per date and slot. Rooms are written as they come, so memory stays at
+    one room. Returns the number of students seated.
+    """
+    path = Path(path)
+    seated = 0
+    if path.suffix.lower() == ".xlsx":
+        wb = Workbook(write_only=True)
+        ws, current, titles = None, None, set()
+        for date, slot, room, columns in plan:
+            if (date, slot) != current:
+                current = (date, slot)
+                ws = wb.create_sheet(_sheet_title(date, slot, titles))
+                ws.append(COLUMNS)
+            for row in zip(*(columns[c].tolist() for c in COLUMNS)):
+                ws.append(row)
+            seated += len(columns["Seat"])
+        if ws is None:
+            wb.create_sheet("Seating").append(COLUMNS)
+        wb.save(path)
+        return seated
+
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNS)
+        for _, _, _, columns in plan:
+            writer.writerows(zip(*(columns[c].tolist() for c in COLUMNS)))
+            seated += len(columns["Seat"])
+    return seated
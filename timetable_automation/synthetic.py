@@ -0,0 +1,83 @@
+import os
+import random
+import pandas as pd
+
+# the institute's slot grid (data/timeslots.csv), used unless a uniform grid is asked for
+STANDARD_SLOTS = [
+    ("07:30", "09:00"), ("09:00", "10:00"), ("10:00", "10:30"), ("10:30", "10:45"), ("10:45", "11:00"),
+    ("11:00", "12:00"), ("12:00", "12:15"), ("12:15", "12:30"), ("12:30", "13:15"), ("13:15", "14:00"),
+    ("14:00", "14:30"), ("14:30", "15:30"), ("15:30", "15:40"), ("15:40", "16:00"), ("16:00", "16:30"),
+    ("16:30", "17:10"), ("17:10", "17:30"), ("17:30", "17:40"), ("17:40", "18:30"),
+]
+LTPSC = ["3-1-0-0-4", "3-0-2-0-4", "3-1-0-0-4", "2-1-0-0-3", "3-0-0-0-3", "2-0-2-0-3", "1-0-2-0-2"]
+
+# named sizes for the benchmark; explicit arguments override them
+PRESETS = {
+    "tiny": dict(departments=2, courses=6, rooms=6, labs=3, faculty=8),
+    "small": dict(departments=13, courses=13, rooms=20, labs=13, faculty=45),
+    "medium": dict(departments=40, courses=14, rooms=60, labs=35, faculty=140),
+    "large": dict(departments=120, courses=14, rooms=180, labs=100, faculty=420),
+}
+
+
+def _clock(minutes):
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def slot_grid(slots_per_day=None, slot_minutes=60, start="08:00"):
+    """[(start, end), ...] for a day: the institute grid, or 'slots_per_day' uniform slots."""
+    if slots_per_day is None:
+        return list(STANDARD_SLOTS)
+    h, m = map(int, start.split(":"))
+    t0 = h * 60 + m
+    return [(_clock(t0 + i * slot_minutes), _clock(t0 + (i + 1) * slot_minutes)) for i in range(slots_per_day)]
+
+
+def generate_institution(out_dir, departments=13, courses=13, rooms=20, labs=13, faculty=45,
+                         slots_per_day=None, slot_minutes=60, elective_share=0.15, seed=0):
+    """
+    Write a synthetic institution as the scheduler's input CSVs into 'out_dir':
+    timeslots.csv, rooms.csv (C### classrooms, L### labs), Faculty.csv and one
+    <DEPT>_courses.csv per department, with the same columns as the files under data/.
+    Courses draw their L-T-P-S-C, semester half and faculty from a seeded RNG, and about
+    'elective_share' of them are electives in baskets of two or three.
+    Returns (departments {name: courses csv}, rooms csv, slots csv, faculty csv).
+    """
+    rng = random.Random(seed)
+    os.makedirs(out_dir, exist_ok=True)
+
+    slots_file = os.path.join(out_dir, "timeslots.csv")
+    grid = slot_grid(slots_per_day, slot_minutes)
+    pd.DataFrame({"Slot_ID": range(1, len(grid) + 1), "Start_Time": [s for s, _ in grid],
+                  "End_Time": [e for _, e in grid]}).to_csv(slots_file, index=False)
+
+    rooms_file = os.path.join(out_dir, "rooms.csv")
+    room_rows = [(f"C{100 + i}", rng.choice([60, 96, 120, 240]), "Classroom") for i in range(rooms)]
+    room_rows += [(f"L{100 + i}", rng.choice([40, 60, 80]), "Lab") for i in range(labs)]
+    pd.DataFrame(room_rows, columns=["Room_ID", "Capacity", "Type"]).assign(Facilities="").to_csv(rooms_file, index=False)
+
+    faculty_file = os.path.join(out_dir, "Faculty.csv")
+    names = [f"Dr. Faculty {i:03d}" for i in range(faculty)]
+    pd.DataFrame({"Faculty ID": [f"F{i:03d}" for i in range(faculty)], "Name": names}).to_csv(faculty_file, index=False)
+
+    dept_files = {}
+    for d in range(departments):
+        name = f"D{d:03d}"
+        rows, basket = [], 0
+        n_electives = int(round(courses * elective_share))
+        for c in range(courses - n_electives):
+            rows.append((f"{name}C{c:02d}", f"Course {name}-{c}", rng.choice(LTPSC), rng.choice(names),
+                         rng.choice(["0", "1", "2"]), 0, rng.randint(30, 120), 0))
+        while n_electives > 0:
+            basket += 1
+            size = min(n_electives, rng.choice([2, 3]))
+            half = rng.choice(["0", "1", "2"])
+            for e in range(size):
+                rows.append((f"{name}E{basket}{e}", f"Elective {name}-{basket}-{e}", rng.choice(LTPSC[:5]),
+                             rng.choice(names), half, 1, rng.randint(20, 60), basket))
+            n_electives -= size
+        dept_files[name] = os.path.join(out_dir, f"{name}_courses.csv")
+        pd.DataFrame(rows, columns=["Course_Code", "Course_Title", "L-T-P-S-C", "Faculty", "Semester_Half",
+                                    "Elective", "Students", "basket"]).to_csv(dept_files[name], index=False)
+
+    return dept_files, rooms_file, slots_file, faculty_file
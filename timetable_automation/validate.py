@@ -0,0 +1,287 @@
+import os
+import re
+import sys
+import glob
+import zipfile
+import argparse
+import posixpath
+from xml.etree import ElementTree
+import pandas as pd
+from openpyxl import load_workbook
+from openpyxl.utils.cell import range_boundaries
+
+from .main import Scheduler
+from .occupancy import OccupancyGrid
+
+CHECKS = ("room_clash", "faculty_clash", "labs_per_day", "excluded_slot", "contact_hours")
+ISSUE_COLUMNS = ["check", "dept", "sheet", "day", "slot", "subject", "detail"]
+PLACEMENT_COLUMNS = ["dept", "sheet", "day", "slot", "code", "faculty", "room", "session_type"]
+
+# "<code>[T] (<room>)" or "<code> (Lab-<room>)"; electives are a bare "Elective_<basket>[T]"
+# (a trailing T is a tutorial unless the whole token is a legend code, see _split_labels)
+LABEL_RE = r"^(?P<token>\S+)(?: \((?P<lab>Lab-)?(?P<room>[^)]*)\))?$"
+MERGE_RE = re.compile(rb'<mergeCell ref="([A-Z]+[0-9]+:[A-Z]+[0-9]+)"')
+RELS_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+MAIN_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+REL_ID = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id"
+
+
+# --------------------- Loading ---------------------
+def _part(base, target):
+    """Zip path of relationship 'target' of the part at 'base'."""
+    return target.lstrip("/") if target.startswith("/") else posixpath.normpath(posixpath.join(posixpath.dirname(base), target))
+
+
+def _rels(archive, part):
+    """{relationship id: (type, zip path)} of one package part."""
+    path = posixpath.join(posixpath.dirname(part), "_rels", posixpath.basename(part) + ".rels")
+    root = ElementTree.fromstring(archive.read(path))
+    return {r.get("Id"): (r.get("Type"), _part(part, r.get("Target"))) for r in root.iter(RELS_NS + "Relationship")}
+
+
+def _sheet_parts(archive):
+    """{sheet title: worksheet XML path} of an .xlsx, from the package relationships."""
+    workbook = next(path for kind, path in _rels(archive, "").values() if kind.endswith("/officeDocument"))
+    rels = _rels(archive, workbook)
+    root = ElementTree.fromstring(archive.read(workbook))
+    return {s.get("name"): rels[s.get(REL_ID)][1] for s in root.iter(MAIN_NS + "sheet")}
+
+
+def _split_labels(labels, codes):
+    """
+    (code, session_type) Series for session labels. A token ending in T is a tutorial of the
+    shorter code unless the whole token is one of 'codes' (the legend), so "MAT (C1)" stays a
+    MAT lecture when MAT is a course.
+    """
+    parts = labels.str.extract(LABEL_RE)
+    token = parts["token"]
+    tut = token.str.endswith("T", na=False) & parts["lab"].isna() & ~token.isin(codes)
+    code = token.where(~tut, token.str[:-1]).fillna(labels)
+    session_type = parts["lab"].notna().map({True: "P", False: "L"}).where(~tut, "T")
+    return code, session_type, parts["room"].fillna("")
+
+
+def read_workbook(path, dept=None):
+    """
+    Placements and legend of one student workbook, as written by export.write_student_workbook
+    or edited by hand. Merged session cells are expanded to every slot they cover.
+    Elective placeholders carry no room, faculty or lab marker in the workbook, so they are
+    read as lectures without faculty; the columnar export keeps those details.
+    Returns (placements DataFrame, courses DataFrame [dept, code, ltp, faculty]).
+    """
+    dept = dept or os.path.basename(path).replace("_timetable.xlsx", "")
+    cells, legend = [], []
+    with zipfile.ZipFile(path) as archive:
+        # read-only mode skips styles (several times faster) but does not expose merged
+        # ranges, so those are read from the sheet XML
+        parts = _sheet_parts(archive)
+        wb = load_workbook(path, read_only=True)
+        sheets = [(ws.title, [list(r) for r in ws.iter_rows(values_only=True)],
+                   MERGE_RE.findall(archive.read(parts[ws.title]))) for ws in wb.worksheets]
+        wb.close()
+    for title, rows, merges in sheets:
+        if not rows:
+            continue
+        for ref in merges:
+            min_col, min_row, max_col, _ = range_boundaries(ref.decode())
+            row = rows[min_row - 1]
+            row.extend([None] * (max_col - len(row)))
+            row[min_col:max_col] = [row[min_col - 1]] * (max_col - min_col)
+        slots = [s for s in rows[0][1:] if s]
+        for row in rows[1:]:
+            if len(row) > 1 and row[1] == "S.No":
+                break  # legend follows
+            if not row or row[0] is None:
+                continue
+            cells.extend((title, row[0], slot, v) for slot, v in zip(slots, row[1:]) if v is not None)
+        legend_start = next((i for i, r in enumerate(rows) if len(r) > 1 and r[1] == "S.No"), None)
+        if legend_start is not None:
+            legend.extend((r[2], r[4], r[5]) for r in rows[legend_start + 1:] if len(r) > 5 and r[2])
+
+    frame = pd.DataFrame(cells, columns=["sheet", "day", "slot", "label"]).astype({"label": str})
+    frame = frame[~frame["label"].str.strip().isin(["", OccupancyGrid.FREE, OccupancyGrid.BREAK])]
+    courses = pd.DataFrame(legend, columns=["code", "ltp", "faculty"]).drop_duplicates("code")
+    code, session_type, room = _split_labels(frame["label"].str.strip(), courses["code"])
+    placements = pd.DataFrame({
+        "dept": dept,
+        "sheet": frame["sheet"],
+        "day": frame["day"],
+        "slot": frame["slot"],
+        "code": code,
+        "room": room,
+        "session_type": session_type,
+    })
+    courses.insert(0, "dept", dept)
+    faculty = courses.set_index("code")["faculty"]
+    placements["faculty"] = placements["code"].map(faculty).fillna("")
+    return placements[PLACEMENT_COLUMNS].reset_index(drop=True), courses
+
+
+def read_columnar(path):
+    """Placements table from columnar.write_columnar (csv, jsonl, parquet or arrow)."""
+    if path.endswith(".csv"):
+        df = pd.read_csv(path, dtype=str, keep_default_na=False)
+    elif path.endswith(".jsonl"):
+        df = pd.read_json(path, lines=True, dtype=False)
+    elif path.endswith(".parquet"):
+        df = pd.read_parquet(path)
+    else:
+        df = pd.read_feather(path)
+    return df.reindex(columns=PLACEMENT_COLUMNS).fillna("").astype(str)
+
+
+def read_courses(departments):
+    """Course tables {dept: courses csv} as one DataFrame [dept, code, ltp, faculty]."""
+    frames = []
+    for dept, path in departments.items():
+        df = pd.read_csv(path, dtype=str, keep_default_na=False)
+        frames.append(pd.DataFrame({"dept": dept, "code": df["Course_Code"].str.strip(),
+                                    "ltp": df["L-T-P-S-C"].str.strip(), "faculty": df.get("Faculty", "")}))
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=["dept", "code", "ltp", "faculty"])
+
+
+def load(paths):
+    """
+    Placements and course tables from any mix of *_timetable.xlsx and *_placements.<ext>
+    files (directories are searched for both).
+    """
+    files = []
+    for p in paths:
+        if os.path.isdir(p):
+            files += sorted(glob.glob(os.path.join(p, "*_timetable.xlsx")))
+            files += sorted(glob.glob(os.path.join(p, "*_placements.*")))
+        else:
+            files.append(p)
+    placements, courses = [], []
+    for f in files:
+        if f.endswith(".xlsx"):
+            p, c = read_workbook(f)
+            placements.append(p)
+            courses.append(c)
+        else:
+            placements.append(read_columnar(f))
+    placements = pd.concat(placements, ignore_index=True) if placements else pd.DataFrame(columns=PLACEMENT_COLUMNS)
+    courses = pd.concat(courses, ignore_index=True) if courses else None
+    return placements, courses
+
+
+# --------------------- Checks ---------------------
+def slot_hours(slots):
+    """Length in hours of 'HH:MM-HH:MM' slot labels (vectorized)."""
+    t = slots.str.extract(r"(\d+):(\d+)\s*-\s*(\d+):(\d+)").astype(float)
+    return (t[2] + t[3] / 60) - (t[0] + t[1] / 60)
+
+
+def _issues(check, df, subject, detail):
+    out = pd.DataFrame({c: df[c] if c in df else "" for c in ("dept", "sheet", "day", "slot")})
+    out.insert(0, "check", check)
+    out["subject"] = subject
+    out["detail"] = detail
+    return out[ISSUE_COLUMNS]
+
+
+def _double_booked(df, key):
+    """Rows of (sheet, day, slot, key) cells held by more than one distinct (dept, code)."""
+    df = df.assign(owner=df["dept"] + ":" + df["code"])
+    cols = ["sheet", "day", "slot", key]
+    booked = df.drop_duplicates(cols + ["owner"])
+    counts = booked.groupby(cols)["owner"].transform("size")
+    clash = booked[counts > 1]
+    return clash.groupby(cols, sort=True)["owner"].agg(lambda o: ", ".join(sorted(o))).reset_index()
+
+
+def check_rooms(placements):
+    clash = _double_booked(placements[placements["room"] != ""], "room")
+    return _issues("room_clash", clash.assign(dept=""), clash["room"], "booked by " + clash["owner"])
+
+
+def check_faculty(placements):
+    members = placements.assign(member=placements["faculty"].str.split("/")).explode("member")
+    members["member"] = members["member"].str.strip()
+    clash = _double_booked(members[members["member"].fillna("") != ""], "member")
+    return _issues("faculty_clash", clash.assign(dept=""), clash["member"], "teaching " + clash["owner"])
+
+
+def check_labs(placements):
+    labs = placements[placements["session_type"] == "P"].drop_duplicates(["dept", "sheet", "day", "code"])
+    cols = ["dept", "sheet", "day"]
+    bad = labs[labs.groupby(cols)["code"].transform("size") > 1]
+    bad = bad.groupby(cols, sort=True)["code"].agg(["size", lambda c: ", ".join(sorted(c))]).reset_index()
+    bad.columns = cols + ["labs", "codes"]
+    return _issues("labs_per_day", bad, bad["codes"], bad["labs"].astype(str) + " labs on one day")
+
+
+def check_excluded(placements, excluded):
+    bad = placements[placements["slot"].isin(list(excluded))]
+    return _issues("excluded_slot", bad, bad["code"], "placed in an excluded slot")
+
+
+def check_hours(placements, courses):
+    """Placed hours per (dept, sheet, course, L/T/P) against the course's L-T-P-S-C."""
+    if courses is None or courses.empty or placements.empty:
+        return pd.DataFrame(columns=ISSUE_COLUMNS)
+    placed = placements.assign(hours=slot_hours(placements["slot"]))
+    placed = placed.pivot_table(index=["dept", "sheet", "code"], columns="session_type", values="hours",
+                                aggfunc="sum", fill_value=0.0).reindex(columns=["L", "T", "P"], fill_value=0.0)
+    ltp = courses.drop_duplicates(["dept", "code"]).set_index(["dept", "code"])["ltp"]
+    expected = ltp.str.split("-", expand=True).reindex(columns=[0, 1, 2]).apply(pd.to_numeric, errors="coerce").astype(float)
+    expected.columns = ["L", "T", "P"]
+    merged = placed.reset_index().merge(expected.reset_index(), on=["dept", "code"], suffixes=("", "_expected"))
+    issues = []
+    for t in ("L", "T", "P"):
+        diff = merged[(merged[t] - merged[f"{t}_expected"]).abs() > 1e-6]
+        issues.append(_issues("contact_hours", diff, diff["code"],
+                              t + ": " + diff[t].round(2).astype(str) + "h placed, " + diff[f"{t}_expected"].astype(str) + "h expected"))
+    return pd.concat(issues, ignore_index=True)
+
+
+def validate(placements, courses=None, excluded=None, checks=CHECKS):
+    """
+    Run the checks over a placements table (columns as PLACEMENT_COLUMNS) and return one
+    DataFrame of issues (ISSUE_COLUMNS), empty when the timetables are valid. Clashes are
+    per sheet (First_Half/Second_Half); 'courses' [dept, code, ltp, faculty] enables the
+    contact hours check, which covers every course placed on a sheet.
+    """
+    excluded = Scheduler.EXCLUDED if excluded is None else excluded
+    placements = placements.fillna("").astype(str)
+    run = {
+        "room_clash": lambda: check_rooms(placements),
+        "faculty_clash": lambda: check_faculty(placements),
+        "labs_per_day": lambda: check_labs(placements),
+        "excluded_slot": lambda: check_excluded(placements, excluded),
+        "contact_hours": lambda: check_hours(placements, courses),
+    }
+    found = [run[c]() for c in checks]
+    return pd.concat(found, ignore_index=True) if found else pd.DataFrame(columns=ISSUE_COLUMNS)
+
+
+# --------------------- CLI ---------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check generated timetables for clashes and L-T-P-S-C mismatches.")
+    parser.add_argument("paths", nargs="*", default=["."],
+                        help="*_timetable.xlsx or *_placements.<csv|jsonl|parquet|arrow> files, or directories")
+    parser.add_argument("--courses", nargs="*", default=[], metavar="DEPT=CSV",
+                        help="course CSVs for the contact hours check (default: the workbook legends)")
+    parser.add_argument("--report", help="also write every issue to this CSV")
+    args = parser.parse_args(argv)
+
+    placements, courses = load(args.paths)
+    if args.courses:
+        courses = read_courses(dict(item.split("=", 1) for item in args.courses))
+    issues = validate(placements, courses)
+
+    print(f"Checked {len(placements)} placed slots in {placements['dept'].nunique()} department(s).")
+    for check in CHECKS:
+        found = issues[issues["check"] == check]
+        print(f"{check:<14} {len(found)}")
+    if courses is None:
+        print("(contact hours not checked: no course table; pass --courses)")
+    if args.report:
+        issues.to_csv(args.report, index=False)
+    elif not issues.empty:
+        print(issues.to_string(index=False, max_rows=50))
+    return 1 if len(issues) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())